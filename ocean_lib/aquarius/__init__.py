@@ -4,3 +4,4 @@
 #
 """Ocean Aquarius module."""
 from .aquarius import Aquarius  # noqa
+from .async_aquarius import AsyncAquarius  # noqa
@@ -7,22 +7,47 @@ Aquarius module.
 Help to communicate with the metadata store.
 """
 
+import copy
 import json
 import logging
 import time
-from typing import Optional, Tuple, Union
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Hashable, Iterator, List, Optional, Tuple, Union
 
 from enforce_typing import enforce_types
 
 from ocean_lib.assets.ddo import DDO
 from ocean_lib.http_requests.requests_session import get_requests_session
+from ocean_lib.http_requests.ttl_cache import TTLCache
 
 logger = logging.getLogger("aquarius")
 
+# seconds a resolved DDO is used before asking Aquarius again
+DDO_CACHE_TTL = 30
+
+# DDOs kept at most, over all Aquarius urls
+DDO_CACHE_SIZE = 1000
+
+# hits per request when paging through query results
+QUERY_PAGE_SIZE = 100
+
+# dids per query, and queries sent at the same time, when resolving many dids
+DDO_BATCH_SIZE = 50
+DDO_BATCH_WORKERS = 4
+
+
+def _event_version(event: Optional[dict]) -> Tuple[int, str]:
+    """Orders the versions of a DDO by the event that Aquarius indexed."""
+    event = event or {}
+    return int(event.get("block") or 0), event.get("tx") or ""
+
 
 class Aquarius:
     """Aquarius wrapper to call different endpoint of aquarius component."""
 
+    # (base url, did) -> DDO; shared, since instances are created per call
+    _ddo_cache = TTLCache(DDO_CACHE_TTL, maxsize=DDO_CACHE_SIZE)
+
     @enforce_types
     def __init__(self, aquarius_url: str) -> None:
         """
@@ -55,17 +80,111 @@ class Aquarius:
         return cls(metadata_cache_uri)
 
     @enforce_types
-    def get_ddo(self, did: str) -> Optional[DDO]:
-        """Retrieve ddo for a given did."""
+    def get_ddo(self, did: str, refresh: bool = False) -> Optional[DDO]:
+        """Retrieve ddo for a given did.
+
+        DDOs are cached for DDO_CACHE_TTL seconds; with `refresh`, Aquarius
+        is asked in any case. Each call returns its own copy.
+        """
+        key = (self.base_url, did)
+        if not refresh:
+            found, ddo = self._ddo_cache.get_cached(key)
+            if found:
+                return copy.deepcopy(ddo)
+
         response = self.requests_session.get(f"{self.base_url}/ddo/{did}")
 
         if response.status_code == 200:
             response_dict = response.json()
 
-            return DDO.from_dict(response_dict)
+            return copy.deepcopy(self._cache_ddo(key, response_dict))
+
+        if response.status_code == 404:
+            # e.g. the asset was deleted: forget it, even if asked to refresh
+            self._ddo_cache.invalidate(key)
 
         return None
 
+    @classmethod
+    def _cache_ddo(cls, key: Hashable, ddo_dict: dict) -> DDO:
+        """Caches the DDO of `ddo_dict`, unless a newer version is cached.
+
+        Returns the newest version. A version with the same indexed event
+        as the cached one only renews the cached DDO.
+        """
+        found, cached = cls._ddo_cache.get_cached(key, include_expired=True)
+        if found:
+            cached_version = _event_version(cached.event)
+            version = _event_version(ddo_dict.get("event"))
+
+            if version == cached_version and version[1]:
+                cls._ddo_cache.set(key, cached)
+                return cached
+
+            # e.g. a response from an Aquarius replica that is behind
+            if version[0] < cached_version[0]:
+                return cached
+
+        ddo = DDO.from_dict(ddo_dict)
+        cls._ddo_cache.set(key, ddo)
+
+        return ddo
+
+    @enforce_types
+    def get_ddos(
+        self,
+        dids: List[str],
+        batch_size: int = DDO_BATCH_SIZE,
+        max_workers: int = DDO_BATCH_WORKERS,
+    ) -> List[Optional[DDO]]:
+        """Retrieve the ddos of many dids, in the order of `dids`.
+
+        Cached DDOs are used as by `get_ddo`. The others are requested with
+        one query per `batch_size` dids, up to `max_workers` queries at a
+        time. Unknown dids give None.
+        """
+        assert batch_size > 0, "batch_size has to be positive."
+
+        ddos: Dict[str, DDO] = {}
+        missing = []
+        for did in dict.fromkeys(dids):
+            found, ddo = self._ddo_cache.get_cached((self.base_url, did))
+            if found:
+                ddos[did] = ddo
+            else:
+                missing.append(did)
+
+        batches = [
+            missing[i : i + batch_size] for i in range(0, len(missing), batch_size)
+        ]
+
+        def query_batch(batch: List[str]) -> list:
+            return self.query_search(
+                {"query": {"terms": {"_id": batch}}, "size": len(batch)}
+            )
+
+        if len(batches) > 1 and max_workers > 1:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                results = list(executor.map(query_batch, batches))
+        else:
+            results = [query_batch(batch) for batch in batches]
+
+        for hits in results:
+            for hit in hits:
+                if "_source" in hit:
+                    did = hit["_source"]["id"]
+                    ddos[did] = self._cache_ddo((self.base_url, did), hit["_source"])
+
+        return [copy.deepcopy(ddos[did]) if did in ddos else None for did in dids]
+
+    @enforce_types
+    def invalidate_ddo(self, did: Optional[str] = None) -> None:
+        """Drops the cached DDO of `did`, or all cached DDOs of this Aquarius."""
+        if did is not None:
+            self._ddo_cache.invalidate((self.base_url, did))
+        else:
+            self._ddo_cache.invalidate_matching(lambda key: key[0] == self.base_url)
+
     @enforce_types
     def ddo_exists(self, did: str) -> bool:
         """Is this DDO in Aqua?"""
@@ -108,6 +227,68 @@ class Aquarius:
 
         raise ValueError(f"Unable to search for DDO: {response.content}")
 
+    @enforce_types
+    def iter_query_search(
+        self,
+        search_query: dict,
+        page_size: int = QUERY_PAGE_SIZE,
+        prefetch: bool = False,
+    ) -> Iterator[dict]:
+        """
+        Search using a query, yielding the hits of all result pages.
+
+        Pages are requested as the hits are consumed, so at most one or, with
+        `prefetch`, two pages are held at a time. With `prefetch`, the next
+        page is requested in the background while the current one is used.
+
+        If the query has a "sort", pages follow each other with
+        "search_after"; the sort should end with a unique field, e.g. the
+        did, to be stable. Otherwise pages are requested with "from", which
+        Elasticsearch limits to the first 10000 hits.
+
+        :param search_query: Python dictionary, query following elasticsearch syntax
+        :param page_size: hits per request
+        :param prefetch: request the next page while the current one is used
+        :return: Iterator of hits, as in the list returned by `query_search`
+        """
+        assert page_size > 0, "page_size has to be positive."
+
+        search_after = "sort" in search_query
+        page_query = dict(search_query, size=page_size)
+        if not search_after:
+            page_query.setdefault("from", 0)
+
+        def next_query(hits: list) -> Optional[dict]:
+            if len(hits) < page_size:
+                return None
+
+            if search_after:
+                return dict(page_query, search_after=hits[-1]["sort"])
+
+            return dict(page_query, **{"from": page_query["from"] + len(hits)})
+
+        executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+        next_hits = None
+        try:
+            hits = self.query_search(page_query)
+            while True:
+                page_query = next_query(hits)
+                if page_query is not None and executor:
+                    next_hits = executor.submit(self.query_search, page_query)
+
+                yield from hits
+
+                if page_query is None:
+                    return
+
+                hits = next_hits.result() if executor else self.query_search(page_query)
+        finally:
+            # e.g. the caller stopped early: do not wait for the next page
+            if next_hits is not None:
+                next_hits.cancel()
+            if executor:
+                executor.shutdown(wait=False)
+
     @enforce_types
     def validate_ddo(self, ddo: DDO) -> Tuple[bool, Union[list, dict]]:
         """Does the DDO conform to the Ocean DDO schema?
@@ -150,7 +331,7 @@ class Aquarius:
         ddo2 = None
         while True:
             try:
-                ddo2 = self.get_ddo(ddo.did)
+                ddo2 = self.get_ddo(ddo.did, refresh=True)
             except ValueError:
                 pass
             if not ddo2:
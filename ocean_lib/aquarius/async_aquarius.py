@@ -0,0 +1,153 @@
+#
+# Copyright 2023 Ocean Protocol Foundation
+# SPDX-License-Identifier: Apache-2.0
+#
+"""
+Async Aquarius module.
+Help to communicate with the metadata store from asyncio applications.
+"""
+
+import asyncio
+import copy
+import logging
+from typing import Dict, List, Optional
+
+import aiohttp
+
+from ocean_lib.aquarius.aquarius import DDO_BATCH_SIZE, DDO_BATCH_WORKERS, Aquarius
+from ocean_lib.assets.ddo import DDO
+
+logger = logging.getLogger("aquarius")
+
+
+class AsyncAquarius:
+    """Async version of `Aquarius`, for the calls of `AsyncOceanAssets`.
+
+    Use it as an async context manager, or `await close()` when done.
+    """
+
+    def __init__(
+        self, aquarius_url: str, session: Optional[aiohttp.ClientSession] = None
+    ) -> None:
+        """
+        Unlike `Aquarius`, does not check the url: that would need a request.
+
+        :param aquarius_url: Url of the aquarius instance.
+        :param session: aiohttp session to use, e.g. shared with a provider client
+        """
+        assert aquarius_url, f'Invalid url "{aquarius_url}"'
+        # :HACK:
+        if "/api/aquarius/assets" in aquarius_url:
+            aquarius_url = aquarius_url[: aquarius_url.find("/api/aquarius/assets")]
+
+        self.base_url = f"{aquarius_url}/api/aquarius/assets"
+        self._session = session
+        self._owns_session = session is None
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """The aiohttp session, created on first use within the event loop."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession()
+            self._owns_session = True
+
+        return self._session
+
+    async def close(self) -> None:
+        if self._owns_session and self._session is not None:
+            await self._session.close()
+
+        self._session = None
+
+    async def __aenter__(self) -> "AsyncAquarius":
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.close()
+
+    async def get_ddo(self, did: str, refresh: bool = False) -> Optional[DDO]:
+        """Retrieve ddo for a given did, see `Aquarius.get_ddo`.
+
+        Uses the same DDO cache as `Aquarius`.
+        """
+        key = (self.base_url, did)
+        if not refresh:
+            found, ddo = Aquarius._ddo_cache.get_cached(key)
+            if found:
+                return copy.deepcopy(ddo)
+
+        async with self.session.get(f"{self.base_url}/ddo/{did}") as response:
+            if response.status == 200:
+                ddo_dict = await response.json(content_type=None)
+                return copy.deepcopy(Aquarius._cache_ddo(key, ddo_dict))
+
+            if response.status == 404:
+                Aquarius._ddo_cache.invalidate(key)
+
+        return None
+
+    async def get_ddos(
+        self,
+        dids: List[str],
+        batch_size: int = DDO_BATCH_SIZE,
+        max_workers: int = DDO_BATCH_WORKERS,
+    ) -> List[Optional[DDO]]:
+        """Retrieve the ddos of many dids, see `Aquarius.get_ddos`."""
+        assert batch_size > 0, "batch_size has to be positive."
+
+        ddos: Dict[str, DDO] = {}
+        missing = []
+        for did in dict.fromkeys(dids):
+            found, ddo = Aquarius._ddo_cache.get_cached((self.base_url, did))
+            if found:
+                ddos[did] = ddo
+            else:
+                missing.append(did)
+
+        semaphore = asyncio.Semaphore(max(max_workers, 1))
+
+        async def query_batch(batch: List[str]) -> list:
+            async with semaphore:
+                return await self.query_search(
+                    {"query": {"terms": {"_id": batch}}, "size": len(batch)}
+                )
+
+        results = await asyncio.gather(
+            *[
+                query_batch(missing[i : i + batch_size])
+                for i in range(0, len(missing), batch_size)
+            ]
+        )
+
+        for hits in results:
+            for hit in hits:
+                if "_source" in hit:
+                    did = hit["_source"]["id"]
+                    key = (self.base_url, did)
+                    ddos[did] = Aquarius._cache_ddo(key, hit["_source"])
+
+        return [copy.deepcopy(ddos[did]) if did in ddos else None for did in dids]
+
+    def invalidate_ddo(self, did: Optional[str] = None) -> None:
+        """Drops the cached DDO of `did`, or all cached DDOs of this Aquarius."""
+        if did is not None:
+            Aquarius._ddo_cache.invalidate((self.base_url, did))
+        else:
+            Aquarius._ddo_cache.invalidate_matching(lambda key: key[0] == self.base_url)
+
+    async def query_search(self, search_query: dict) -> list:
+        """
+        Search using a query, see `Aquarius.query_search`.
+
+        :param search_query: Python dictionary, query following elasticsearch syntax
+        :return: List of DDO
+        """
+        async with self.session.post(
+            f"{self.base_url}/query", json=search_query
+        ) as response:
+            if response.status == 200:
+                return (await response.json(content_type=None))["hits"]["hits"]
+
+            content = await response.read()
+
+        raise ValueError(f"Unable to search for DDO: {content}")
@@ -2,11 +2,23 @@
 # Copyright 2023 Ocean Protocol Foundation
 # SPDX-License-Identifier: Apache-2.0
 #
+from unittest.mock import Mock
+
 import pytest
 
+from ocean_lib.aquarius import aquarius as aquarius_module
 from ocean_lib.aquarius.aquarius import Aquarius
 from ocean_lib.assets.ddo import DDO
 from ocean_lib.example_config import METADATA_CACHE_URI
+from tests.resources.ddo_helpers import get_sample_ddo
+
+
+@pytest.fixture(autouse=True)
+def ddo_cache():
+    """Keeps the DDOs a test caches, in the class-level cache, from other tests."""
+    Aquarius._ddo_cache.invalidate()
+    yield Aquarius._ddo_cache
+    Aquarius._ddo_cache.invalidate()
 
 
 @pytest.mark.unit
@@ -53,3 +65,137 @@ def test_invalid_search_query():
 def test_empty_responses():
     aquarius = Aquarius.get_instance(METADATA_CACHE_URI)
     assert aquarius.get_ddo_metadata("inexistent_ddo") == {}
+
+
+@pytest.mark.unit
+def test_get_ddo_cache(monkeypatch):
+    ddo_dict = get_sample_ddo()
+    ddo_dict["event"] = {"tx": "0x01", "block": 10}
+    ddo_url = f"http://aqua/api/aquarius/assets/ddo/{ddo_dict['id']}"
+    responses = []
+    status_codes = []
+
+    def get(url):
+        if url == "http://aqua":
+            return Mock(status_code=200)
+
+        responses.append(url)
+        assert url == ddo_url
+        status_code = status_codes.pop() if status_codes else 200
+        return Mock(status_code=status_code, json=lambda: ddo_dict)
+
+    session = Mock(get=get)
+    monkeypatch.setattr(aquarius_module, "get_requests_session", lambda: session)
+    aquarius = Aquarius("http://aqua")
+
+    ddo1 = aquarius.get_ddo(ddo_dict["id"])
+    ddo2 = Aquarius.get_instance("http://aqua").get_ddo(ddo_dict["id"])
+    assert len(responses) == 1
+    assert ddo2.did == ddo1.did
+
+    # callers get their own copies
+    ddo1.metadata["name"] = "changed"
+    assert aquarius.get_ddo(ddo_dict["id"]).metadata["name"] != "changed"
+
+    # a newer indexed version replaces the cached one, an older one does not
+    ddo_dict = dict(ddo_dict, event={"tx": "0x02", "block": 11})
+    assert aquarius.get_ddo(ddo_dict["id"], refresh=True).event["tx"] == "0x02"
+    ddo_dict = dict(ddo_dict, event={"tx": "0x00", "block": 9})
+    assert aquarius.get_ddo(ddo_dict["id"], refresh=True).event["tx"] == "0x02"
+    assert aquarius.get_ddo(ddo_dict["id"]).event["tx"] == "0x02"
+    assert len(responses) == 3
+
+    # e.g. after OceanAssets.update
+    aquarius.invalidate_ddo(ddo_dict["id"])
+    assert aquarius.get_ddo(ddo_dict["id"]).event["tx"] == "0x00"
+    assert len(responses) == 4
+
+    # an asset that is gone is not served from the cache anymore
+    status_codes.append(500)
+    assert aquarius.get_ddo(ddo_dict["id"], refresh=True) is None
+    assert aquarius.get_ddo(ddo_dict["id"]) is not None
+    status_codes.append(404)
+    assert aquarius.get_ddo(ddo_dict["id"], refresh=True) is None
+    status_codes.append(404)
+    assert aquarius.get_ddo(ddo_dict["id"]) is None
+    assert len(responses) == 7
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("prefetch", [False, True])
+def test_iter_query_search(monkeypatch, prefetch):
+    monkeypatch.setattr(
+        aquarius_module,
+        "get_requests_session",
+        lambda: Mock(get=lambda url: Mock(status_code=200)),
+    )
+    aquarius = Aquarius("http://aqua")
+    queries = []
+    hits = [{"_id": i, "sort": [i]} for i in range(7)]
+
+    def query_search(search_query):
+        queries.append(search_query)
+        if "search_after" in search_query:
+            start = search_query["search_after"][0] + 1
+        else:
+            start = search_query.get("from", 0)
+        return hits[start : start + search_query["size"]]
+
+    monkeypatch.setattr(aquarius, "query_search", query_search)
+
+    query = {"query": {"match_all": {}}}
+    assert list(aquarius.iter_query_search(query, 3, prefetch)) == hits
+    assert [q["from"] for q in queries] == [0, 3, 6]
+    assert query == {"query": {"match_all": {}}}
+
+    # with a sort, pages follow the last hit
+    queries.clear()
+    query = {"query": {"match_all": {}}, "sort": [{"_id": "asc"}]}
+    results = aquarius.iter_query_search(query, 3, prefetch)
+    assert next(results) == hits[0]
+    assert len(queries) == (2 if prefetch else 1)
+    assert list(results) == hits[1:]
+    assert [q.get("search_after") for q in queries] == [None, [2], [5]]
+
+
+@pytest.mark.unit
+def test_get_ddos(monkeypatch):
+    monkeypatch.setattr(
+        aquarius_module,
+        "get_requests_session",
+        lambda: Mock(get=lambda url: Mock(status_code=200)),
+    )
+    aquarius = Aquarius("http://aqua-batch")
+    known = {f"did:op:{i}": dict(get_sample_ddo(), id=f"did:op:{i}") for i in range(5)}
+    queries = []
+
+    def query_search(search_query):
+        queries.append(search_query)
+        return [
+            {"_source": known[did]}
+            for did in search_query["query"]["terms"]["_id"]
+            if did in known
+        ]
+
+    monkeypatch.setattr(aquarius, "query_search", query_search)
+    aquarius._cache_ddo((aquarius.base_url, "did:op:0"), known["did:op:0"])
+
+    dids = ["did:op:4", "did:op:missing", "did:op:0", "did:op:1", "did:op:4"]
+    ddos = aquarius.get_ddos(dids, batch_size=2)
+
+    assert [ddo.did if ddo else None for ddo in ddos] == [
+        "did:op:4",
+        None,
+        "did:op:0",
+        "did:op:1",
+        "did:op:4",
+    ]
+    assert ddos[0] is not ddos[4]
+
+    # the cached did is not queried, and each did is queried once
+    batches = [q["query"]["terms"]["_id"] for q in queries]
+    assert sorted(batches) == [["did:op:1"], ["did:op:4", "did:op:missing"]]
+
+    # found DDOs are cached for get_ddo
+    aquarius.requests_session = None
+    assert aquarius.get_ddo("did:op:1").did == "did:op:1"
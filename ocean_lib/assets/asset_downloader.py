@@ -5,7 +5,7 @@
 
 import logging
 import os
-from typing import Optional, Union
+from typing import Callable, Optional, Union
 
 from enforce_typing import enforce_types
 
@@ -26,6 +26,9 @@ def download_asset_files(
     order_tx_id: Union[str, bytes],
     index: Optional[int] = None,
     userdata: Optional[dict] = None,
+    max_workers: int = 1,
+    progress_callback: Optional[Callable] = None,
+    verify_checksum: bool = False,
 ) -> str:
     """Download asset data file or result file from compute job.
 
@@ -36,6 +39,9 @@ def download_asset_files(
     :param order_tx_id: hex str or hex bytes the transaction hash of the startOrder tx
     :param index: Index of the document that is going to be downloaded, Optional[int]
     :param userdata: Dict of additional data from user
+    :param max_workers: number of files downloaded at the same time, int
+    :param progress_callback: called with (bytes_done, total_bytes) while downloading
+    :param verify_checksum: check the files against the checksums from Provider, bool
     :return: asset folder path, str
     """
     data_provider = DataServiceProvider
@@ -78,6 +84,9 @@ def download_asset_files(
         destination_folder=asset_folder,
         index=index,
         userdata=userdata,
+        max_workers=max_workers,
+        progress_callback=progress_callback,
+        verify_checksum=verify_checksum,
     )
 
     return asset_folder
@@ -0,0 +1,653 @@
+#
+# Copyright 2023 Ocean Protocol Foundation
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Provider client for asyncio applications."""
+import asyncio
+import functools
+import json
+import logging
+import os
+from json import JSONDecodeError
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+import aiohttp
+from requests.exceptions import InvalidURL
+from requests.models import PreparedRequest, Response
+from requests.structures import CaseInsensitiveDict
+from yarl import URL
+
+from ocean_lib.agreements.service_types import ServiceTypes
+from ocean_lib.data_provider.base import (
+    DOWNLOAD_CHUNK_SIZE,
+    DataServiceProviderBase,
+    PartialDownload,
+)
+from ocean_lib.data_provider.data_encryptor import DataEncryptor
+from ocean_lib.data_provider.data_service_provider import (
+    DOWNLOAD_NONCE_RETRIES,
+    DOWNLOAD_RETRIES,
+    DOWNLOAD_TIMEOUT,
+    DataServiceProvider,
+)
+from ocean_lib.data_provider.nonce_tracker import (
+    ProviderNonceTracker,
+    get_provider_nonce_tracker,
+)
+from ocean_lib.exceptions import OceanEncryptAssetUrlsError
+from ocean_lib.models.compute_input import ComputeInput
+from ocean_lib.structures.algorithm_metadata import AlgorithmMetadata
+
+logger = logging.getLogger(__name__)
+
+# connections an AsyncDataServiceProvider keeps open, over all providers
+ASYNC_POOL_SIZE = 100
+
+
+class AsyncDataServiceProvider:
+    """Provider client for asyncio applications.
+
+    Offers the calls of DataServiceProvider, FileInfoProvider and
+    DataEncryptor as coroutines, over one pooled aiohttp session. Responses
+    are returned as `requests` responses and checked like the blocking
+    client does. Provider endpoints and nonces are shared with it.
+
+    Use it as an async context manager, or `await close()` when done.
+    """
+
+    def __init__(
+        self,
+        session: Optional[aiohttp.ClientSession] = None,
+        pool_size: int = ASYNC_POOL_SIZE,
+    ) -> None:
+        self._session = session
+        self._owns_session = session is None
+        self.pool_size = pool_size
+        self._nonce_fetches: Dict[ProviderNonceTracker, asyncio.Future] = {}
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """The aiohttp session, created on first use within the event loop."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.pool_size)
+            )
+            self._owns_session = True
+
+        return self._session
+
+    async def close(self) -> None:
+        if self._owns_session and self._session is not None:
+            await self._session.close()
+
+        self._session = None
+
+    async def __aenter__(self) -> "AsyncDataServiceProvider":
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.close()
+
+    async def _http_method(
+        self,
+        method: str,
+        url: str,
+        params: Optional[dict] = None,
+        timeout: Optional[aiohttp.ClientTimeout] = None,
+        **kwargs,
+    ) -> Response:
+        try:
+            async with self.session.request(
+                method.upper(), _prepare_url(url, params), timeout=timeout, **kwargs
+            ) as response:
+                return _to_response(response, await response.read())
+        except Exception:
+            logger.error(
+                f"Error invoking http method {method}: url={url}, kwargs={str(kwargs)}"
+            )
+            raise
+
+    async def get_root_uri(self, service_endpoint: str) -> str:
+        """Async version of `DataServiceProviderBase.get_root_uri`."""
+        result, root_result = DataServiceProviderBase._split_root_uri(service_endpoint)
+
+        cache = DataServiceProviderBase._root_uri_cache
+        if not cache.get_cached(root_result)[0]:
+            try:
+                provider_info = (await self._http_method("get", root_result)).json()
+            except (aiohttp.ClientError, asyncio.TimeoutError, JSONDecodeError):
+                raise InvalidURL(f"InvalidURL {service_endpoint}.")
+
+            DataServiceProviderBase._check_provider_info(
+                provider_info, service_endpoint
+            )
+            cache.set(root_result, True)
+
+        return result
+
+    async def get_service_endpoints(self, provider_uri: str) -> Dict[str, List[str]]:
+        """Async version of `DataServiceProviderBase.get_service_endpoints`."""
+        cache = DataServiceProviderBase._service_endpoints_cache
+        found, service_endpoints = cache.get_cached(provider_uri)
+        if not found:
+            provider_info = (await self._http_method("get", provider_uri)).json()
+            service_endpoints = provider_info["serviceEndpoints"]
+            cache.set(provider_uri, service_endpoints)
+
+        return service_endpoints
+
+    async def build_endpoint(
+        self, service_name: str, provider_uri: str, params: Optional[dict] = None
+    ) -> Tuple[str, str]:
+        provider_uri = await self.get_root_uri(provider_uri)
+        service_endpoints = await self.get_service_endpoints(provider_uri)
+
+        return DataServiceProviderBase._endpoint_url(
+            service_endpoints, service_name, provider_uri, params
+        )
+
+    async def sync_nonce(self, address: str, provider_uri: str) -> None:
+        """Fetches the provider's last nonce of `address`, if it is not known.
+
+        After this, `sign_message` allocates nonces without blocking.
+        """
+        tracker = get_provider_nonce_tracker(
+            provider_uri,
+            address,
+            lambda: DataServiceProviderBase._fetch_nonce(address, provider_uri),
+        )
+        if not tracker.needs_sync:
+            return
+
+        # concurrent callers wait for the same request
+        fetch = self._nonce_fetches.get(tracker)
+        if fetch is None:
+            fetch = asyncio.ensure_future(self._fetch_nonce(address, provider_uri))
+            self._nonce_fetches[tracker] = fetch
+            fetch.add_done_callback(lambda _: self._nonce_fetches.pop(tracker, None))
+
+        tracker.sync(await asyncio.shield(fetch))
+
+    async def _fetch_nonce(self, address: str, provider_uri: str) -> int:
+        method, nonce_endpoint = await self.build_endpoint("nonce", provider_uri)
+        response = await self._http_method(
+            method, nonce_endpoint, params={"userAddress": address}
+        )
+
+        return DataServiceProviderBase._nonce_from_response(response)
+
+    async def sign_message(
+        self, wallet, msg: str, provider_uri: str
+    ) -> Tuple[int, str]:
+        """Async version of `DataServiceProviderBase.sign_message`."""
+        await self.sync_nonce(wallet.address, provider_uri)
+
+        # signing happens in a thread: clef signs over a blocking http request,
+        # and the nonce may have been resynced since `sync_nonce`
+        return await asyncio.get_running_loop().run_in_executor(
+            None,
+            functools.partial(
+                DataServiceProviderBase.sign_message, wallet, msg, provider_uri
+            ),
+        )
+
+    async def initialize(
+        self,
+        did: str,
+        service: Any,
+        consumer_address: str,
+        userdata: Optional[Dict] = None,
+    ) -> Response:
+        method, initialize_endpoint = await self.build_endpoint(
+            "initialize", service.service_endpoint
+        )
+
+        payload = {
+            "documentId": did,
+            "serviceId": service.id,
+            "consumerAddress": consumer_address,
+        }
+
+        if userdata is not None:
+            payload["userdata"] = json.dumps(userdata)
+
+        response = await self._http_method(method, initialize_endpoint, params=payload)
+
+        DataServiceProviderBase.check_response(
+            response, "initializeEndpoint", initialize_endpoint, payload
+        )
+
+        return response
+
+    async def initialize_compute(
+        self,
+        datasets: List[Dict[str, Any]],
+        algorithm_data: Dict[str, Any],
+        service_endpoint: str,
+        consumer_address: str,
+        compute_environment: str,
+        valid_until: int,
+    ) -> Response:
+        method, initialize_compute_endpoint = await self.build_endpoint(
+            "initializeCompute", service_endpoint
+        )
+
+        payload = {
+            "datasets": datasets,
+            "algorithm": algorithm_data,
+            "compute": {
+                "env": compute_environment,
+                "validUntil": valid_until,
+            },
+            "consumerAddress": consumer_address,
+        }
+
+        response = await self._http_method(
+            method,
+            initialize_compute_endpoint,
+            data=json.dumps(payload),
+            headers={"content-type": "application/json"},
+        )
+
+        DataServiceProviderBase.check_response(
+            response, "initializeComputeEndpoint", initialize_compute_endpoint, payload
+        )
+
+        return response
+
+    async def fileinfo(
+        self,
+        did: str,
+        service: Any,
+        with_checksum: bool = False,
+        userdata: Optional[dict] = None,
+    ) -> Response:
+        method, fileinfo_endpoint = await self.build_endpoint(
+            "fileinfo", service.service_endpoint
+        )
+
+        payload = {"did": did, "serviceId": service.id}
+
+        if userdata is not None:
+            payload["userdata"] = userdata
+
+        if with_checksum:
+            payload["checksum"] = 1
+
+        response = await self._http_method(method, fileinfo_endpoint, json=payload)
+
+        DataServiceProviderBase.check_response(
+            response, "fileInfoEndpoint", fileinfo_endpoint, payload
+        )
+
+        return response
+
+    async def check_asset_file_info(
+        self,
+        did: str,
+        service_id: str,
+        provider_uri: str,
+        userdata: Optional[dict] = None,
+    ) -> bool:
+        """Async version of `DataServiceProvider.check_asset_file_info`."""
+        if not did:
+            return False
+
+        method, endpoint = await self.build_endpoint("fileinfo", provider_uri)
+        data = {"did": did, "serviceId": service_id}
+
+        if userdata is not None:
+            data["userdata"] = userdata
+
+        response = await self._http_method(method, endpoint, json=data)
+
+        if not response or response.status_code != 200:
+            return False
+
+        return any([file_info["valid"] for file_info in response.json()])
+
+    async def encrypt(
+        self,
+        objects_to_encrypt: Union[list, str, bytes, dict],
+        provider_uri: str,
+        chain_id: int,
+    ) -> Response:
+        payload = DataEncryptor._encode_payload(objects_to_encrypt)
+
+        method, encrypt_endpoint = await self.build_endpoint(
+            "encrypt", provider_uri, {"chainId": chain_id}
+        )
+
+        response = await self._http_method(
+            method,
+            encrypt_endpoint,
+            data=payload,
+            headers={"Content-type": "application/octet-stream"},
+        )
+
+        DataServiceProviderBase.check_response(
+            response,
+            "encryptEndpoint",
+            encrypt_endpoint,
+            payload,
+            [201],
+            OceanEncryptAssetUrlsError,
+        )
+
+        return response
+
+    async def download(
+        self,
+        did: str,
+        service: Any,
+        tx_id: Union[str, bytes],
+        consumer_wallet,
+        destination_folder: Union[str, os.PathLike],
+        index: Optional[int] = None,
+        userdata: Optional[Dict] = None,
+        max_workers: int = 1,
+        chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+        timeout: Union[int, float, tuple] = DOWNLOAD_TIMEOUT,
+        progress_callback: Optional[Callable] = None,
+        verify_checksum: bool = False,
+    ) -> None:
+        """Async version of `DataServiceProvider.download`.
+
+        Files are written to disk from the event loop, one chunk at a time.
+        """
+        assert max_workers >= 1, logger.error("max_workers has to be at least 1.")
+
+        service_endpoint = service.service_endpoint
+        fileinfo_response = await self.fileinfo(
+            did, service, with_checksum=verify_checksum, userdata=userdata
+        )
+
+        files = fileinfo_response.json()
+        indexes = DataServiceProvider._get_file_indexes(files, index)
+
+        method, download_endpoint = await self.build_endpoint(
+            "download", service_endpoint
+        )
+
+        payload = {
+            "documentId": did,
+            "serviceId": service.id,
+            "consumerAddress": consumer_wallet.address,
+            "transferTxId": tx_id,
+        }
+
+        if userdata:
+            payload["userdata"] = json.dumps(userdata)
+
+        on_chunk = DataServiceProvider._get_progress_reporter(
+            progress_callback, files, indexes
+        )
+        client_timeout = _client_timeout(timeout)
+
+        async def write_file(i: int, offset: int, checksum: Optional[str]) -> None:
+            file_payload = dict(payload, fileIndex=i)
+            headers = DataServiceProvider.get_resume_headers(
+                destination_folder, i, offset
+            )
+
+            for attempt in range(DOWNLOAD_NONCE_RETRIES + 1):
+                nonce, signature = await self.sign_message(
+                    consumer_wallet, did, service_endpoint
+                )
+                file_payload.update(nonce=nonce, signature=signature)
+
+                async with self.session.request(
+                    method.upper(),
+                    _prepare_url(download_endpoint, file_payload),
+                    headers=headers,
+                    timeout=client_timeout,
+                ) as response:
+                    if response.status not in (200, 206):
+                        error = _to_response(response, await response.read())
+
+                        # see DataServiceProvider.download
+                        if attempt < DOWNLOAD_NONCE_RETRIES and (
+                            DataServiceProvider._is_nonce_rejection(error)
+                        ):
+                            continue
+
+                        DataServiceProvider._check_download_response(
+                            error, download_endpoint, file_payload, offset
+                        )
+
+                    with PartialDownload(
+                        destination_folder,
+                        i,
+                        response.status,
+                        response.headers.get("Content-Range"),
+                        chunk_size=chunk_size,
+                        on_chunk=on_chunk,
+                        checksum=checksum,
+                        checksum_type=files[i].get("checksumType", "sha256"),
+                        headers=response.headers,
+                    ) as download:
+                        async for chunk in response.content.iter_chunked(chunk_size):
+                            download.write(chunk)
+
+                    return
+
+        async def download_file(i: int) -> None:
+            part_path = DataServiceProvider.get_part_path(destination_folder, i)
+            offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+            if offset and on_chunk:
+                on_chunk(offset)
+
+            checksum = files[i].get("checksum") if verify_checksum else None
+            if verify_checksum and not checksum:
+                logger.warning(f"Provider has no checksum of file{i} to verify.")
+
+            for attempt in range(DOWNLOAD_RETRIES + 1):
+                try:
+                    await write_file(i, offset, checksum)
+                    break
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    if attempt == DOWNLOAD_RETRIES:
+                        raise
+
+                    if os.path.exists(part_path):
+                        offset = os.path.getsize(part_path)
+                    logger.warning(
+                        f"Download of file{i} interrupted, resuming at byte "
+                        f"{offset}: {e!r}"
+                    )
+
+        semaphore = asyncio.Semaphore(max_workers)
+
+        async def download_limited(i: int) -> None:
+            async with semaphore:
+                await download_file(i)
+
+        tasks = [asyncio.ensure_future(download_limited(i)) for i in indexes]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def start_compute_job(
+        self,
+        dataset_compute_service: Any,
+        consumer,
+        dataset: ComputeInput,
+        compute_environment: str,
+        algorithm: Optional[ComputeInput] = None,
+        algorithm_meta: Optional[AlgorithmMetadata] = None,
+        algorithm_custom_data: Optional[str] = None,
+        input_datasets: Optional[List[ComputeInput]] = None,
+    ) -> Dict[str, Any]:
+        """Async version of `DataServiceProvider.start_compute_job`."""
+        assert (
+            algorithm or algorithm_meta
+        ), "either an algorithm did or an algorithm meta must be provided."
+
+        assert (
+            hasattr(dataset_compute_service, "type")
+            and dataset_compute_service.type == ServiceTypes.CLOUD_COMPUTE
+        ), "invalid compute service"
+
+        service_endpoint = dataset_compute_service.service_endpoint
+        await self.sync_nonce(consumer.address, service_endpoint)
+        method, compute_endpoint = await self.build_endpoint(
+            "computeStart", service_endpoint
+        )
+
+        # the payload is signed in a thread, see `sign_message`
+        payload = await asyncio.get_running_loop().run_in_executor(
+            None,
+            functools.partial(
+                DataServiceProvider._prepare_compute_payload,
+                consumer=consumer,
+                dataset=dataset,
+                compute_environment=compute_environment,
+                dataset_compute_service=dataset_compute_service,
+                algorithm=algorithm,
+                algorithm_meta=algorithm_meta,
+                algorithm_custom_data=algorithm_custom_data,
+                input_datasets=input_datasets,
+            ),
+        )
+
+        response = await self._http_method(
+            method,
+            compute_endpoint,
+            data=json.dumps(payload),
+            headers={"content-type": "application/json"},
+        )
+
+        DataServiceProviderBase.check_response(
+            response, "computeStartEndpoint", compute_endpoint, payload, [200, 201]
+        )
+
+        job_info = response.json()
+        return job_info[0] if isinstance(job_info, list) else job_info
+
+    async def stop_compute_job(
+        self, did: str, job_id: str, dataset_compute_service: Any, consumer
+    ) -> Dict[str, Any]:
+        _, compute_stop_endpoint = await self.build_endpoint(
+            "computeStop", dataset_compute_service.service_endpoint
+        )
+        return await self._send_compute_request(
+            "put", did, job_id, compute_stop_endpoint, consumer
+        )
+
+    async def delete_compute_job(
+        self, did: str, job_id: str, dataset_compute_service: Any, consumer
+    ) -> Dict[str, str]:
+        method, compute_delete_endpoint = await self.build_endpoint(
+            "computeDelete", dataset_compute_service.service_endpoint
+        )
+        return await self._send_compute_request(
+            method, did, job_id, compute_delete_endpoint, consumer
+        )
+
+    async def compute_job_status(
+        self, did: str, job_id: str, dataset_compute_service: Any, consumer
+    ) -> Dict[str, Any]:
+        method, compute_status_endpoint = await self.build_endpoint(
+            "computeStatus", dataset_compute_service.service_endpoint
+        )
+        return await self._send_compute_request(
+            method, did, job_id, compute_status_endpoint, consumer
+        )
+
+    async def compute_job_result(
+        self, job_id: str, index: int, dataset_compute_service: Any, consumer
+    ) -> bytes:
+        nonce, signature = await self.sign_message(
+            consumer,
+            f"{consumer.address}{job_id}{str(index)}",
+            provider_uri=dataset_compute_service.service_endpoint,
+        )
+
+        params = {
+            "signature": signature,
+            "nonce": nonce,
+            "jobId": job_id,
+            "index": index,
+            "consumerAddress": consumer.address,
+        }
+
+        method, compute_job_result_endpoint = await self.build_endpoint(
+            "computeResult", dataset_compute_service.service_endpoint
+        )
+        response = await self._http_method(
+            method, compute_job_result_endpoint, params=params
+        )
+
+        DataServiceProviderBase.check_response(
+            response, "jobResultEndpoint", compute_job_result_endpoint, params
+        )
+
+        return response.content
+
+    async def _send_compute_request(
+        self, http_method: str, did: str, job_id: str, service_endpoint: str, consumer
+    ) -> Dict[str, Any]:
+        nonce, signature = await self.sign_message(
+            consumer,
+            f"{consumer.address}{job_id}{did}",
+            provider_uri=service_endpoint,
+        )
+
+        payload = {
+            "consumerAddress": consumer.address,
+            "documentId": did,
+            "jobId": job_id,
+            "nonce": nonce,
+            "signature": signature,
+        }
+
+        response = await self._http_method(
+            http_method, service_endpoint, params=payload
+        )
+
+        DataServiceProviderBase.check_response(
+            response, "compute Endpoint", service_endpoint, payload
+        )
+
+        resp_content = response.json()
+
+        if isinstance(resp_content, list):
+            return resp_content[0]
+
+        return resp_content
+
+
+def _prepare_url(url: str, params: Optional[dict] = None) -> URL:
+    """Encodes `params` into `url` the way `requests` does."""
+    if params:
+        req = PreparedRequest()
+        req.prepare_url(url, params)
+        url = req.url
+
+    return URL(url, encoded=True)
+
+
+def _to_response(client_response: aiohttp.ClientResponse, content: bytes) -> Response:
+    """Wraps an aiohttp response, and its body, in a `requests` response."""
+    response = Response()
+    response.status_code = client_response.status
+    response.reason = client_response.reason
+    response.headers = CaseInsensitiveDict(client_response.headers)
+    response.url = str(client_response.url)
+    response.encoding = client_response.charset or "utf-8"
+    response._content = content
+
+    # endpoints may have moved, e.g. after a provider upgrade
+    if response.status_code == 404:
+        DataServiceProviderBase.invalidate_provider_cache(response.url)
+
+    return response
+
+
+def _client_timeout(timeout: Union[int, float, tuple]) -> aiohttp.ClientTimeout:
+    """Turns a `requests` timeout into the aiohttp equivalent."""
+    connect, read = timeout if isinstance(timeout, tuple) else (timeout, timeout)
+
+    return aiohttp.ClientTimeout(sock_connect=connect, sock_read=read)
@@ -4,12 +4,14 @@
 #
 
 """Provider module."""
+import hashlib
+import json
 import logging
 import os
 import re
 from json import JSONDecodeError
 from math import ceil
-from typing import Dict, List, Optional, Tuple, Union
+from typing import Callable, Dict, List, Mapping, Optional, Tuple, Union
 from unittest.mock import Mock
 
 import requests
@@ -18,13 +20,24 @@ from requests.exceptions import InvalidURL
 from requests.models import PreparedRequest, Response
 from requests.sessions import Session
 
-from ocean_lib.exceptions import DataProviderException
+from ocean_lib.data_provider.nonce_tracker import (
+    get_provider_nonce_tracker,
+    resync_provider_nonces,
+)
+from ocean_lib.exceptions import ChecksumMismatch, DataProviderException
 from ocean_lib.http_requests.requests_session import get_requests_session
+from ocean_lib.http_requests.ttl_cache import TTLCache
 from ocean_lib.web3_internal.clef import ClefAccount
-from ocean_lib.web3_internal.utils import sign_with_clef, sign_with_key
+from ocean_lib.web3_internal.utils import get_signer, sign_with_clef
 
 logger = logging.getLogger(__name__)
 
+# seconds a provider's root check and service endpoints are reused
+PROVIDER_INFO_TTL = 300
+
+# bytes read from the stream per write when saving a downloaded file
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
 
 class DataServiceProviderBase:
     """DataServiceProviderBase class."""
@@ -32,6 +45,10 @@ class DataServiceProviderBase:
     _http_client = get_requests_session()
     provider_info = None
 
+    # provider root -> validated, and root uri -> its serviceEndpoints map
+    _root_uri_cache = TTLCache(PROVIDER_INFO_TTL)
+    _service_endpoints_cache = TTLCache(PROVIDER_INFO_TTL)
+
     @staticmethod
     @enforce_types
     def get_http_client() -> Session:
@@ -43,36 +60,78 @@ class DataServiceProviderBase:
     def set_http_client(http_client: Session) -> None:
         """Set the http client to something other than the default `requests`."""
         DataServiceProviderBase._http_client = http_client
+        DataServiceProviderBase.invalidate_provider_cache()
+        resync_provider_nonces()
+
+    @staticmethod
+    @enforce_types
+    def invalidate_provider_cache(provider_uri: Optional[str] = None) -> None:
+        """Forgets the cached provider root checks and service endpoints.
+
+        :param provider_uri: any url of the provider; None for all providers
+        """
+        if provider_uri is None:
+            DataServiceProviderBase._root_uri_cache.invalidate()
+            DataServiceProviderBase._service_endpoints_cache.invalidate()
+            return
+
+        root = "/".join(provider_uri.split("/")[0:3])
+        DataServiceProviderBase._root_uri_cache.invalidate(root)
+        DataServiceProviderBase._service_endpoints_cache.invalidate_matching(
+            lambda uri: uri.startswith(root)
+        )
 
     @staticmethod
     @enforce_types
     def sign_message(wallet, msg: str, provider_uri: str) -> Tuple[str, str]:
+        """Signs `msg` for a provider request, with the next provider nonce.
+
+        Nonces are fetched from the provider once per address, then
+        incremented locally (see `ProviderNonceTracker`).
+        """
+        tracker = get_provider_nonce_tracker(
+            provider_uri,
+            wallet.address,
+            lambda: DataServiceProviderBase._fetch_nonce(wallet.address, provider_uri),
+        )
+        nonce = tracker.next_nonce()
+
+        logger.debug(
+            f"signing message with nonce {nonce}: {msg}, account={wallet.address}"
+        )
+
+        if isinstance(wallet, ClefAccount):
+            return nonce, str(sign_with_clef(f"{msg}{nonce}", wallet))
+
+        signer = get_signer(wallet)
+
+        return nonce, str(signer.sign(f"{msg}{nonce}"))
+
+    @staticmethod
+    @enforce_types
+    def _fetch_nonce(address: str, provider_uri: str) -> int:
+        """Returns the last nonce the provider saw from `address`."""
         method, nonce_endpoint = DataServiceProviderBase.build_endpoint(
             "nonce", provider_uri
         )
 
         nonce_response = DataServiceProviderBase._http_method(
-            method, url=nonce_endpoint, params={"userAddress": wallet.address}
+            method, url=nonce_endpoint, params={"userAddress": address}
         )
 
+        return DataServiceProviderBase._nonce_from_response(nonce_response)
+
+    @staticmethod
+    def _nonce_from_response(nonce_response) -> int:
         if (
             not nonce_response
             or not hasattr(nonce_response, "status_code")
             or nonce_response.status_code != 200
             or "nonce" not in nonce_response.json()
         ):
-            current_nonce = 0
-        else:
-            current_nonce = int(ceil(float(nonce_response.json()["nonce"])))
+            return 0
 
-        nonce = current_nonce + 1
-
-        print(f"signing message with nonce {nonce}: {msg}, account={wallet.address}")
-
-        if isinstance(wallet, ClefAccount):
-            return nonce, str(sign_with_clef(f"{msg}{nonce}", wallet))
-
-        return nonce, str(sign_with_key(f"{msg}{nonce}", wallet._private_key.hex()))
+        return int(ceil(float(nonce_response.json()["nonce"])))
 
     @staticmethod
     @enforce_types
@@ -89,12 +148,18 @@ class DataServiceProviderBase:
     def get_service_endpoints(provider_uri: str) -> Dict[str, List[str]]:
         """
         Return the service endpoints from the provider URL.
+
+        The result is cached for `PROVIDER_INFO_TTL` seconds.
         """
-        provider_info = DataServiceProviderBase._http_method(
-            "get", url=provider_uri
-        ).json()
 
-        return provider_info["serviceEndpoints"]
+        def fetch():
+            provider_info = DataServiceProviderBase._http_method(
+                "get", url=provider_uri
+            ).json()
+
+            return provider_info["serviceEndpoints"]
+
+        return DataServiceProviderBase._service_endpoints_cache.get(provider_uri, fetch)
 
     @staticmethod
     @enforce_types
@@ -148,6 +213,26 @@ class DataServiceProviderBase:
     @staticmethod
     @enforce_types
     def get_root_uri(service_endpoint: str) -> str:
+        result, root_result = DataServiceProviderBase._split_root_uri(service_endpoint)
+
+        def check_root() -> bool:
+            try:
+                response = DataServiceProviderBase._http_client.get(root_result).json()
+            except (requests.exceptions.RequestException, JSONDecodeError):
+                raise InvalidURL(f"InvalidURL {service_endpoint}.")
+
+            return DataServiceProviderBase._check_provider_info(
+                response, service_endpoint
+            )
+
+        # only successful checks are cached
+        DataServiceProviderBase._root_uri_cache.get(root_result, check_root)
+
+        return result
+
+    @staticmethod
+    def _split_root_uri(service_endpoint: str) -> Tuple[str, str]:
+        """Returns the provider uri of a service endpoint, and its root url."""
         provider_uri = service_endpoint
 
         if "/api" in provider_uri:
@@ -167,14 +252,14 @@ class DataServiceProviderBase:
         if not result:
             raise InvalidURL(f"InvalidURL {service_endpoint}.")
 
-        try:
-            root_result = "/".join(parts[0:3])
-            response = requests.get(root_result).json()
-        except (requests.exceptions.RequestException, JSONDecodeError):
-            raise InvalidURL(f"InvalidURL {service_endpoint}.")
+        root_result = "/".join(parts[0:3])
+
+        return result, root_result
 
-        if "providerAddresses" not in response:
-            if "providerAddress" in response:
+    @staticmethod
+    def _check_provider_info(provider_info: dict, service_endpoint: str) -> bool:
+        if "providerAddresses" not in provider_info:
+            if "providerAddress" in provider_info:
                 logger.warning(
                     "You might be using an older provider. ocean.py can not verify the chain id."
                 )
@@ -183,7 +268,7 @@ class DataServiceProviderBase:
                     f"Invalid Provider URL {service_endpoint}, no providerAddresses."
                 )
 
-        return result
+        return True
 
     @staticmethod
     @enforce_types
@@ -203,6 +288,17 @@ class DataServiceProviderBase:
         provider_uri = DataServiceProviderBase.get_root_uri(provider_uri)
         service_endpoints = DataServiceProviderBase.get_service_endpoints(provider_uri)
 
+        return DataServiceProviderBase._endpoint_url(
+            service_endpoints, service_name, provider_uri, params
+        )
+
+    @staticmethod
+    def _endpoint_url(
+        service_endpoints: dict,
+        service_name: str,
+        provider_uri: str,
+        params: Optional[dict] = None,
+    ) -> Tuple[str, str]:
         method, url = service_endpoints[service_name]
         url = urljoin(provider_uri, url)
 
@@ -219,22 +315,77 @@ class DataServiceProviderBase:
         response: Response,
         destination_folder: Union[str, bytes, os.PathLike],
         index: int,
+        chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+        on_chunk: Optional[Callable] = None,
+        checksum: Optional[str] = None,
+        checksum_type: str = "sha256",
     ) -> None:
         """
         Write the response content in a file in the destination folder.
+
+        The content goes to `file{index}.part` first, which is renamed to
+        `file{index}` once complete. A 206 response continues the part file
+        at the start of its Content-Range, see `PartialDownload`.
         :param response: Response
         :param destination_folder: Destination folder, string
         :param index: file index
+        :param chunk_size: bytes read from the response per write
+        :param on_chunk: called with the size of each written chunk, and with
+          minus the size of any saved bytes that are discarded
+        :param checksum: expected hex digest of the whole file; the content is
+          hashed while it is written, and a mismatching file is deleted
+        :param checksum_type: hashlib name of the checksum algorithm
         :return: None
         """
-        if response.status_code != 200:
+        if response.status_code not in (200, 206):
             logger.warning(f"consume failed: {response.reason}")
             return
 
-        with open(os.path.join(destination_folder, f"file{index}"), "wb") as f:
-            for chunk in response.iter_content(chunk_size=4096):
-                f.write(chunk)
-        logger.info(f"Saved downloaded file in {f.name}")
+        content_range = None
+        if response.status_code == 206:
+            content_range = response.headers.get("content-range")
+
+        with PartialDownload(
+            destination_folder,
+            index,
+            response.status_code,
+            content_range,
+            chunk_size=chunk_size,
+            on_chunk=on_chunk,
+            checksum=checksum,
+            checksum_type=checksum_type,
+            headers=response.headers,
+        ) as download:
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                download.write(chunk)
+
+    @staticmethod
+    def get_part_path(
+        destination_folder: Union[str, bytes, os.PathLike], index: int
+    ) -> str:
+        """Returns the path of the file that an unfinished download is saved to."""
+        return os.path.join(destination_folder, f"file{index}.part")
+
+    @staticmethod
+    def get_resume_headers(
+        destination_folder: Union[str, bytes, os.PathLike], index: int, offset: int
+    ) -> Dict[str, str]:
+        """Returns the headers requesting a file from `offset` on.
+
+        The validator of the response that started the part file is sent as
+        If-Range, so a file that changed since then is sent whole instead.
+        """
+        if not offset:
+            return {}
+
+        headers = {"Range": f"bytes={offset}-"}
+        validator = PartialDownload.load_part_info(destination_folder, index).get(
+            "validator"
+        )
+        if validator:
+            headers["If-Range"] = validator
+
+        return headers
 
     @staticmethod
     @enforce_types
@@ -266,7 +417,7 @@ class DataServiceProviderBase:
     @enforce_types
     def _http_method(method: str, *args, **kwargs) -> Optional[Union[Mock, Response]]:
         try:
-            return getattr(DataServiceProviderBase._http_client, method.lower())(
+            response = getattr(DataServiceProviderBase._http_client, method.lower())(
                 *args, **kwargs
             )
         except Exception:
@@ -275,6 +426,23 @@ class DataServiceProviderBase:
             )
             raise
 
+        # endpoints may have moved, e.g. after a provider upgrade
+        if getattr(response, "status_code", None) == 404:
+            url = kwargs.get("url", args[0] if args else None)
+            if isinstance(url, str):
+                DataServiceProviderBase.invalidate_provider_cache(url)
+
+        return response
+
+    @staticmethod
+    def _is_nonce_rejection(response) -> bool:
+        status_code = getattr(response, "status_code", None)
+        return (
+            isinstance(status_code, int)
+            and status_code >= 400
+            and "nonce" in str(getattr(response, "text", "")).lower()
+        )
+
     @staticmethod
     @enforce_types
     def check_response(
@@ -285,6 +453,10 @@ class DataServiceProviderBase:
         success_codes: Optional[List] = None,
         exception_type=DataProviderException,
     ):
+        if DataServiceProviderBase._is_nonce_rejection(response):
+            # e.g. the address was used by another client meanwhile
+            resync_provider_nonces(endpoint)
+
         if not response or not hasattr(response, "status_code"):
             if isinstance(response, Response) and response.status_code == 400:
                 error = response.json().get(
@@ -313,6 +485,170 @@ class DataServiceProviderBase:
         return None
 
 
+class PartialDownload:
+    """Saves a downloaded file in `file{index}.part`, then moves it to `file{index}`.
+
+    Use it as a context manager around the writes of one response. A 206
+    response continues the part file at the start of its Content-Range, a
+    200 response starts it over. The part file is only moved into place if
+    the writes succeed, and if its content matches `checksum`.
+
+    The validator (ETag or Last-Modified) and length of the response that
+    started the part file are kept next to it, in `file{index}.part.json`.
+    A 206 response for a file of another length discards the part file.
+    """
+
+    def __init__(
+        self,
+        destination_folder: Union[str, bytes, os.PathLike],
+        index: int,
+        status_code: int,
+        content_range: Optional[str] = None,
+        chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+        on_chunk: Optional[Callable] = None,
+        checksum: Optional[str] = None,
+        checksum_type: str = "sha256",
+        headers: Optional[Mapping[str, str]] = None,
+    ) -> None:
+        self.index = index
+        self.file_path = os.path.join(destination_folder, f"file{index}")
+        self.part_path = DataServiceProviderBase.get_part_path(
+            destination_folder, index
+        )
+        self.info_path = PartialDownload.get_part_info_path(destination_folder, index)
+        self.chunk_size = chunk_size
+        self.on_chunk = on_chunk
+        self.checksum = checksum
+        self.checksum_type = checksum_type
+        self._hasher = hashlib.new(checksum_type) if checksum else None
+        self._file = None
+
+        self.saved = (
+            os.path.getsize(self.part_path) if os.path.exists(self.part_path) else 0
+        )
+        self.offset = 0
+        self._info = None
+        if status_code == 206:
+            match = re.match(r"bytes (\d+)-", content_range or "")
+            if not match:
+                raise DataProviderException(
+                    "Partial download response has no valid Content-Range header."
+                )
+
+            self.offset = int(match[1])
+            if self.offset > self.saved:
+                raise DataProviderException(
+                    f"Can not resume {self.part_path} at byte {self.offset}, "
+                    f"only {self.saved} bytes were saved."
+                )
+
+            length = re.search(r"/(\d+)$", content_range)
+            saved_length = PartialDownload.load_part_info(
+                destination_folder, index
+            ).get("length")
+            if length and saved_length and int(length[1]) != saved_length:
+                self._discard()
+                raise DataProviderException(
+                    f"file{index} is {length[1]} bytes long, not {saved_length} "
+                    f"as when its download started, so the {self.saved} bytes "
+                    f"saved were discarded. Download it again."
+                )
+        else:
+            headers = headers or {}
+            # the length of an encoded response is not the one of the file
+            length = headers.get("Content-Length")
+            if headers.get("Content-Encoding", "identity") != "identity":
+                length = None
+
+            self._info = {
+                "validator": _get_validator(headers),
+                "length": int(length) if length else None,
+            }
+
+    @staticmethod
+    def get_part_info_path(
+        destination_folder: Union[str, bytes, os.PathLike], index: int
+    ) -> str:
+        return os.path.join(destination_folder, f"file{index}.part.json")
+
+    @staticmethod
+    def load_part_info(
+        destination_folder: Union[str, bytes, os.PathLike], index: int
+    ) -> dict:
+        """Returns the validator and length of the response that started a part."""
+        try:
+            with open(
+                PartialDownload.get_part_info_path(destination_folder, index)
+            ) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _discard(self) -> None:
+        if self.saved and self.on_chunk:
+            self.on_chunk(-self.saved)
+
+        for path in (self.part_path, self.info_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def __enter__(self) -> "PartialDownload":
+        if self._info is not None:
+            # the part starts over: so does what it is validated with
+            with open(self.info_path, "w") as f:
+                json.dump(self._info, f)
+
+        if self.saved > self.offset and self.on_chunk:
+            self.on_chunk(self.offset - self.saved)
+
+        self._file = open(self.part_path, "r+b" if self.offset else "wb")
+
+        # only the bytes saved by an earlier request are read back
+        while self._hasher and self._file.tell() < self.offset:
+            self._hasher.update(
+                self._file.read(min(self.chunk_size, self.offset - self._file.tell()))
+            )
+
+        self._file.seek(self.offset)
+        self._file.truncate()
+
+        return self
+
+    def write(self, chunk: bytes) -> None:
+        self._file.write(chunk)
+        if self._hasher:
+            self._hasher.update(chunk)
+        if self.on_chunk:
+            self.on_chunk(len(chunk))
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self._file.close()
+        if exc_type is not None:
+            return
+
+        if os.path.exists(self.info_path):
+            os.remove(self.info_path)
+
+        if self._hasher and self._hasher.hexdigest().lower() != self.checksum.lower():
+            os.remove(self.part_path)
+            raise ChecksumMismatch(
+                f"Downloaded file{self.index} has {self.checksum_type} checksum "
+                f"{self._hasher.hexdigest()}, expected {self.checksum}."
+            )
+
+        os.replace(self.part_path, self.file_path)
+        logger.info(f"Saved downloaded file in {self.file_path}")
+
+
+def _get_validator(headers: Mapping[str, str]) -> Optional[str]:
+    """Returns the strong ETag, or else the Last-Modified date, of a response."""
+    etag = headers.get("ETag")
+    if etag and not etag.startswith("W/"):
+        return etag
+
+    return headers.get("Last-Modified")
+
+
 @enforce_types
 def urljoin(*args) -> str:
     trailing_slash = "/" if args[-1].endswith("/") else ""
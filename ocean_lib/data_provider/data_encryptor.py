@@ -27,13 +27,7 @@ class DataEncryptor(DataServiceProviderBase):
         provider_uri: str,
         chain_id: int,
     ) -> Response:
-        if isinstance(objects_to_encrypt, dict):
-            data = json.dumps(objects_to_encrypt, separators=(",", ":"))
-            payload = data.encode("utf-8")
-        elif isinstance(objects_to_encrypt, str):
-            payload = objects_to_encrypt.encode("utf-8")
-        else:
-            payload = objects_to_encrypt
+        payload = DataEncryptor._encode_payload(objects_to_encrypt)
 
         method, encrypt_endpoint = DataServiceProviderBase.build_endpoint(
             "encrypt", provider_uri, {"chainId": chain_id}
@@ -61,3 +55,14 @@ class DataEncryptor(DataServiceProviderBase):
         )
 
         return response
+
+    @staticmethod
+    def _encode_payload(objects_to_encrypt: Union[list, str, bytes, dict]) -> bytes:
+        if isinstance(objects_to_encrypt, dict):
+            data = json.dumps(objects_to_encrypt, separators=(",", ":"))
+            return data.encode("utf-8")
+
+        if isinstance(objects_to_encrypt, str):
+            return objects_to_encrypt.encode("utf-8")
+
+        return objects_to_encrypt
@@ -6,22 +6,36 @@
 """Provider module."""
 import json
 import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from json import JSONDecodeError
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Union
 
 from enforce_typing import enforce_types
+from requests.exceptions import RequestException
 from requests.models import PreparedRequest, Response
 
 from ocean_lib.agreements.service_types import ServiceTypes
-from ocean_lib.data_provider.base import DataServiceProviderBase
+from ocean_lib.data_provider.base import DOWNLOAD_CHUNK_SIZE, DataServiceProviderBase
 from ocean_lib.data_provider.fileinfo_provider import FileInfoProvider
+from ocean_lib.exceptions import DataProviderException
 from ocean_lib.http_requests.requests_session import get_requests_session
 from ocean_lib.models.compute_input import ComputeInput
 from ocean_lib.structures.algorithm_metadata import AlgorithmMetadata
 
 logger = logging.getLogger(__name__)
 
+# seconds to wait for the provider to connect, and then for each chunk
+DOWNLOAD_TIMEOUT = 3
+
+# times a download request is re-signed when a concurrent one overtook its nonce
+DOWNLOAD_NONCE_RETRIES = 2
+
+# times an interrupted download is resumed before giving up
+DOWNLOAD_RETRIES = 3
+
 
 class DataServiceProvider(DataServiceProviderBase):
     """DataServiceProvider class.
@@ -129,19 +143,38 @@ class DataServiceProvider(DataServiceProviderBase):
         destination_folder: Union[str, Path],
         index: Optional[int] = None,
         userdata: Optional[Dict] = None,
+        max_workers: int = 1,
+        chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+        timeout: Union[int, float, tuple] = DOWNLOAD_TIMEOUT,
+        progress_callback: Optional[Callable] = None,
+        verify_checksum: bool = False,
     ) -> None:
+        """Downloads the files of a service to `destination_folder`.
+
+        Each file is saved to `file{index}.part` until complete. Interrupted
+        downloads are resumed with Range requests, also by a later call with
+        the same destination, e.g. after ordering again. A file that changed
+        since its download started is downloaded again from the start.
+
+        :param max_workers: number of files downloaded at the same time
+        :param chunk_size: bytes read from each response per write
+        :param timeout: requests timeout, seconds or a (connect, read) tuple
+        :param progress_callback: called as `progress_callback(bytes_done,
+          total_bytes)` after each chunk of any file; `total_bytes` is None
+          if the provider does not know the size of every file
+        :param verify_checksum: compare each file with the checksum from the
+          provider's fileinfo while downloading it, raise ChecksumMismatch and
+          delete the file if they differ
+        """
+        assert max_workers >= 1, logger.error("max_workers has to be at least 1.")
+
         service_endpoint = service.service_endpoint
-        fileinfo_response = FileInfoProvider.fileinfo(did, service, userdata=userdata)
+        fileinfo_response = FileInfoProvider.fileinfo(
+            did, service, with_checksum=verify_checksum, userdata=userdata
+        )
 
         files = fileinfo_response.json()
-        indexes = range(len(files))
-        if index is not None:
-            assert isinstance(index, int), logger.error("index has to be an integer.")
-            assert index >= 0, logger.error("index has to be 0 or a positive integer.")
-            assert index < len(files), logger.error(
-                "index can not be bigger than the number of files"
-            )
-            indexes = [index]
+        indexes = DataServiceProvider._get_file_indexes(files, index)
 
         method, download_endpoint = DataServiceProvider.build_endpoint(
             "download", service_endpoint
@@ -158,25 +191,166 @@ class DataServiceProvider(DataServiceProviderBase):
             userdata = json.dumps(userdata)
             payload["userdata"] = userdata
 
-        for i in indexes:
-            payload["fileIndex"] = i
-            payload["nonce"], payload["signature"] = DataServiceProvider.sign_message(
-                consumer_wallet, did, provider_uri=service_endpoint
-            )
-            response = DataServiceProvider._http_method(
-                method, url=download_endpoint, params=payload, stream=True, timeout=3
-            )
+        on_chunk = DataServiceProvider._get_progress_reporter(
+            progress_callback, files, indexes
+        )
 
-            DataServiceProviderBase.check_response(
-                response, "downloadEndpoint", download_endpoint, payload
+        def request_file(i: int, offset: int) -> Response:
+            file_payload = dict(payload, fileIndex=i)
+            headers = DataServiceProvider.get_resume_headers(
+                destination_folder, i, offset
+            )
+            kwargs = {"headers": headers} if headers else {}
+
+            for attempt in range(DOWNLOAD_NONCE_RETRIES + 1):
+                nonce, signature = DataServiceProvider.sign_message(
+                    consumer_wallet, did, provider_uri=service_endpoint
+                )
+                file_payload.update(nonce=nonce, signature=signature)
+                response = DataServiceProvider._http_method(
+                    method,
+                    url=download_endpoint,
+                    params=file_payload,
+                    stream=True,
+                    timeout=timeout,
+                    **kwargs,
+                )
+
+                # the provider rejects a nonce lower than one it already saw,
+                # which happens when parallel requests arrive out of order
+                if attempt == DOWNLOAD_NONCE_RETRIES or not (
+                    DataServiceProvider._is_nonce_rejection(response)
+                ):
+                    break
+
+                response.close()
+
+            DataServiceProvider._check_download_response(
+                response, download_endpoint, file_payload, offset
             )
 
-            DataServiceProvider.write_file(response, destination_folder, i)
+            return response
+
+        def download_file(i: int) -> None:
+            part_path = DataServiceProvider.get_part_path(destination_folder, i)
+            offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+            if offset and on_chunk:
+                on_chunk(offset)
+
+            checksum = files[i].get("checksum") if verify_checksum else None
+            if verify_checksum and not checksum:
+                logger.warning(f"Provider has no checksum of file{i} to verify.")
+
+            for attempt in range(DOWNLOAD_RETRIES + 1):
+                try:
+                    response = request_file(i, offset)
+                    DataServiceProvider.write_file(
+                        response,
+                        destination_folder,
+                        i,
+                        chunk_size,
+                        on_chunk,
+                        checksum=checksum,
+                        checksum_type=files[i].get("checksumType", "sha256"),
+                    )
+                    break
+                except RequestException as e:
+                    if attempt == DOWNLOAD_RETRIES:
+                        raise
+
+                    if os.path.exists(part_path):
+                        offset = os.path.getsize(part_path)
+                    logger.warning(
+                        f"Download of file{i} interrupted, resuming at byte "
+                        f"{offset}: {e}"
+                    )
 
             logger.info(
                 f"DDO downloaded successfully" f" downloadEndpoint {download_endpoint}"
             )
 
+        workers = min(max_workers, len(indexes))
+        if workers <= 1:
+            for i in indexes:
+                download_file(i)
+            return
+
+        executor = ThreadPoolExecutor(max_workers=workers)
+        futures = [executor.submit(download_file, i) for i in indexes]
+        try:
+            # consuming the results re-raises the first error
+            for future in futures:
+                future.result()
+        finally:
+            # files not started yet are not downloaded after an error
+            for future in futures:
+                future.cancel()
+            executor.shutdown()
+
+    @staticmethod
+    def _check_download_response(
+        response, download_endpoint: str, file_payload: dict, offset: int
+    ) -> None:
+        try:
+            DataServiceProviderBase.check_response(
+                response,
+                "downloadEndpoint",
+                download_endpoint,
+                file_payload,
+                success_codes=[200, 206],
+            )
+        except DataProviderException as e:
+            if not offset:
+                raise
+
+            # the provider checks the order again on every request
+            raise DataProviderException(
+                f"Could not resume file{file_payload['fileIndex']} at byte "
+                f"{offset}, the order may have expired. Order again and "
+                f"download with the new transfer tx id to continue. {e}"
+            ) from e
+
+    @staticmethod
+    def _get_file_indexes(files: list, index: Optional[int] = None):
+        if index is None:
+            return range(len(files))
+
+        assert isinstance(index, int), logger.error("index has to be an integer.")
+        assert index >= 0, logger.error("index has to be 0 or a positive integer.")
+        assert index < len(files), logger.error(
+            "index can not be bigger than the number of files"
+        )
+
+        return [index]
+
+    @staticmethod
+    def _get_progress_reporter(
+        progress_callback: Optional[Callable], files: list, indexes
+    ) -> Optional[Callable]:
+        """Returns a function that adds the bytes of one file to the total progress."""
+        if not progress_callback:
+            return None
+
+        total_bytes = DataServiceProvider._get_total_size(files, indexes)
+        progress_lock = threading.Lock()
+        bytes_done = 0
+
+        def report_progress(size: int) -> None:
+            nonlocal bytes_done
+            with progress_lock:
+                bytes_done += size
+                progress_callback(bytes_done, total_bytes)
+
+        return report_progress
+
+    @staticmethod
+    def _get_total_size(files: list, indexes) -> Optional[int]:
+        """Returns the size of the files at `indexes`, if the provider knows it."""
+        try:
+            return sum(int(files[i]["contentLength"]) for i in indexes)
+        except (KeyError, TypeError, ValueError):
+            return None
+
     @staticmethod
     # @enforce_types omitted due to subscripted generics error
     def start_compute_job(
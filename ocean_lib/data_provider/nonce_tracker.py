@@ -0,0 +1,100 @@
+#
+# Copyright 2023 Ocean Protocol Foundation
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Local allocation of the nonces that sign provider requests."""
+import logging
+import threading
+from typing import Callable, Dict, Optional, Tuple
+
+from enforce_typing import enforce_types
+from web3.main import Web3
+
+logger = logging.getLogger(__name__)
+
+_trackers_lock = threading.Lock()
+_trackers: Dict[Tuple[str, str], "ProviderNonceTracker"] = {}
+
+
+def _provider_root(provider_uri: str) -> str:
+    return "/".join(provider_uri.split("/")[0:3])
+
+
+class ProviderNonceTracker:
+    """Hands out provider nonces for one address on one provider.
+
+    The provider only accepts a nonce higher than the last one it saw from
+    an address. The last nonce is fetched once with `fetch_nonce`; later
+    nonces are allocated locally. Call `resync()` when the provider rejects
+    a nonce, e.g. because another client used the same address.
+    """
+
+    def __init__(self, fetch_nonce: Callable[[], int]) -> None:
+        self._fetch_nonce = fetch_nonce
+        self._lock = threading.Lock()
+        self._last_nonce = None
+
+    @enforce_types
+    def next_nonce(self) -> int:
+        """Returns a nonce that no other caller of this tracker will get."""
+        with self._lock:
+            if self._last_nonce is None:
+                self._last_nonce = self._fetch_nonce()
+
+            self._last_nonce += 1
+
+            return self._last_nonce
+
+    @property
+    def needs_sync(self) -> bool:
+        """True if the next nonce has to be fetched from the provider."""
+        return self._last_nonce is None
+
+    @enforce_types
+    def sync(self, last_nonce: int) -> None:
+        """Sets the provider's last nonce, unless one is known already.
+
+        Lets callers fetch it themselves, e.g. without blocking an event loop.
+        """
+        with self._lock:
+            if self._last_nonce is None:
+                self._last_nonce = last_nonce
+
+    @enforce_types
+    def resync(self) -> None:
+        """Forgets the local nonce, so that the next one comes from the provider."""
+        with self._lock:
+            self._last_nonce = None
+
+
+def get_provider_nonce_tracker(
+    provider_uri: str, address: str, fetch_nonce: Callable[[], int]
+) -> ProviderNonceTracker:
+    """Returns the shared tracker for this provider and address.
+
+    :param fetch_nonce: returns the provider's last nonce for the address;
+      only used by the tracker created on the first call
+    """
+    key = (_provider_root(provider_uri), Web3.to_checksum_address(address.lower()))
+
+    with _trackers_lock:
+        if key not in _trackers:
+            _trackers[key] = ProviderNonceTracker(fetch_nonce)
+
+        return _trackers[key]
+
+
+@enforce_types
+def resync_provider_nonces(provider_uri: Optional[str] = None) -> None:
+    """Resyncs the trackers of a provider, or of all providers."""
+    root = _provider_root(provider_uri) if provider_uri else None
+
+    with _trackers_lock:
+        trackers = [
+            tracker
+            for (tracker_root, _), tracker in _trackers.items()
+            if root is None or tracker_root == root
+        ]
+
+    for tracker in trackers:
+        tracker.resync()
@@ -0,0 +1,201 @@
+#
+# Copyright 2023 Ocean Protocol Foundation
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Reuse of signed provider fee quotes while they are valid."""
+import json
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Tuple, Union
+
+from enforce_typing import enforce_types
+
+logger = logging.getLogger(__name__)
+
+# seconds before validUntil at which a quote is no longer reused, to leave
+# time for the order transaction to be mined
+PROVIDER_FEE_EXPIRY_MARGIN = 60
+
+# seconds a quote is reused at most, also when it has no validUntil
+PROVIDER_FEE_MAX_AGE = 600
+
+_cache_lock = threading.Lock()
+_shared_cache = None
+
+
+def _fees_expiry(fees: Iterable[dict], margin: Union[int, float]) -> float:
+    """Returns the time until which all `fees` can be reused, 0 if none."""
+    expiry = None
+    for fee in fees:
+        valid_until = int(fee.get("validUntil") or 0)
+        if valid_until:
+            # validUntil is compared to block.timestamp: a unix time
+            fee_expiry = valid_until - margin
+            expiry = fee_expiry if expiry is None else min(expiry, fee_expiry)
+        elif expiry is None:
+            expiry = float("inf")
+
+    return expiry or 0
+
+
+def access_quote_key(did: str, service: Any, consumer_address: str) -> Tuple:
+    """Key of the `initialize` quote for this did, service and consumer."""
+    return (
+        "access",
+        service.service_endpoint,
+        did,
+        service.id,
+        consumer_address.lower(),
+    )
+
+
+def compute_quote_key(
+    datasets: list,
+    algorithm_data: dict,
+    service_endpoint: str,
+    consumer_address: str,
+    compute_environment: str,
+    valid_until: int,
+) -> Tuple:
+    """Key of the `initializeCompute` quote for these inputs."""
+    return (
+        "compute",
+        service_endpoint,
+        json.dumps(datasets, sort_keys=True),
+        json.dumps(algorithm_data, sort_keys=True),
+        consumer_address.lower(),
+        compute_environment,
+        valid_until,
+    )
+
+
+def compute_quote_fees(initialize_compute_result: dict) -> list:
+    """Returns the provider fees of an `initializeCompute` result."""
+    items = list(initialize_compute_result.get("datasets", []))
+    if "algorithm" in initialize_compute_result:
+        items.append(initialize_compute_result["algorithm"])
+
+    return [item["providerFee"] for item in items if item.get("providerFee")]
+
+
+class ProviderFeeCache:
+    """Keeps provider fee quotes, i.e. `initialize` results, while valid.
+
+    A provider signs its fees for a consumer until `validUntil`. Until shortly
+    before then, the same signed fees can pay for further orders, so asking
+    the provider again only costs a round trip. Quotes are reused for at
+    most `max_age` seconds, so that changed provider fees are picked up;
+    `max_age=0` disables the cache.
+
+    `hits`, `misses` and `hit_rate` tell how often a quote was reused.
+    """
+
+    @enforce_types
+    def __init__(
+        self,
+        margin: Union[int, float] = PROVIDER_FEE_EXPIRY_MARGIN,
+        max_age: Union[int, float] = PROVIDER_FEE_MAX_AGE,
+    ) -> None:
+        self.margin = margin
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of lookups answered from the cache, 0 before any lookup."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate,
+            "size": len(self._entries),
+        }
+
+    def get(
+        self,
+        key: Hashable,
+        fetch: Callable[[], Any],
+        get_fees: Optional[Callable[[Any], Iterable[dict]]] = None,
+    ) -> Any:
+        """Returns the quote of `key`, calling `fetch()` if none is valid.
+
+        :param get_fees: returns the provider fees of a quote; by default the
+          quote is a single providerFee dict
+        """
+        found, quote = self.get_cached(key)
+        if found:
+            return quote
+
+        quote = fetch()
+        self.set(key, quote, get_fees)
+
+        return quote
+
+    def get_cached(self, key: Hashable) -> Tuple[bool, Any]:
+        """Returns (True, quote) if `key` has a valid quote, else (False, None).
+
+        With `set`, lets callers fetch quotes themselves, e.g. asynchronously.
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now < entry[0]:
+                self.hits += 1
+                return True, entry[1]
+
+            self._entries.pop(key, None)
+            self.misses += 1
+
+        return False, None
+
+    def set(
+        self,
+        key: Hashable,
+        quote: Any,
+        get_fees: Optional[Callable[[Any], Iterable[dict]]] = None,
+    ) -> None:
+        """Keeps `quote` until its fees expire, or for `max_age` seconds."""
+        fees = get_fees(quote) if get_fees else [quote]
+        now = time.time()
+        expiry = min(_fees_expiry(fees, self.margin), now + self.max_age)
+
+        if expiry <= now:
+            logger.debug(f"Provider fee quote for {key} not cached: expires soon.")
+            return
+
+        with self._lock:
+            self._entries[key] = (expiry, quote)
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """Drops the quote of `key`, or all quotes."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+
+def get_provider_fee_cache(config_dict: dict) -> ProviderFeeCache:
+    """Returns the provider fee cache for this config.
+
+    A `ProviderFeeCache` put in the config dict as "PROVIDER_FEE_CACHE" is
+    used as is. Otherwise one cache is shared by all configs: its keys hold
+    the provider url and the did, which is specific to a chain.
+    """
+    cache = config_dict.get("PROVIDER_FEE_CACHE")
+    if cache is not None:
+        return cache
+
+    global _shared_cache
+    with _cache_lock:
+        if _shared_cache is None:
+            _shared_cache = ProviderFeeCache()
+
+        return _shared_cache
@@ -0,0 +1,217 @@
+#
+# Copyright 2023 Ocean Protocol Foundation
+# SPDX-License-Identifier: Apache-2.0
+#
+import asyncio
+import hashlib
+import threading
+from unittest.mock import Mock
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from eth_account import Account
+
+from ocean_lib.agreements.service_types import ServiceTypes
+from ocean_lib.data_provider.async_data_service_provider import AsyncDataServiceProvider
+from ocean_lib.data_provider.base import DataServiceProviderBase
+from ocean_lib.data_provider.nonce_tracker import resync_provider_nonces
+from ocean_lib.exceptions import DataProviderException
+from ocean_lib.models.compute_input import ComputeInput
+from ocean_lib.services.service import Service
+from tests.resources.mocks.http_client_mock import TEST_SERVICE_ENDPOINTS
+
+CONTENTS = [b"first file" * 1000, b"second file" * 2000]
+
+
+def _provider_app(requests: list) -> web.Application:
+    async def root(request):
+        return web.json_response(
+            {
+                "providerAddresses": {"8996": "0x" + "12" * 20},
+                "serviceEndpoints": TEST_SERVICE_ENDPOINTS,
+            }
+        )
+
+    async def nonce(request):
+        requests.append(("nonce", dict(request.query)))
+        return web.json_response({"nonce": 41})
+
+    async def fileinfo(request):
+        requests.append(("fileinfo", await request.json()))
+        return web.json_response(
+            [
+                {
+                    "valid": True,
+                    "contentLength": str(len(content)),
+                    "checksum": hashlib.sha256(content).hexdigest(),
+                    "checksumType": "sha256",
+                }
+                for content in CONTENTS
+            ]
+        )
+
+    async def download(request):
+        requests.append(("download", dict(request.query)))
+        content = CONTENTS[int(request.query["fileIndex"])]
+        if "Range" not in request.headers:
+            return web.Response(body=content)
+
+        offset = int(request.headers["Range"][6:-1])
+        return web.Response(
+            status=206,
+            body=content[offset:],
+            headers={"Content-Range": f"bytes {offset}-{len(content) - 1}/*"},
+        )
+
+    async def compute_status(request):
+        requests.append(("computeStatus", dict(request.query)))
+        if request.query["jobId"] == "unknown":
+            return web.Response(status=404, text="job not found")
+
+        return web.json_response([{"jobId": request.query["jobId"], "status": 70}])
+
+    app = web.Application()
+    app.router.add_get("/", root)
+    app.router.add_get("/api/services/nonce", nonce)
+    app.router.add_post("/api/services/fileinfo", fileinfo)
+    app.router.add_get("/api/services/download", download)
+    app.router.add_get("/api/services/compute", compute_status)
+    return app
+
+
+@pytest.mark.unit
+def test_async_provider_calls(tmp_path):
+    requests = []
+    wallet = Account.create()
+    service = Mock(spec=Service)
+    service.id = "abc"
+    service.type = ServiceTypes.CLOUD_COMPUTE
+
+    # a previous download stopped after 100 bytes of the second file
+    (tmp_path / "file1.part").write_bytes(CONTENTS[1][:100])
+
+    async def run():
+        async with TestServer(_provider_app(requests)) as server:
+            service.service_endpoint = str(server.make_url("/api/services"))
+
+            async with AsyncDataServiceProvider() as provider:
+                progress = []
+                await provider.download(
+                    "did:op:123",
+                    service,
+                    "0x01",
+                    wallet,
+                    str(tmp_path),
+                    max_workers=2,
+                    chunk_size=1024,
+                    progress_callback=lambda done, total: progress.append(
+                        (done, total)
+                    ),
+                    verify_checksum=True,
+                )
+
+                status = await provider.compute_job_status(
+                    "did:op:123", "job1", service, wallet
+                )
+
+                with pytest.raises(DataProviderException):
+                    await provider.compute_job_status(
+                        "did:op:123", "unknown", service, wallet
+                    )
+
+            DataServiceProviderBase.invalidate_provider_cache()
+            return progress, status
+
+    progress, status = asyncio.run(run())
+
+    for i, content in enumerate(CONTENTS):
+        assert (tmp_path / f"file{i}").read_bytes() == content
+    assert not (tmp_path / "file1.part").exists()
+
+    total = sum(len(content) for content in CONTENTS)
+    assert progress[-1] == (total, total)
+    assert status == {"jobId": "job1", "status": 70}
+
+    assert requests[0] == (
+        "fileinfo",
+        {"did": "did:op:123", "serviceId": "abc", "checksum": 1},
+    )
+    # the nonce is fetched once, and then allocated locally
+    assert [name for name, _ in requests].count("nonce") == 1
+    nonces = [int(query["nonce"]) for name, query in requests if "nonce" in query]
+    assert sorted(nonces) == [42, 43, 44, 45]
+
+
+@pytest.mark.unit
+def test_async_sign_message_does_not_block(monkeypatch):
+    wallet = Account.create()
+    fetch_threads = []
+
+    def fetch_nonce(address, provider_uri):
+        fetch_threads.append(threading.current_thread())
+        return 5
+
+    async def sync_nonce(self, address, provider_uri):
+        # another caller resyncs the tracker right after the sync
+        resync_provider_nonces(provider_uri)
+
+    monkeypatch.setattr(DataServiceProviderBase, "_fetch_nonce", fetch_nonce)
+    monkeypatch.setattr(AsyncDataServiceProvider, "sync_nonce", sync_nonce)
+
+    async def run():
+        async with AsyncDataServiceProvider() as provider:
+            return await provider.sign_message(wallet, "msg", "http://provider.test")
+
+    nonce, signature = asyncio.run(run())
+    resync_provider_nonces("http://provider.test")
+
+    assert nonce == 6
+    assert signature
+    assert fetch_threads and fetch_threads[0] is not threading.main_thread()
+
+
+@pytest.mark.unit
+def test_async_start_compute_job_signs_off_the_event_loop(monkeypatch):
+    wallet = Account.create()
+    service = Mock(spec=Service)
+    service.type = ServiceTypes.CLOUD_COMPUTE
+    service.service_endpoint = "http://provider.test"
+    dataset, algorithm = [
+        Mock(
+            spec=ComputeInput,
+            did=did,
+            service_id="abc",
+            transfer_tx_id="0x01",
+            userdata=None,
+        )
+        for did in ("did:op:123", "did:op:456")
+    ]
+    sign_threads = []
+
+    def sign_message(wallet, msg, provider_uri=None):
+        sign_threads.append(threading.current_thread())
+        return 7, "signature"
+
+    async def sync_nonce(self, address, provider_uri):
+        pass
+
+    async def build_endpoint(self, service_name, provider_uri):
+        return "POST", f"{provider_uri}/api/services/compute"
+
+    async def http_method(self, method, url, **kwargs):
+        return Mock(status_code=200, text="", json=lambda: [{"jobId": "job1"}])
+
+    monkeypatch.setattr(DataServiceProviderBase, "sign_message", sign_message)
+    monkeypatch.setattr(AsyncDataServiceProvider, "sync_nonce", sync_nonce)
+    monkeypatch.setattr(AsyncDataServiceProvider, "build_endpoint", build_endpoint)
+    monkeypatch.setattr(AsyncDataServiceProvider, "_http_method", http_method)
+
+    async def run():
+        async with AsyncDataServiceProvider() as provider:
+            return await provider.start_compute_job(
+                service, wallet, dataset, "env", algorithm
+            )
+
+    assert asyncio.run(run()) == {"jobId": "job1"}
+    assert sign_threads and sign_threads[0] is not threading.main_thread()
@@ -2,9 +2,16 @@
 # Copyright 2023 Ocean Protocol Foundation
 # SPDX-License-Identifier: Apache-2.0
 #
+import hashlib
+from unittest.mock import Mock
+
+import pytest
+from requests.exceptions import ChunkedEncodingError
 from requests.models import Response
 
 from ocean_lib.data_provider.base import DataServiceProviderBase
+from ocean_lib.exceptions import ChecksumMismatch, DataProviderException
+from tests.resources.mocks.http_client_mock import TEST_SERVICE_ENDPOINTS
 
 
 def test_validate_content_disposition():
@@ -31,3 +38,125 @@ def test_get_file_name(caplog):
     response.headers["content-disposition"] = "attachment;filename=somehtml.html"
     file_name = DataServiceProviderBase._get_file_name(response)
     assert file_name == "somehtml.html"
+
+
+def test_provider_info_is_cached(monkeypatch):
+    root_checks = []
+    gets = []
+
+    class HttpClient:
+        status_code = 200
+
+        def get(self, url, **kwargs):
+            gets.append(url)
+            response = Mock(spec=Response)
+            response.status_code = self.status_code
+            response.json.return_value = {
+                "providerAddresses": {},
+                "serviceEndpoints": TEST_SERVICE_ENDPOINTS,
+            }
+            return response
+
+    check_provider_info = DataServiceProviderBase._check_provider_info
+    monkeypatch.setattr(
+        DataServiceProviderBase,
+        "_check_provider_info",
+        lambda *args: root_checks.append(args) or check_provider_info(*args),
+    )
+    http_client = HttpClient()
+    monkeypatch.setattr(DataServiceProviderBase, "_http_client", http_client)
+    DataServiceProviderBase.invalidate_provider_cache()
+
+    uri = "http://provider.test:8030/api/services/download"
+    for _ in range(3):
+        method, url = DataServiceProviderBase.build_endpoint("nonce", uri)
+
+    assert (method, url) == ("GET", "http://provider.test:8030/api/services/nonce")
+    # one root check and one endpoints request, both on the shared session
+    assert len(root_checks) == 1
+    assert gets == ["http://provider.test:8030", "http://provider.test:8030"]
+
+    # a 404 from the provider drops its cached endpoints
+    http_client.status_code = 404
+    DataServiceProviderBase._http_method("get", url)
+    http_client.status_code = 200
+
+    DataServiceProviderBase.build_endpoint("nonce", uri)
+    assert len(root_checks) == 2
+    assert len(gets) == 5
+
+    DataServiceProviderBase.invalidate_provider_cache()
+
+
+def _file_response(content: bytes, offset: int = 0, headers=None) -> Response:
+    response = Mock(spec=Response)
+    response.status_code = 206 if offset else 200
+    response.headers = {"content-range": f"bytes {offset}-{len(content) - 1}/*"}
+    response.headers.update(headers or {})
+    response.iter_content.side_effect = lambda chunk_size: [
+        content[i : i + chunk_size] for i in range(offset, len(content), chunk_size)
+    ]
+    return response
+
+
+def test_write_file_verifies_checksum(tmp_path):
+    content = b"some file content" * 100
+    checksum = hashlib.sha256(content).hexdigest()
+
+    DataServiceProviderBase.write_file(
+        _file_response(content), tmp_path, 0, chunk_size=64, checksum=checksum
+    )
+    assert (tmp_path / "file0").read_bytes() == content
+
+    # the bytes of an earlier request are part of the checksum
+    (tmp_path / "file1.part").write_bytes(content[:500])
+    DataServiceProviderBase.write_file(
+        _file_response(content, 500), tmp_path, 1, chunk_size=64, checksum=checksum
+    )
+    assert (tmp_path / "file1").read_bytes() == content
+
+    with pytest.raises(ChecksumMismatch):
+        DataServiceProviderBase.write_file(
+            _file_response(content[:-1] + b"!"), tmp_path, 2, checksum=checksum
+        )
+
+    assert not (tmp_path / "file2").exists()
+    assert not (tmp_path / "file2.part").exists()
+
+
+def test_resumed_download_is_validated(tmp_path):
+    content = b"some file content" * 100
+    headers = {"ETag": '"v1"', "Content-Length": str(len(content))}
+    assert DataServiceProviderBase.get_resume_headers(tmp_path, 0, 0) == {}
+
+    # the download is interrupted after 500 bytes
+    def interrupted(chunk_size):
+        yield content[:500]
+        raise ChunkedEncodingError("connection reset")
+
+    response = _file_response(content, headers=headers)
+    response.iter_content.side_effect = interrupted
+    with pytest.raises(ChunkedEncodingError):
+        DataServiceProviderBase.write_file(response, tmp_path, 0)
+
+    assert DataServiceProviderBase.get_resume_headers(tmp_path, 0, 500) == {
+        "Range": "bytes=500-",
+        "If-Range": '"v1"',
+    }
+
+    # the file changed, so the server sends all of it
+    changed = content.upper()
+    DataServiceProviderBase.write_file(_file_response(changed), tmp_path, 0)
+    assert (tmp_path / "file0").read_bytes() == changed
+    assert not (tmp_path / "file0.part.json").exists()
+
+    # a file of another length can not continue the saved part
+    (tmp_path / "file1.part").write_bytes(content[:500])
+    (tmp_path / "file1.part.json").write_text('{"validator": null, "length": 1700}')
+    response = _file_response(content + b"!", 500)
+    response.headers["content-range"] = f"bytes 500-{len(content)}/{len(content) + 1}"
+    with pytest.raises(DataProviderException):
+        DataServiceProviderBase.write_file(response, tmp_path, 1)
+
+    assert not (tmp_path / "file1.part").exists()
+    assert not (tmp_path / "file1.part.json").exists()
@@ -8,7 +8,7 @@ from unittest.mock import Mock
 
 import ecies
 import pytest
-from requests.exceptions import InvalidURL
+from requests.exceptions import ChunkedEncodingError, InvalidURL
 from requests.models import Response
 from web3.main import Web3
 
@@ -550,3 +550,140 @@ def test_check_asset_failure():
     assert DataSP.check_asset_file_info("test", "", DEFAULT_PROVIDER_URL) is False
 
     DataSP.set_http_client(get_requests_session())
+
+
+@pytest.mark.unit
+def test_download_in_parallel(tmp_path, monkeypatch):
+    """Tests that files are downloaded concurrently, with aggregate progress."""
+    contents = [b"a" * 10, b"b" * 20, b"c" * 30]
+    service = Mock(spec=Service)
+    service.service_endpoint = "http://provider.test:8030"
+    service.id = "abc"
+    consumer_wallet = Mock(address="0x" + "ab" * 20)
+
+    fileinfo = Mock(spec=Response)
+    fileinfo.json.return_value = [
+        {"contentLength": str(len(content))} for content in contents
+    ]
+    monkeypatch.setattr(FileInfoProvider, "fileinfo", lambda *args, **kw: fileinfo)
+    monkeypatch.setattr(
+        DataSP,
+        "build_endpoint",
+        lambda name, uri: ("GET", f"{uri}/api/services/{name}"),
+    )
+    nonces = iter(range(100))
+    monkeypatch.setattr(
+        DataSP, "sign_message", lambda *args, **kw: (next(nonces), "signature")
+    )
+
+    class HttpClient:
+        def __init__(self):
+            self.requests = []
+
+        def get(self, url, params, stream, timeout):
+            self.requests.append(dict(params))
+            response = Mock(spec=Response)
+            response.status_code = 200
+            response.headers = {}
+            if len(self.requests) == 1:
+                # the first request is overtaken by a later nonce
+                response.status_code = 401
+                response.text = "Invalid nonce"
+            content = contents[params["fileIndex"]]
+            response.iter_content.side_effect = lambda chunk_size: [
+                content[i : i + chunk_size] for i in range(0, len(content), chunk_size)
+            ]
+            return response
+
+    http_client = HttpClient()
+    monkeypatch.setattr(DataServiceProviderBase, "_http_client", http_client)
+
+    progress = []
+    DataSP.download(
+        "did:op:123",
+        service,
+        "0x01",
+        consumer_wallet,
+        str(tmp_path),
+        max_workers=3,
+        chunk_size=8,
+        timeout=10,
+        progress_callback=lambda done, total: progress.append((done, total)),
+    )
+
+    for i, content in enumerate(contents):
+        assert (tmp_path / f"file{i}").read_bytes() == content
+
+    # the rejected request was signed again
+    assert len(http_client.requests) == 4
+    assert len({request["nonce"] for request in http_client.requests}) == 4
+    assert progress[-1] == (60, 60)
+    assert [done for done, _ in progress] == sorted(done for done, _ in progress)
+
+
+@pytest.mark.unit
+def test_download_resumes(tmp_path, monkeypatch):
+    """Tests that interrupted downloads continue with Range requests."""
+    content = bytes(range(100))
+    service = Mock(spec=Service)
+    service.service_endpoint = "http://provider.test:8030"
+    service.id = "abc"
+    consumer_wallet = Mock(address="0x" + "ab" * 20)
+
+    fileinfo = Mock(spec=Response)
+    fileinfo.json.return_value = [{"contentLength": str(len(content))}]
+    monkeypatch.setattr(FileInfoProvider, "fileinfo", lambda *args, **kw: fileinfo)
+    monkeypatch.setattr(
+        DataSP,
+        "build_endpoint",
+        lambda name, uri: ("GET", f"{uri}/api/services/{name}"),
+    )
+    nonces = iter(range(100))
+    monkeypatch.setattr(
+        DataSP, "sign_message", lambda *args, **kw: (next(nonces), "signature")
+    )
+
+    class HttpClient:
+        def __init__(self):
+            self.ranges = []
+
+        def get(self, url, params, stream, timeout, headers=None):
+            offset = int(headers["Range"][6:-1]) if headers else 0
+            self.ranges.append(offset)
+
+            response = Mock(spec=Response)
+            response.status_code = 206 if offset else 200
+            response.headers = {"content-range": f"bytes {offset}-99/100"}
+
+            def iter_content(chunk_size):
+                for i in range(offset, len(content), chunk_size):
+                    # the connection drops once, in the middle of the file
+                    if len(self.ranges) == 1 and i >= 60:
+                        raise ChunkedEncodingError("connection reset")
+                    yield content[i : i + chunk_size]
+
+            response.iter_content.side_effect = iter_content
+            return response
+
+    http_client = HttpClient()
+    monkeypatch.setattr(DataServiceProviderBase, "_http_client", http_client)
+
+    # a previous download stopped after 20 bytes
+    (tmp_path / "file0.part").write_bytes(content[:20])
+
+    progress = []
+    DataSP.download(
+        "did:op:123",
+        service,
+        "0x01",
+        consumer_wallet,
+        str(tmp_path),
+        chunk_size=10,
+        progress_callback=lambda done, total: progress.append(done),
+    )
+
+    assert (tmp_path / "file0").read_bytes() == content
+    assert not (tmp_path / "file0.part").exists()
+    assert http_client.ranges == [20, 60]
+    assert progress[0] == 20
+    assert progress[-1] == 100
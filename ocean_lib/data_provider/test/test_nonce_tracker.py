@@ -0,0 +1,86 @@
+#
+# Copyright 2023 Ocean Protocol Foundation
+# SPDX-License-Identifier: Apache-2.0
+#
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock
+
+import pytest
+from eth_account import Account
+from requests.models import Response
+
+from ocean_lib.data_provider.base import DataServiceProviderBase
+from ocean_lib.data_provider.nonce_tracker import (
+    ProviderNonceTracker,
+    get_provider_nonce_tracker,
+    resync_provider_nonces,
+)
+from ocean_lib.exceptions import DataProviderException
+
+PROVIDER_URI = "http://provider.test:8030"
+
+
+@pytest.mark.unit
+def test_nonce_tracker_allocates_locally():
+    fetches = []
+    tracker = ProviderNonceTracker(lambda: fetches.append(1) or 7)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        nonces = list(executor.map(lambda _: tracker.next_nonce(), range(50)))
+
+    assert sorted(nonces) == list(range(8, 58))
+    assert len(fetches) == 1
+
+    tracker.resync()
+    assert tracker.next_nonce() == 8
+    assert len(fetches) == 2
+
+
+@pytest.mark.unit
+def test_get_provider_nonce_tracker():
+    address = Account.create().address
+    tracker = get_provider_nonce_tracker(
+        f"{PROVIDER_URI}/api/services/download", address, lambda: 0
+    )
+
+    assert get_provider_nonce_tracker(PROVIDER_URI, address.lower(), None) is tracker
+
+    other = get_provider_nonce_tracker("http://other:8030", address, None)
+    assert other is not tracker
+
+    tracker.next_nonce()
+    resync_provider_nonces("http://other:8030")
+    assert tracker.next_nonce() == 2
+    resync_provider_nonces(f"{PROVIDER_URI}/api/services/compute")
+    assert tracker.next_nonce() == 1
+
+
+@pytest.mark.unit
+def test_sign_message_tracks_nonces(monkeypatch):
+    wallet = Account.create()
+    fetches = []
+
+    def fetch_nonce(address, provider_uri):
+        fetches.append(address)
+        return 41
+
+    monkeypatch.setattr(DataServiceProviderBase, "_fetch_nonce", fetch_nonce)
+
+    nonces = [
+        DataServiceProviderBase.sign_message(wallet, "msg", PROVIDER_URI)[0]
+        for _ in range(3)
+    ]
+    assert nonces == [42, 43, 44]
+    assert fetches == [wallet.address]
+
+    # a rejected nonce makes the next request ask the provider again
+    response = Mock(spec=Response)
+    response.status_code = 401
+    response.text = "Invalid nonce, must be higher than 50"
+    with pytest.raises(DataProviderException):
+        DataServiceProviderBase.check_response(
+            response, "computeStatus", f"{PROVIDER_URI}/api/services/compute", {}
+        )
+
+    assert DataServiceProviderBase.sign_message(wallet, "msg", PROVIDER_URI)[0] == 42
+    assert len(fetches) == 2
@@ -0,0 +1,91 @@
+#
+# Copyright 2023 Ocean Protocol Foundation
+# SPDX-License-Identifier: Apache-2.0
+#
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from ocean_lib.data_provider.provider_fee_cache import (
+    ProviderFeeCache,
+    access_quote_key,
+    compute_quote_fees,
+    get_provider_fee_cache,
+)
+
+
+def _fee(valid_until: int) -> dict:
+    return {"providerFeeAmount": "0", "validUntil": valid_until}
+
+
+@pytest.mark.unit
+def test_provider_fee_cache_honors_valid_until():
+    cache = ProviderFeeCache(margin=60, max_age=600)
+    service = Mock(service_endpoint="http://provider", id="1")
+    key = access_quote_key("did:op:1", service, "0xABC")
+    assert key == access_quote_key("did:op:1", service, "0xabc")
+
+    fetches = []
+
+    def fetch(fee):
+        def _fetch():
+            fetches.append(fee)
+            return fee
+
+        return _fetch
+
+    valid_fee = _fee(int(time.time()) + 3600)
+    assert cache.get(key, fetch(valid_fee)) == valid_fee
+    assert cache.get(key, fetch(_fee(1))) == valid_fee
+    assert fetches == [valid_fee]
+
+    # fees about to expire are used once, but not kept
+    cache.invalidate(key)
+    expiring_fee = _fee(int(time.time()) + 30)
+    assert cache.get(key, fetch(expiring_fee)) == expiring_fee
+    assert cache.get(key, fetch(valid_fee)) == valid_fee
+    assert len(fetches) == 3
+
+    assert cache.hits == 1
+    assert cache.misses == 3
+    assert cache.hit_rate == 0.25
+    assert cache.stats()["size"] == 1
+
+
+@pytest.mark.unit
+def test_provider_fee_cache_max_age():
+    cache = ProviderFeeCache(max_age=0)
+    cache.set("key", _fee(0))
+    assert cache.get_cached("key") == (False, None)
+
+    cache = ProviderFeeCache(max_age=600)
+    cache.set("key", _fee(0))
+    assert cache.get_cached("key") == (True, _fee(0))
+
+
+@pytest.mark.unit
+def test_compute_quotes_expire_with_first_fee():
+    cache = ProviderFeeCache(margin=0)
+    now = int(time.time())
+    quote = {
+        "datasets": [{"providerFee": _fee(now + 3600)}, {"validOrder": "0x01"}],
+        "algorithm": {"providerFee": _fee(now - 1)},
+    }
+    assert compute_quote_fees(quote) == [_fee(now + 3600), _fee(now - 1)]
+
+    cache.set("key", quote, compute_quote_fees)
+    assert cache.get_cached("key") == (False, None)
+
+    # a quote without fees only reports valid orders, which may expire
+    cache.set("key", {"datasets": [{"validOrder": "0x01"}]}, compute_quote_fees)
+    assert cache.get_cached("key") == (False, None)
+
+
+@pytest.mark.unit
+def test_get_provider_fee_cache_is_shared():
+    cache = get_provider_fee_cache({})
+    assert get_provider_fee_cache({"CHAIN_ID": 8996}) is cache
+
+    custom = ProviderFeeCache()
+    assert get_provider_fee_cache({"PROVIDER_FEE_CACHE": custom}) is custom
@@ -11,7 +11,7 @@ from typing import Optional
 
 import addresses
 from enforce_typing import enforce_types
-from web3 import Web3
+from web3 import AsyncHTTPProvider, AsyncWeb3, Web3
 from web3.exceptions import ExtraDataLengthError
 
 from ocean_lib.web3_internal.http_provider import get_web3_connection_provider
@@ -123,3 +123,21 @@ def get_web3(network_url: str) -> Web3:
     web3.strict_bytes_type_checking = False
 
     return web3
+
+
+@enforce_types
+def get_async_web3(network_url: str, poa: bool = False) -> AsyncWeb3:
+    """
+    Return an AsyncWeb3 instance connected via the given network_url.
+    Adds POA middleware if `poa`, e.g. when `get_web3` added it for this url.
+    """
+    web3 = AsyncWeb3(AsyncHTTPProvider(network_url))
+
+    if poa:
+        from web3.middleware import async_geth_poa_middleware
+
+        web3.middleware_onion.inject(async_geth_poa_middleware, layer=0)
+
+    web3.strict_bytes_type_checking = False
+
+    return web3
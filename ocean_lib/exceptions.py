@@ -26,3 +26,7 @@ class TransactionFailed(Exception):
 
 class DataProviderException(Exception):
     """Exception from Provider endpoints."""
+
+
+class ChecksumMismatch(DataProviderException):
+    """Downloaded file does not match the checksum from Provider."""
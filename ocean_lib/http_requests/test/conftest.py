@@ -0,0 +1 @@
+from conftest_ganache import *
@@ -0,0 +1,84 @@
+#
+# Copyright 2023 Ocean Protocol Foundation
+# SPDX-License-Identifier: Apache-2.0
+#
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from ocean_lib.http_requests.ttl_cache import TTLCache
+
+
+@pytest.mark.unit
+def test_ttl_cache_expiry():
+    cache = TTLCache(0.05)
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return len(calls)
+
+    assert cache.get("a", fetch) == 1
+    assert cache.get("a", fetch) == 1
+    assert cache.get("b", fetch) == 2
+
+    time.sleep(0.06)
+    assert cache.get("a", fetch) == 3
+
+    cache.invalidate("a")
+    assert cache.get("a", fetch) == 4
+
+    cache.invalidate_matching(lambda key: key == "b")
+    assert cache.get("b", fetch) == 5
+
+    cache.invalidate()
+    assert cache.get("a", fetch) == 6
+
+
+@pytest.mark.unit
+def test_ttl_cache_errors_are_not_cached():
+    cache = TTLCache(60)
+
+    def fail():
+        raise ValueError("down")
+
+    with pytest.raises(ValueError):
+        cache.get("a", fail)
+
+    assert cache.get("a", lambda: 1) == 1
+
+
+@pytest.mark.unit
+def test_ttl_cache_single_flight():
+    cache = TTLCache(60)
+    calls = []
+
+    def slow_fetch():
+        calls.append(1)
+        time.sleep(0.05)
+        return "value"
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda _: cache.get("a", slow_fetch), range(8)))
+
+    assert results == ["value"] * 8
+    assert len(calls) == 1
+
+
+@pytest.mark.unit
+def test_ttl_cache_maxsize():
+    cache = TTLCache(0.05, maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+
+    # "a" is used more recently than "b", which is dropped for "c"
+    assert cache.get_cached("a") == (True, 1)
+    cache.set("c", 3)
+    assert cache.get_cached("b") == (False, None)
+    assert cache.get_cached("a") == (True, 1)
+    assert cache.get_cached("c") == (True, 3)
+
+    time.sleep(0.06)
+    assert cache.get_cached("a") == (False, None)
+    assert cache.get_cached("a", include_expired=True) == (True, 1)
@@ -0,0 +1,104 @@
+#
+# Copyright 2023 Ocean Protocol Foundation
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Thread-safe cache whose entries expire after a fixed time."""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple, Union
+
+from enforce_typing import enforce_types
+
+
+class TTLCache:
+    """Maps keys to values fetched on demand, and kept for `ttl` seconds.
+
+    Refreshes are single-flight: when several threads miss the same key at
+    once, one of them fetches while the others wait for its result. Errors
+    are not cached.
+
+    With `maxsize`, the least recently used entries are dropped once the
+    cache holds more than `maxsize` entries.
+    """
+
+    @enforce_types
+    def __init__(self, ttl: Union[int, float], maxsize: Optional[int] = None) -> None:
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._key_locks: Dict[Hashable, threading.Lock] = {}
+
+    def _get_fresh(
+        self, key: Hashable, include_expired: bool = False
+    ) -> Tuple[bool, Any]:
+        entry = self._entries.get(key)
+        if entry is not None and (include_expired or time.monotonic() < entry[0]):
+            self._entries.move_to_end(key)
+            return True, entry[1]
+
+        return False, None
+
+    def _set(self, key: Hashable, value: Any) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+
+        if self.maxsize is not None:
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def get(self, key: Hashable, fetch: Callable[[], Any]) -> Any:
+        """Returns the cached value of `key`, calling `fetch()` if there is none."""
+        with self._lock:
+            found, value = self._get_fresh(key)
+            if found:
+                return value
+
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            # another thread may have fetched it in the meantime
+            with self._lock:
+                found, value = self._get_fresh(key)
+                if found:
+                    return value
+
+            value = fetch()
+
+            with self._lock:
+                self._set(key, value)
+                # waiting threads hold the lock object already
+                self._key_locks.pop(key, None)
+
+            return value
+
+    def get_cached(
+        self, key: Hashable, include_expired: bool = False
+    ) -> Tuple[bool, Any]:
+        """Returns (True, value) if `key` has a fresh value, else (False, None).
+
+        With `set`, lets callers fetch values themselves, e.g. asynchronously.
+        With `include_expired`, also returns values past their ttl, e.g. to
+        revalidate them.
+        """
+        with self._lock:
+            return self._get_fresh(key, include_expired)
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._set(key, value)
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """Drops the entry of `key`, or all entries."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def invalidate_matching(self, predicate: Callable[[Hashable], bool]) -> None:
+        """Drops the entries whose key satisfies `predicate`."""
+        with self._lock:
+            for key in [key for key in self._entries if predicate(key)]:
+                del self._entries[key]
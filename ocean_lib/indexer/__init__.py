@@ -0,0 +1,6 @@
+#
+# Copyright 2023 Ocean Protocol Foundation
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Ocean event indexer module."""
+from .event_indexer import EventIndexer  # noqa
@@ -0,0 +1,342 @@
+#
+# Copyright 2023 Ocean Protocol Foundation
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Incremental, on-disk index of Ocean contract events."""
+import logging
+import os
+import sqlite3
+import threading
+from typing import Dict, Iterator, Optional, Union
+
+from enforce_typing import enforce_types
+from hexbytes import HexBytes
+from web3.datastructures import AttributeDict
+from web3.exceptions import BlockNotFound
+from web3.main import Web3
+
+from ocean_lib.web3_internal.contract_utils import (
+    get_contract_definition,
+    get_contracts_addresses,
+)
+from ocean_lib.web3_internal.event_logs import iter_logs_in_chunks, resolve_block_number
+
+logger = logging.getLogger(__name__)
+
+# event name -> contract artifact holding its ABI
+INDEXED_EVENTS = {
+    "OrderStarted": "ERC20Template",
+    "NFTCreated": "ERC721Factory",
+    "TokenCreated": "ERC721Factory",
+    "NewFixedRate": "ERC721Factory",
+    "Swapped": "FixedRateExchange",
+    "DispenserCreated": "Dispenser",
+}
+
+# blocks indexed and committed together, i.e. the checkpoint granularity
+SYNC_WINDOW = 10_000
+
+# syncing up to a block tag, e.g. "latest", stops this many blocks below it,
+# so that only confirmed blocks are indexed
+DEFAULT_REORG_DEPTH = 12
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoint (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    chain_id INTEGER NOT NULL,
+    block_number INTEGER NOT NULL,
+    block_hash TEXT
+);
+CREATE TABLE IF NOT EXISTS logs (
+    transaction_hash TEXT NOT NULL,
+    log_index INTEGER NOT NULL,
+    transaction_index INTEGER NOT NULL,
+    block_number INTEGER NOT NULL,
+    block_hash TEXT NOT NULL,
+    address TEXT NOT NULL,
+    topic0 TEXT NOT NULL,
+    topic1 TEXT,
+    topic2 TEXT,
+    topic3 TEXT,
+    data TEXT NOT NULL,
+    PRIMARY KEY (transaction_hash, log_index)
+);
+CREATE INDEX IF NOT EXISTS logs_topic0_block ON logs (topic0, block_number);
+CREATE INDEX IF NOT EXISTS logs_topic0_topic1 ON logs (topic0, topic1);
+CREATE INDEX IF NOT EXISTS logs_block ON logs (block_number);
+CREATE TABLE IF NOT EXISTS block_hashes (
+    block_number INTEGER PRIMARY KEY,
+    block_hash TEXT NOT NULL
+);
+"""
+
+
+@enforce_types
+def get_event_topic(event_name: str) -> str:
+    """Returns topic0 (the keccak of the signature) of an indexed event."""
+    abi = get_contract_definition(INDEXED_EVENTS[event_name])["abi"]
+    event_abi = next(
+        x for x in abi if x.get("type") == "event" and x["name"] == event_name
+    )
+    types = [param["type"] for param in event_abi["inputs"]]
+
+    return Web3.keccak(text=f'{event_name}({",".join(types)})').hex()
+
+
+def _hex(value) -> str:
+    return HexBytes(value).hex()
+
+
+class EventIndexer:
+    """Follows the chain and stores the raw logs of `INDEXED_EVENTS` in SQLite.
+
+    Progress is checkpointed after every `SYNC_WINDOW` blocks, so `sync()`
+    can be interrupted and resumed. Syncing to "latest" stays `reorg_depth`
+    blocks behind the head. If the checkpointed block has still been
+    reorganised away, the index is rolled back to the last block whose
+    stored hash is still on chain, and re-synced from there.
+
+    Put the indexer in the config dict as "EVENT_INDEXER" to have
+    `ContractBase.get_logs` and friends (e.g. `Ocean.get_user_orders`) read
+    indexed blocks from it instead of the node. If the index starts at the
+    deployment of the Ocean contracts (the default), blocks before it are
+    known to hold no events.
+    """
+
+    @enforce_types
+    def __init__(
+        self,
+        config_dict: dict,
+        db_path: str,
+        start_block: Optional[int] = None,
+        reorg_depth: int = DEFAULT_REORG_DEPTH,
+    ) -> None:
+        self.config_dict = config_dict
+        self.web3 = config_dict["web3_instance"]
+        self.reorg_depth = reorg_depth
+        self.topics: Dict[str, str] = {
+            get_event_topic(name): name for name in INDEXED_EVENTS
+        }
+
+        deployment_block = self._default_start_block()
+        if start_block is None:
+            start_block = deployment_block
+        self.start_block = start_block
+        self.covers_deployment = start_block <= deployment_block
+
+        self.chain_id = self.web3.eth.chain_id
+
+        db_path = os.path.expanduser(db_path)
+        self._lock = threading.RLock()
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.executescript(_SCHEMA)
+        self._check_chain_id()
+
+    def _default_start_block(self) -> int:
+        """Deployment block of the Ocean contracts, from the address file."""
+        try:
+            return int(get_contracts_addresses(self.config_dict).get("startBlock", 0))
+        except Exception:
+            return 0
+
+    def _check_chain_id(self) -> None:
+        row = self._db.execute("SELECT chain_id FROM checkpoint").fetchone()
+        if row and row[0] != self.chain_id:
+            raise ValueError(
+                f"Index was built for chain {row[0]}, not for chain {self.chain_id}."
+            )
+
+    # ======================================================================
+    # progress
+
+    @property
+    def last_indexed_block(self) -> Optional[int]:
+        """Highest block whose logs are all in the index, or None if empty."""
+        with self._lock:
+            row = self._db.execute("SELECT block_number FROM checkpoint").fetchone()
+
+        return row[0] if row else None
+
+    def indexes(self, event_topic: str) -> bool:
+        return event_topic in self.topics
+
+    def _set_checkpoint(self, block_number: int, block_hash: Optional[str]) -> None:
+        self._db.execute(
+            "INSERT OR REPLACE INTO checkpoint VALUES (0, ?, ?, ?)",
+            (self.chain_id, block_number, block_hash),
+        )
+
+    def _block_hash(self, block_number: int) -> str:
+        return _hex(self.web3.eth.get_block(block_number).hash)
+
+    def _is_on_chain(self, block_number: int, block_hash: str) -> bool:
+        try:
+            return self._block_hash(block_number) == block_hash
+        except BlockNotFound:
+            return False
+
+    def _store_block_hashes(self, block_hashes: Dict[int, str]) -> None:
+        self._db.executemany(
+            "INSERT OR REPLACE INTO block_hashes VALUES (?, ?)",
+            block_hashes.items(),
+        )
+
+    def _last_common_block(self, block_number: int) -> int:
+        """Highest block below `block_number` whose stored hash is on chain."""
+        rows = self._db.execute(
+            "SELECT block_number, block_hash FROM block_hashes "
+            "WHERE block_number < ? ORDER BY block_number DESC",
+            (block_number,),
+        ).fetchall()
+
+        # a block on chain implies that all its ancestors are
+        for number, block_hash in rows:
+            if self._is_on_chain(number, block_hash):
+                return number
+
+        return self.start_block - 1
+
+    def _handle_reorg(self) -> None:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT block_number, block_hash FROM checkpoint"
+            ).fetchone()
+
+            if not row or row[1] is None or self._is_on_chain(row[0], row[1]):
+                return
+
+            rollback_to = self._last_common_block(row[0])
+            logger.warning(
+                f"Reorg detected at block {row[0]}, rolling back to {rollback_to}."
+            )
+            self.rollback(rollback_to)
+
+    @enforce_types
+    def rollback(self, block_number: int) -> None:
+        """Drops all logs above `block_number` and moves the checkpoint there."""
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM logs WHERE block_number > ?", (block_number,))
+            self._db.execute(
+                "DELETE FROM block_hashes WHERE block_number > ?", (block_number,)
+            )
+            block_hash = None
+            if block_number >= self.start_block:
+                block_hash = self._block_hash(block_number)
+                self._store_block_hashes({block_number: block_hash})
+
+            self._set_checkpoint(block_number, block_hash)
+
+    # ======================================================================
+    # syncing
+
+    @enforce_types
+    def sync(self, to_block: Optional[Union[int, str]] = "latest") -> Optional[int]:
+        """Indexes all blocks after the checkpoint, up to `to_block`.
+
+        A block tag like "latest" stands for `reorg_depth` blocks below it.
+
+        :return: the new last indexed block
+        """
+        self._handle_reorg()
+
+        end = resolve_block_number(self.web3, to_block)
+        if isinstance(to_block, str):
+            end -= self.reorg_depth
+
+        last = self.last_indexed_block
+        start = self.start_block if last is None else last + 1
+        topic_filter = {"topics": [list(self.topics)]}
+
+        while start <= end:
+            window_end = min(start + SYNC_WINDOW - 1, end)
+            logs = list(iter_logs_in_chunks(self.web3, topic_filter, start, window_end))
+
+            # keep the hashes of all blocks with logs, to find reorgs later
+            block_hashes = {log["blockNumber"]: _hex(log["blockHash"]) for log in logs}
+            block_hashes[window_end] = self._block_hash(window_end)
+
+            with self._lock, self._db:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO logs VALUES (?,?,?,?,?,?,?,?,?,?,?)",
+                    [self._to_row(log) for log in logs],
+                )
+                self._store_block_hashes(block_hashes)
+                self._set_checkpoint(window_end, block_hashes[window_end])
+
+            logger.debug(f"Indexed blocks {start}-{window_end}: {len(logs)} logs.")
+            start = window_end + 1
+
+        return self.last_indexed_block
+
+    @staticmethod
+    def _to_row(log) -> tuple:
+        topics = [_hex(topic) for topic in log["topics"]] + [None] * 3
+        return (
+            _hex(log["transactionHash"]),
+            log["logIndex"],
+            log["transactionIndex"],
+            log["blockNumber"],
+            _hex(log["blockHash"]),
+            log["address"],
+            topics[0],
+            topics[1],
+            topics[2],
+            topics[3],
+            _hex(log["data"]),
+        )
+
+    # ======================================================================
+    # queries
+
+    @enforce_types
+    def iter_raw_logs(
+        self,
+        event_topic: str,
+        from_block: int = 0,
+        to_block: Optional[int] = None,
+        topics: Optional[list] = None,
+        address: Optional[str] = None,
+    ) -> Iterator[AttributeDict]:
+        """Yields indexed logs like eth_getLogs would return them, oldest first.
+
+        :param topics: filters on topic1..topic3; None entries match anything
+        """
+        query = "SELECT * FROM logs WHERE topic0 = ? AND block_number >= ?"
+        params = [event_topic.lower(), from_block]
+
+        if to_block is not None:
+            query += " AND block_number <= ?"
+            params.append(to_block)
+
+        for i, topic in enumerate(topics or [], start=1):
+            if topic is not None:
+                query += f" AND topic{i} = ?"
+                params.append(topic.lower())
+
+        if address:
+            query += " AND address = ?"
+            params.append(Web3.to_checksum_address(address.lower()))
+
+        query += " ORDER BY block_number, log_index"
+
+        with self._lock:
+            rows = self._db.execute(query, params).fetchall()
+
+        for row in rows:
+            yield AttributeDict(
+                {
+                    "transactionHash": HexBytes(row[0]),
+                    "logIndex": row[1],
+                    "transactionIndex": row[2],
+                    "blockNumber": row[3],
+                    "blockHash": HexBytes(row[4]),
+                    "address": row[5],
+                    "topics": [HexBytes(t) for t in row[6:10] if t is not None],
+                    "data": HexBytes(row[10]),
+                    "removed": False,
+                }
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
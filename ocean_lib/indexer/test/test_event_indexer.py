@@ -0,0 +1,169 @@
+#
+# Copyright 2023 Ocean Protocol Foundation
+# SPDX-License-Identifier: Apache-2.0
+#
+import copy
+from unittest.mock import Mock
+
+import pytest
+from web3 import Web3
+from web3.datastructures import AttributeDict
+from web3.exceptions import BlockNotFound
+
+from ocean_lib.indexer import EventIndexer, event_indexer
+from ocean_lib.indexer.event_indexer import get_event_topic
+from ocean_lib.models.data_nft_factory import DataNFTFactoryContract
+from ocean_lib.models.datatoken1 import Datatoken1
+from ocean_lib.ocean.util import get_address_of_type
+from tests.resources.helper_functions import deploy_erc721_erc20
+
+
+@pytest.mark.unit
+def test_indexer_matches_node(config, publisher_wallet, tmpdir):
+    web3 = config["web3_instance"]
+    start_block = web3.eth.block_number + 1
+    data_nft, _ = deploy_erc721_erc20(config, publisher_wallet, publisher_wallet)
+
+    # ganache does not reorg: index up to the head
+    indexer = EventIndexer(config, str(tmpdir / "events.db"), start_block, 0)
+    last_block = indexer.sync()
+    assert last_block == indexer.last_indexed_block >= start_block
+
+    factory_address = get_address_of_type(config, "ERC721Factory")
+    from_node = DataNFTFactoryContract(config, factory_address).get_logs(
+        "NFTCreated", start_block, last_block
+    )
+
+    indexed_config = copy.copy(config)
+    indexed_config["EVENT_INDEXER"] = indexer
+    from_index = DataNFTFactoryContract(indexed_config, factory_address).get_logs(
+        "NFTCreated", start_block, last_block
+    )
+
+    assert from_index == from_node
+    assert data_nft.address in [e.args.newTokenAddress for e in from_index]
+
+    # resuming from the checkpoint does not duplicate logs
+    indexer.sync()
+    assert len(
+        DataNFTFactoryContract(indexed_config, factory_address).get_logs(
+            "NFTCreated", start_block, last_block
+        )
+    ) == len(from_node)
+
+
+@pytest.mark.unit
+def test_indexer_rolls_back_on_reorg(config, publisher_wallet, tmpdir, monkeypatch):
+    web3 = config["web3_instance"]
+    start_block = web3.eth.block_number + 1
+    deploy_erc721_erc20(config, publisher_wallet, publisher_wallet)
+
+    indexer = EventIndexer(config, str(tmpdir / "events.db"), start_block, 1)
+    last_block = indexer.sync()
+
+    # pretend the checkpointed block was replaced
+    monkeypatch.setattr(indexer, "_block_hash", lambda block_number: "0x00")
+    rollbacks = []
+    original_rollback = indexer.rollback
+    monkeypatch.setattr(
+        indexer, "rollback", lambda n: rollbacks.append(n) or original_rollback(n)
+    )
+
+    # no stored block is on chain anymore
+    indexer.sync(last_block)
+    assert rollbacks == [start_block - 1]
+    assert indexer.last_indexed_block == last_block
+
+
+class FakeChain:
+    """Blocks with one OrderStarted log each in `log_blocks`, for `web3.eth`."""
+
+    topic = get_event_topic("OrderStarted")
+
+    def __init__(self, length: int, log_blocks: list) -> None:
+        self.chain_id = 8996
+        self.blocks = [f"0x{n:064x}" for n in range(length)]
+        self.log_blocks = log_blocks
+
+    def reorg(self, from_block: int, log_blocks: list) -> None:
+        for n in range(from_block, len(self.blocks)):
+            self.blocks[n] = f"0x{n + 10**6:064x}"
+
+        self.log_blocks = [n for n in self.log_blocks if n < from_block] + log_blocks
+
+    def get_block(self, block):
+        number = len(self.blocks) - 1 if block == "latest" else block
+        if number >= len(self.blocks):
+            raise BlockNotFound(number)
+
+        return AttributeDict({"number": number, "hash": self.blocks[number]})
+
+    def get_logs(self, params):
+        return [
+            AttributeDict(
+                {
+                    "transactionHash": f"0x{n:064x}",
+                    "logIndex": 0,
+                    "transactionIndex": 0,
+                    "blockNumber": n,
+                    "blockHash": self.blocks[n],
+                    "address": "0x" + "12" * 20,
+                    "topics": [self.topic],
+                    "data": "0x",
+                }
+            )
+            for n in self.log_blocks
+            if params["fromBlock"] <= n <= params["toBlock"]
+        ]
+
+
+@pytest.mark.unit
+def test_indexer_rolls_back_deep_reorg(tmpdir, monkeypatch):
+    monkeypatch.setattr(event_indexer, "SYNC_WINDOW", 10)
+    chain = FakeChain(42, [5, 12, 17, 25])
+    indexer = EventIndexer(
+        {"web3_instance": Mock(eth=chain)}, str(tmpdir / "events.db"), 0, 2
+    )
+
+    # blocks 40 and 41 are not confirmed yet
+    assert indexer.sync() == 39
+
+    # blocks from 15 on are replaced: three checkpoints deep
+    chain.reorg(15, [16, 30])
+    rollbacks = []
+    original_rollback = indexer.rollback
+    monkeypatch.setattr(
+        indexer, "rollback", lambda n: rollbacks.append(n) or original_rollback(n)
+    )
+
+    assert indexer.sync() == 39
+    assert rollbacks == [12]
+
+    logs = indexer.iter_raw_logs(FakeChain.topic)
+    assert [(log.blockNumber, log.blockHash.hex()) for log in logs] == [
+        (n, chain.blocks[n]) for n in [5, 12, 16, 30]
+    ]
+
+
+@pytest.mark.unit
+def test_default_block_range_uses_index(tmpdir, monkeypatch):
+    chain = FakeChain(42, [])
+    web3 = Web3()
+    monkeypatch.setattr(type(web3.eth), "chain_id", chain.chain_id)
+    monkeypatch.setattr(web3.eth, "get_block", chain.get_block)
+    monkeypatch.setattr(web3.eth, "get_logs", Mock(side_effect=chain.get_logs))
+    # the Ocean contracts were deployed at block 20
+    monkeypatch.setattr(
+        event_indexer, "get_contracts_addresses", lambda config: {"startBlock": 20}
+    )
+
+    config = {"web3_instance": web3}
+    indexer = EventIndexer(config, str(tmpdir / "events.db"), reorg_depth=0)
+    assert indexer.start_block == 20
+    assert indexer.sync() == 41
+    web3.eth.get_logs.reset_mock()
+
+    config["EVENT_INDEXER"] = indexer
+    datatoken = Datatoken1(config, "0x" + "12" * 20)
+    assert datatoken.get_start_order_logs() == []
+    web3.eth.get_logs.assert_not_called()
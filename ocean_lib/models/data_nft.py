@@ -286,6 +286,7 @@ class Flags(IntFlag):
 @enforce_types
 class DataNFT(ContractBase):
     CONTRACT_NAME = "ERC721Template"
+    IMMUTABLE_FUNCTIONS = ("getId", "name", "symbol")
 
     def create_datatoken(self, tx_dict, *args, **kwargs) -> DatatokenBase:
         datatoken_args = get_args_object(args, kwargs, DatatokenArguments)
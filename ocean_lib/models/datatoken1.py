@@ -233,7 +233,9 @@ class Datatoken1(DatatokenBase):
                 raise ValueError(f"Not allowed. allowedSwapper={allowedSwapper}")
 
             # Try to dispense. If other issues, they'll pop out
-            dispenser.dispense(self.address, to_wei(1), buyer_addr, tx_dict)
+            dispenser.dispense(
+                self.address, to_wei(1), buyer_addr, _waiting_tx_dict(tx_dict)
+            )
 
         return self.start_order(
             consumer=ContractBase.to_checksum_address(consumer),
@@ -272,7 +274,7 @@ class Datatoken1(DatatokenBase):
             datatoken_amt=to_wei(1),
             consume_market_fee_addr=consume_market_fees.address,
             consume_market_fee=consume_market_fees.amount,
-            tx_dict=tx_dict,
+            tx_dict=_waiting_tx_dict(tx_dict),
         )
 
         return self.start_order(
@@ -282,3 +284,12 @@ class Datatoken1(DatatokenBase):
             consume_market_fees=consume_market_fees,
             tx_dict=tx_dict,
         )
+
+
+def _waiting_tx_dict(tx_dict: dict) -> dict:
+    """Copy of `tx_dict` for a transaction that the next one depends on.
+
+    The order can only be estimated once the datatoken has arrived, so only
+    the order itself may be sent without waiting for its receipt.
+    """
+    return {k: v for k, v in tx_dict.items() if k != "wait_for_receipt"}
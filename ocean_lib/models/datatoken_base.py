@@ -5,11 +5,12 @@
 import logging
 from abc import ABC
 from enum import IntEnum
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 
 from enforce_typing import enforce_types
 from web3.logs import DISCARD
 from web3.main import Web3
+from web3.types import EventData
 
 from ocean_lib.agreements.service_types import ServiceTypes
 from ocean_lib.models.fixed_rate_exchange import OneExchange
@@ -24,6 +25,7 @@ from ocean_lib.services.service import Service
 from ocean_lib.structures.file_objects import FilesType
 from ocean_lib.web3_internal.constants import MAX_UINT256, ZERO_ADDRESS
 from ocean_lib.web3_internal.contract_base import ContractBase
+from ocean_lib.web3_internal.contract_cache import get_chain_id, get_contract_cache
 
 checksum_addr = ContractBase.to_checksum_address
 logger = logging.getLogger("ocean")
@@ -155,6 +157,7 @@ class DatatokenRoles(IntEnum):
 
 class DatatokenBase(ABC, ContractBase):
     CONTRACT_NAME = "ERC20Template"
+    IMMUTABLE_FUNCTIONS = ("decimals", "symbol", "name", "getId", "getERC721Address")
 
     BASE = 10**18
     BASE_COMMUNITY_FEE_PERCENTAGE = BASE / 1000
@@ -165,17 +168,32 @@ class DatatokenBase(ABC, ContractBase):
 
     @staticmethod
     def get_typed(config, address):
+        datatoken_class = DatatokenBase.get_typed_class(config, address)
+
+        return datatoken_class(config, address)
+
+    @staticmethod
+    def get_typed_class(config, address) -> type:
+        """Returns Datatoken1 or Datatoken2, depending on the token template."""
         from ocean_lib.models.datatoken1 import Datatoken1
         from ocean_lib.models.datatoken2 import Datatoken2
 
-        datatoken = Datatoken1(config, address)
+        # the template of a deployed token never changes
+        cache = get_contract_cache(config)
+        chain_id = get_chain_id(config)
+        template_id = cache.get(chain_id, address, "template_id")
 
-        try:
-            template_id = datatoken.getId()
-        except Exception:
-            template_id = 1
+        if template_id is None:
+            try:
+                template_id = Datatoken1(config, address).getId()
+            except Exception:
+                # not a datatoken template, e.g. the OCEAN token, or no code
+                # at this address yet: do not cache the fallback
+                return Datatoken1
 
-        return datatoken if template_id == 1 else Datatoken2(config, address)
+            cache.set(chain_id, address, "template_id", template_id)
+
+        return Datatoken1 if template_id == 1 else Datatoken2
 
     @enforce_types
     def start_order(
@@ -192,20 +210,25 @@ class DatatokenBase(ABC, ContractBase):
         return self.startOrder(
             checksum_addr(consumer),
             service_index,
-            (
-                checksum_addr(provider_fees["providerFeeAddress"]),
-                checksum_addr(provider_fees["providerFeeToken"]),
-                int(provider_fees["providerFeeAmount"]),
-                provider_fees["v"],
-                provider_fees["r"],
-                provider_fees["s"],
-                provider_fees["validUntil"],
-                provider_fees["providerData"],
-            ),
+            self.provider_fee_tuple(provider_fees),
             consume_market_fees.to_tuple(),
             tx_dict,
         )
 
+    @staticmethod
+    def provider_fee_tuple(provider_fees: dict) -> tuple:
+        """Returns the providerFee struct of startOrder and reuseOrder."""
+        return (
+            checksum_addr(provider_fees["providerFeeAddress"]),
+            checksum_addr(provider_fees["providerFeeToken"]),
+            int(provider_fees["providerFeeAmount"]),
+            provider_fees["v"],
+            provider_fees["r"],
+            provider_fees["s"],
+            provider_fees["validUntil"],
+            provider_fees["providerData"],
+        )
+
     @enforce_types
     def reuse_order(
         self,
@@ -215,16 +238,7 @@ class DatatokenBase(ABC, ContractBase):
     ) -> str:
         return self.reuseOrder(
             order_tx_id,
-            (
-                checksum_addr(provider_fees["providerFeeAddress"]),
-                checksum_addr(provider_fees["providerFeeToken"]),
-                int(provider_fees["providerFeeAmount"]),
-                provider_fees["v"],
-                provider_fees["r"],
-                provider_fees["s"],
-                provider_fees["validUntil"],
-                provider_fees["providerData"],
-            ),
+            self.provider_fee_tuple(provider_fees),
             tx_dict,
         )
 
@@ -235,32 +249,21 @@ class DatatokenBase(ABC, ContractBase):
         from_block: Optional[int] = 0,
         to_block: Optional[int] = "latest",
     ) -> Tuple:
-        topic0 = self.get_event_signature("OrderStarted")
-        topics = [topic0]
-        if consumer_address:
-            topic1 = f"0x000000000000000000000000{consumer_address[2:].lower()}"
-            topics = [topic0, topic1]
-
-        web3 = self.config_dict["web3_instance"]
-        event_filter = web3.eth.filter(
-            {
-                "topics": topics,
-                "toBlock": to_block,
-                "fromBlock": from_block,
-            }
-        )
-
-        orders = []
+        return list(self.iter_start_order_logs(consumer_address, from_block, to_block))
 
-        for log in event_filter.get_all_entries():
-            receipt = web3.eth.wait_for_transaction_receipt(log.transactionHash)
-            processed_events = self.contract.events.OrderStarted().process_receipt(
-                receipt, errors=DISCARD
-            )
-            for processed_event in processed_events:
-                orders.append(processed_event)
+    @enforce_types
+    def iter_start_order_logs(
+        self,
+        consumer_address: Optional[str] = None,
+        from_block: Optional[int] = 0,
+        to_block: Optional[Union[int, str]] = "latest",
+    ) -> Iterator[EventData]:
+        """Yields OrderStarted events, optionally only for `consumer_address`."""
+        topics = None
+        if consumer_address:
+            topics = [f"0x000000000000000000000000{consumer_address[2:].lower()}"]
 
-        return orders
+        return self.iter_logs("OrderStarted", from_block, to_block, topics)
 
     # ======================================================================
     # Priced data: fixed-rate exchange
@@ -325,7 +328,17 @@ class DatatokenBase(ABC, ContractBase):
         if not only_active:
             return exchanges
 
-        return [exchange for exchange in exchanges if exchange.is_active()]
+        with ContractBase.batch_calls(self.config_dict) as batch:
+            active = [
+                batch.add(exchange.FRE, "isActive", exchange.exchange_id)
+                for exchange in exchanges
+            ]
+
+        return [
+            exchange
+            for exchange, is_active in zip(exchanges, active)
+            if is_active.result
+        ]
 
     @enforce_types
     def _FRE(self):
@@ -379,7 +392,10 @@ class DatatokenBase(ABC, ContractBase):
         if not only_active:
             return dispensers
 
-        return [disp for disp in dispensers if disp.status(self.address)]
+        with ContractBase.batch_calls(self.config_dict) as batch:
+            statuses = [batch.add(disp, "status", self.address) for disp in dispensers]
+
+        return [disp for disp, status in zip(dispensers, statuses) if status.result]
 
     @enforce_types
     def dispense(self, amount: Union[int, str], tx_dict: dict):
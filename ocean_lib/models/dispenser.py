@@ -61,6 +61,7 @@ datatokensList -> a list of datatokens served by this dispenser, but we recommen
 
 class Dispenser(ContractBase):
     CONTRACT_NAME = "Dispenser"
+    IMMUTABLE_FUNCTIONS = ("getId",)
 
 
 class DispenserArguments:
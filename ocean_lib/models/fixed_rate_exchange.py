@@ -2,7 +2,7 @@
 # Copyright 2023 Ocean Protocol Foundation
 # SPDX-License-Identifier: Apache-2.0
 #
-from typing import Optional, Union
+from typing import List, Optional, Union
 
 from enforce_typing import enforce_types
 
@@ -228,6 +228,7 @@ class BtReceived:
 @enforce_types
 class FixedRateExchange(ContractBase):
     CONTRACT_NAME = "FixedRateExchange"
+    IMMUTABLE_FUNCTIONS = ("getId", "router")
 
     def get_opc_collector(self) -> str:
         """Returns address that collects fees for Ocean Protocol Community"""
@@ -500,3 +501,28 @@ class OneExchange:
     def is_active(self) -> bool:
         """Get whether exchange is 'active'"""
         return self._FRE.isActive(self._id)
+
+    # Batched getters, for many exchanges in one round-trip
+
+    @staticmethod
+    def batch_details(exchanges: List["OneExchange"]) -> List[ExchangeDetails]:
+        """Get the details of each exchange, in order"""
+        tups = _batch_call(exchanges, "getExchange")
+        return [ExchangeDetails(tup) for tup in tups]
+
+    @staticmethod
+    def batch_fees_info(exchanges: List["OneExchange"]) -> List[ExchangeFeeInfo]:
+        """Get the fee information of each exchange, in order"""
+        tups = _batch_call(exchanges, "getFeesInfo")
+        return [ExchangeFeeInfo(tup) for tup in tups]
+
+
+def _batch_call(exchanges: List[OneExchange], func_name: str) -> list:
+    if not exchanges:
+        return []
+
+    batch = ContractBase.batch_calls(exchanges[0].FRE.config_dict)
+    for exchange in exchanges:
+        batch.add(exchange.FRE, func_name, exchange.exchange_id)
+
+    return batch.execute()
@@ -6,10 +6,13 @@ import pytest
 from web3.logs import DISCARD
 from web3.main import Web3
 
-from ocean_lib.models.datatoken_base import DatatokenRoles, TokenFeeInfo
+from ocean_lib.models.datatoken1 import Datatoken1
+from ocean_lib.models.datatoken2 import Datatoken2
+from ocean_lib.models.datatoken_base import DatatokenBase, DatatokenRoles, TokenFeeInfo
 from ocean_lib.ocean.util import get_address_of_type, to_wei
 from ocean_lib.web3_internal.constants import MAX_UINT256
-from tests.resources.helper_functions import get_mock_provider_fees
+from ocean_lib.web3_internal.contract_cache import get_chain_id, get_contract_cache
+from tests.resources.helper_functions import deploy_erc721_erc20, get_mock_provider_fees
 
 
 @pytest.mark.unit
@@ -330,3 +333,29 @@ def test_exceptions(consumer_wallet, config, publisher_wallet, DT):
     # Clean from nft should work shouldn't be callable by publisher or consumer, only by erc721 contract
     with pytest.raises(Exception, match="NOT 721 Contract"):
         datatoken.cleanFrom721({"from": consumer_wallet})
+
+
+@pytest.mark.unit
+def test_get_typed_caches_template(config, publisher_wallet, monkeypatch):
+    _, datatoken2 = deploy_erc721_erc20(
+        config, publisher_wallet, publisher_wallet, template_index=2
+    )
+    ocean_address = get_address_of_type(config, "Ocean")
+    get_contract_cache(config).clear()
+
+    assert isinstance(DatatokenBase.get_typed(config, datatoken2.address), Datatoken2)
+    assert isinstance(DatatokenBase.get_typed(config, ocean_address), Datatoken1)
+
+    # only templates read from the chain are cached, not the fallback
+    cache = get_contract_cache(config)
+    chain_id = get_chain_id(config)
+    assert cache.get(chain_id, datatoken2.address, "template_id") == 2
+    assert cache.get(chain_id, ocean_address, "template_id") is None
+
+    # known templates are resolved without asking the chain
+    def no_calls(*args, **kwargs):
+        raise AssertionError("unexpected eth_call")
+
+    monkeypatch.setattr(config["web3_instance"].eth, "call", no_calls)
+
+    assert isinstance(DatatokenBase.get_typed(config, datatoken2.address), Datatoken2)
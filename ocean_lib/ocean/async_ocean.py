@@ -0,0 +1,85 @@
+#
+# Copyright 2023 Ocean Protocol Foundation
+# SPDX-License-Identifier: Apache-2.0
+#
+
+"""Ocean module for asyncio applications."""
+import logging
+from typing import Dict, Optional
+
+import aiohttp
+from web3.main import AsyncWeb3
+from web3.middleware import geth_poa_middleware
+
+from ocean_lib.aquarius import AsyncAquarius
+from ocean_lib.data_provider.async_data_service_provider import (
+    ASYNC_POOL_SIZE,
+    AsyncDataServiceProvider,
+)
+from ocean_lib.example_config import get_async_web3
+from ocean_lib.ocean.async_ocean_assets import AsyncOceanAssets
+from ocean_lib.ocean.async_ocean_compute import AsyncOceanCompute
+
+logger = logging.getLogger("ocean")
+
+
+class AsyncOcean:
+    """Entry point into Ocean Protocol for asyncio applications.
+
+    Offers the consumer flows of `Ocean` as coroutines: contract reads,
+    transactions and receipts go through an `AsyncWeb3`, and Aquarius and
+    Provider requests through aiohttp.
+
+    Usage:
+
+    `async with AsyncOcean(config_dict) as ocean:`
+    `    ddo = await ocean.assets.resolve(did)`
+    """
+
+    def __init__(
+        self,
+        config_dict: Dict,
+        async_web3: Optional[AsyncWeb3] = None,
+        session: Optional[aiohttp.ClientSession] = None,
+        pool_size: int = ASYNC_POOL_SIZE,
+    ) -> None:
+        """Initialize AsyncOcean class.
+
+        :param config_dict: variable definitions, as for `Ocean`
+        :param async_web3: defaults to one for the node of `web3_instance`
+        :param session: aiohttp session for Aquarius and Provider requests;
+          if not given, each of them creates its own
+        :param pool_size: connections the Provider client keeps open
+        """
+        self.config_dict = config_dict
+
+        if not async_web3:
+            web3 = config_dict["web3_instance"]
+            async_web3 = get_async_web3(
+                web3.provider.endpoint_uri,
+                poa=geth_poa_middleware in web3.middleware_onion,
+            )
+
+        self.web3 = async_web3
+        self.data_provider = AsyncDataServiceProvider(session, pool_size)
+        self.aquarius = AsyncAquarius(config_dict["METADATA_CACHE_URI"], session)
+
+        self.assets = AsyncOceanAssets(
+            self.config_dict, self.web3, self.data_provider, self.aquarius
+        )
+        self.compute = AsyncOceanCompute(
+            self.config_dict, self.data_provider, self.aquarius
+        )
+
+        logger.debug("AsyncOcean instance initialized: ")
+
+    async def close(self) -> None:
+        """Closes the aiohttp sessions created by this instance."""
+        await self.data_provider.close()
+        await self.aquarius.close()
+
+    async def __aenter__(self) -> "AsyncOcean":
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.close()
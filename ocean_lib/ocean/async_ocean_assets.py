@@ -0,0 +1,243 @@
+#
+# Copyright 2023 Ocean Protocol Foundation
+# SPDX-License-Identifier: Apache-2.0
+#
+
+"""Ocean assets module for asyncio applications."""
+import logging
+import os
+from typing import Callable, List, Optional, Union
+
+from hexbytes import HexBytes
+from web3.main import AsyncWeb3
+
+from ocean_lib.agreements.consumable import AssetNotConsumable, ConsumableCodes
+from ocean_lib.agreements.service_types import ServiceTypes
+from ocean_lib.aquarius import AsyncAquarius
+from ocean_lib.assets.asset_downloader import is_consumable
+from ocean_lib.assets.ddo import DDO
+from ocean_lib.data_provider.async_data_service_provider import AsyncDataServiceProvider
+from ocean_lib.data_provider.provider_fee_cache import (
+    access_quote_key,
+    get_provider_fee_cache,
+)
+from ocean_lib.exceptions import InsufficientBalance
+from ocean_lib.models.datatoken_base import DatatokenBase, TokenFeeInfo
+from ocean_lib.ocean.util import get_from_address, to_wei
+from ocean_lib.services.service import Service
+from ocean_lib.web3_internal.async_contract import get_async_contract
+
+logger = logging.getLogger("ocean")
+
+
+async def check_consumable(
+    data_provider: AsyncDataServiceProvider,
+    ddo: DDO,
+    service: Service,
+    address: str,
+    with_connectivity_check: bool = True,
+    userdata: Optional[dict] = None,
+) -> None:
+    """Raises AssetNotConsumable unless `is_consumable` returns OK.
+
+    The connectivity check goes through `data_provider`, without blocking.
+    """
+    consumable_result = is_consumable(
+        ddo,
+        service,
+        {"type": "address", "value": address},
+        with_connectivity_check=False,
+        userdata=userdata,
+    )
+
+    # is_consumable checks connectivity before credentials
+    if (
+        consumable_result != ConsumableCodes.ASSET_DISABLED
+        and with_connectivity_check
+        and not await data_provider.check_asset_file_info(
+            ddo.did, service.id, service.service_endpoint, userdata=userdata
+        )
+    ):
+        consumable_result = ConsumableCodes.CONNECTIVITY_FAIL
+
+    if consumable_result != ConsumableCodes.OK:
+        raise AssetNotConsumable(consumable_result)
+
+
+class AsyncOceanAssets:
+    """Async version of the consumer flows of `OceanAssets`."""
+
+    def __init__(
+        self,
+        config_dict: dict,
+        async_web3: AsyncWeb3,
+        data_provider: AsyncDataServiceProvider,
+        aquarius: AsyncAquarius,
+    ) -> None:
+        """Initialises AsyncOceanAssets object."""
+        self._config_dict = config_dict
+        self._web3 = async_web3
+        self._data_provider = data_provider
+        self._aquarius = aquarius
+
+        downloads_path = os.path.join(os.getcwd(), "downloads")
+        self._downloads_path = config_dict.get("DOWNLOADS_PATH", downloads_path)
+
+    async def resolve(self, did: str) -> Optional[DDO]:
+        return await self._aquarius.get_ddo(did)
+
+    async def resolve_many(self, dids: List[str]) -> List[Optional[DDO]]:
+        """Async version of `OceanAssets.resolve_many`."""
+        return await self._aquarius.get_ddos(dids)
+
+    async def search(self, text: str) -> list:
+        """
+        Search for DDOs in aquarius that contain the target text string
+        :param text - target string
+        :return - List of DDOs that match with the query
+        """
+        logger.info(f"Search for DDOs containing text: {text}")
+        text = text.replace(":", "\\:").replace("\\\\:", "\\:")
+        return await self.query({"query": {"query_string": {"query": text}}})
+
+    async def query(self, query: dict) -> list:
+        """
+        Search for DDOs in aquarius with a search query dict
+        :param query - dict with query parameters
+          More info at: https://docs.oceanprotocol.com/api-references/aquarius-rest-api
+        :return - List of DDOs that match the query.
+        """
+        logger.info(f"Search for DDOs matching query: {query}")
+        return [
+            DDO.from_dict(ddo_dict["_source"])
+            for ddo_dict in await self._aquarius.query_search(query)
+            if "_source" in ddo_dict
+        ]
+
+    async def download_asset(
+        self,
+        ddo: DDO,
+        consumer_wallet,
+        destination: str,
+        order_tx_id: Union[str, bytes],
+        service: Optional[Service] = None,
+        index: Optional[int] = None,
+        userdata: Optional[dict] = None,
+        max_workers: int = 1,
+        progress_callback: Optional[Callable] = None,
+        verify_checksum: bool = False,
+    ) -> str:
+        """Async version of `OceanAssets.download_asset`.
+
+        :return: asset folder path, str
+        """
+        service = service or ddo.services[0]  # fill in good default
+
+        if index is not None:
+            assert isinstance(index, int), logger.error("index has to be an integer.")
+            assert index >= 0, logger.error("index has to be 0 or a positive integer.")
+
+        assert (
+            service and service.type == ServiceTypes.ASSET_ACCESS
+        ), f"Service with type {ServiceTypes.ASSET_ACCESS} is not found."
+
+        assert service.service_endpoint, logger.error(
+            'Consume asset failed, service definition is missing the "serviceEndpoint".'
+        )
+
+        await check_consumable(
+            self._data_provider,
+            ddo,
+            service,
+            consumer_wallet.address,
+            userdata=userdata,
+        )
+
+        service_index_in_asset = ddo.get_index_of_service(service)
+        asset_folder = os.path.join(
+            destination, f"datafile.{ddo.did},{service_index_in_asset}"
+        )
+        os.makedirs(asset_folder, exist_ok=True)
+
+        await self._data_provider.download(
+            did=ddo.did,
+            service=service,
+            tx_id=order_tx_id,
+            consumer_wallet=consumer_wallet,
+            destination_folder=asset_folder,
+            index=index,
+            userdata=userdata,
+            max_workers=max_workers,
+            progress_callback=progress_callback,
+            verify_checksum=verify_checksum,
+        )
+
+        return asset_folder
+
+    async def pay_for_access_service(
+        self,
+        ddo: DDO,
+        tx_dict: dict,
+        service: Optional[Service] = None,
+        consume_market_fees: Optional[TokenFeeInfo] = None,
+        consumer_address: Optional[str] = None,
+        userdata: Optional[dict] = None,
+    ) -> HexBytes:
+        """Async version of `OceanAssets.pay_for_access_service`.
+
+        Unlike it, does not buy a datatoken from the pricing schema: the
+        wallet has to hold one already.
+
+        :return: the hash of the startOrder transaction
+        """
+        # fill in good defaults as needed
+        service = service or ddo.services[0]
+        wallet_address = get_from_address(tx_dict)
+        consumer_address = consumer_address or wallet_address
+
+        await check_consumable(
+            self._data_provider,
+            ddo,
+            service,
+            wallet_address,
+            userdata=userdata,
+        )
+
+        fee_cache = get_provider_fee_cache(self._config_dict)
+        quote_key = access_quote_key(ddo.did, service, consumer_address)
+        found, provider_fees = fee_cache.get_cached(quote_key)
+        if not found:
+            initialize_response = await self._data_provider.initialize(
+                did=ddo.did, service=service, consumer_address=consumer_address
+            )
+            provider_fees = initialize_response.json()["providerFee"]
+            fee_cache.set(quote_key, provider_fees)
+
+        dt = get_async_contract(
+            self._web3, "ERC20Template", service.datatoken, self._config_dict
+        )
+        balance = await dt.call("balanceOf", wallet_address)
+
+        if balance < to_wei(1):
+            raise InsufficientBalance(
+                f"Your token balance {balance} {await dt.call('symbol')} is not "
+                f"sufficient to execute the requested service. This service "
+                f"requires 1 wei."
+            )
+
+        consume_market_fees = consume_market_fees or TokenFeeInfo()
+        try:
+            receipt = await dt.transact(
+                "startOrder",
+                AsyncWeb3.to_checksum_address(consumer_address.lower()),
+                ddo.get_index_of_service(service),
+                DatatokenBase.provider_fee_tuple(provider_fees),
+                consume_market_fees.to_tuple(),
+                tx_dict=tx_dict,
+            )
+        except Exception:
+            # e.g. the provider changed its fees: ask it again next time
+            fee_cache.invalidate(quote_key)
+            raise
+
+        return receipt.transactionHash
@@ -0,0 +1,80 @@
+#
+# Copyright 2023 Ocean Protocol Foundation
+# SPDX-License-Identifier: Apache-2.0
+#
+import logging
+from typing import Any, Dict, List, Optional
+
+from ocean_lib.agreements.service_types import ServiceTypes
+from ocean_lib.aquarius import AsyncAquarius
+from ocean_lib.assets.ddo import DDO
+from ocean_lib.data_provider.async_data_service_provider import AsyncDataServiceProvider
+from ocean_lib.models.compute_input import ComputeInput
+from ocean_lib.ocean.async_ocean_assets import check_consumable
+from ocean_lib.services.service import Service
+from ocean_lib.structures.algorithm_metadata import AlgorithmMetadata
+
+logger = logging.getLogger("ocean")
+
+
+class AsyncOceanCompute:
+    """Async version of the job flows of `OceanCompute`."""
+
+    def __init__(
+        self,
+        config_dict: dict,
+        data_provider: AsyncDataServiceProvider,
+        aquarius: AsyncAquarius,
+    ) -> None:
+        """Initialises AsyncOceanCompute class."""
+        self._config_dict = config_dict
+        self._data_provider = data_provider
+        self._aquarius = aquarius
+
+    async def start(
+        self,
+        consumer_wallet,
+        dataset: ComputeInput,
+        compute_environment: str,
+        algorithm: Optional[ComputeInput] = None,
+        algorithm_meta: Optional[AlgorithmMetadata] = None,
+        algorithm_algocustomdata: Optional[dict] = None,
+        additional_datasets: List[ComputeInput] = [],
+    ) -> str:
+        ddo = await self._aquarius.get_ddo(dataset.did)
+        service = ddo.get_service_by_id(dataset.service_id)
+        assert (
+            ServiceTypes.CLOUD_COMPUTE == service.type
+        ), "service at serviceId is not of type compute service."
+
+        await check_consumable(
+            self._data_provider, ddo, service, consumer_wallet.address
+        )
+
+        # Start compute job
+        job_info = await self._data_provider.start_compute_job(
+            dataset_compute_service=service,
+            consumer=consumer_wallet,
+            dataset=dataset,
+            compute_environment=compute_environment,
+            algorithm=algorithm,
+            algorithm_meta=algorithm_meta,
+            algorithm_custom_data=algorithm_algocustomdata,
+            input_datasets=additional_datasets,
+        )
+        return job_info["jobId"]
+
+    async def status(
+        self, ddo: DDO, service: Service, job_id: str, wallet
+    ) -> Dict[str, Any]:
+        """
+        Gets job status, see `OceanCompute.status`.
+
+        :return: dict the status for an existing compute job, keys are (ok, status, statusText)
+        """
+        job_info = await self._data_provider.compute_job_status(
+            ddo.did, job_id, service, wallet
+        )
+        job_info.update({"ok": job_info.get("status") not in (31, 32, None)})
+
+        return job_info
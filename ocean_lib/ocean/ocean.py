@@ -13,6 +13,12 @@ from web3.datastructures import AttributeDict
 
 from ocean_lib.assets.ddo import DDO
 from ocean_lib.data_provider.data_service_provider import DataServiceProvider
+from ocean_lib.data_provider.provider_fee_cache import (
+    access_quote_key,
+    compute_quote_fees,
+    compute_quote_key,
+    get_provider_fee_cache,
+)
 from ocean_lib.example_config import config_defaults
 from ocean_lib.models.compute_input import ComputeInput
 from ocean_lib.models.data_nft import DataNFT
@@ -34,6 +40,7 @@ from ocean_lib.ocean.ocean_compute import OceanCompute
 from ocean_lib.ocean.util import get_address_of_type, get_ocean_token_address
 from ocean_lib.services.service import Service
 from ocean_lib.structures.algorithm_metadata import AlgorithmMetadata
+from ocean_lib.web3_internal.contract_base import ContractBase
 
 logger = logging.getLogger("ocean")
 
@@ -106,7 +113,10 @@ class Ocean:
     @property
     @enforce_types
     def OCEAN_token(self) -> DatatokenBase:
-        return DatatokenBase.get_typed(self.config, self.OCEAN_address)
+        address = self.OCEAN_address
+        datatoken_class = DatatokenBase.get_typed_class(self.config, address)
+
+        return datatoken_class.get_shared(self.config, address)
 
     @property
     @enforce_types
@@ -118,22 +128,22 @@ class Ocean:
     @property
     @enforce_types
     def data_nft_factory(self) -> DataNFTFactoryContract:
-        return DataNFTFactoryContract(self.config, self._addr("ERC721Factory"))
+        return self._shared(DataNFTFactoryContract, "ERC721Factory")
 
     @property
     @enforce_types
     def dispenser(self) -> Dispenser:
-        return Dispenser(self.config, self._addr("Dispenser"))
+        return self._shared(Dispenser, "Dispenser")
 
     @property
     @enforce_types
     def fixed_rate_exchange(self) -> FixedRateExchange:
-        return FixedRateExchange(self.config, self._addr("FixedPrice"))
+        return self._shared(FixedRateExchange, "FixedPrice")
 
     @property
     @enforce_types
     def factory_router(self) -> FactoryRouter:
-        return FactoryRouter(self.config, self._addr("Router"))
+        return self._shared(FactoryRouter, "Router")
 
     # ======================================================================
     # token getters
@@ -180,13 +190,16 @@ class Ocean:
     def retrieve_provider_fees(
         self, ddo: DDO, access_service: Service, publisher_wallet
     ) -> dict:
-        initialize_response = DataServiceProvider.initialize(
-            ddo.did, access_service, consumer_address=publisher_wallet.address
+        def fetch() -> dict:
+            initialize_response = DataServiceProvider.initialize(
+                ddo.did, access_service, consumer_address=publisher_wallet.address
+            )
+            return initialize_response.json()["providerFee"]
+
+        return get_provider_fee_cache(self.config_dict).get(
+            access_quote_key(ddo.did, access_service, publisher_wallet.address),
+            fetch,
         )
-        initialize_data = initialize_response.json()
-        provider_fees = initialize_data["providerFee"]
-
-        return provider_fees
 
     @enforce_types
     def retrieve_provider_fees_for_compute(
@@ -197,7 +210,7 @@ class Ocean:
         compute_environment: str,
         valid_until: int,
     ) -> dict:
-        initialize_compute_response = DataServiceProvider.initialize_compute(
+        initialize_args = (
             [x.as_dictionary() for x in datasets],
             algorithm_data.as_dictionary(),
             datasets[0].service.service_endpoint,
@@ -206,49 +219,53 @@ class Ocean:
             valid_until,
         )
 
-        return initialize_compute_response.json()
+        return get_provider_fee_cache(self.config_dict).get(
+            compute_quote_key(*initialize_args),
+            lambda: DataServiceProvider.initialize_compute(*initialize_args).json(),
+            compute_quote_fees,
+        )
 
     # ======================================================================
     # DF/VE properties (alphabetical)
     @property
     @enforce_types
     def df_rewards(self) -> DFRewards:
-        return DFRewards(self.config, self._addr("DFRewards"))
+        return self._shared(DFRewards, "DFRewards")
 
     @property
     @enforce_types
     def df_strategy_v1(self) -> DFStrategyV1:
-        return DFStrategyV1(self.config, self._addr("DFStrategyV1"))
+        return self._shared(DFStrategyV1, "DFStrategyV1")
 
     @property
     @enforce_types
     def smart_wallet_checker(self) -> SmartWalletChecker:
-        return SmartWalletChecker(self.config, self._addr("SmartWalletChecker"))
+        return self._shared(SmartWalletChecker, "SmartWalletChecker")
 
     @property
     @enforce_types
     def ve_allocate(self) -> VeAllocate:
-        return VeAllocate(self.config, self._addr("veAllocate"))
+        return self._shared(VeAllocate, "veAllocate")
 
     @property
     @enforce_types
     def ve_delegation(self) -> VeDelegation:
-        return VeDelegation(self.config, self._addr("veDelegation"))
+        return self._shared(VeDelegation, "veDelegation")
 
     @property
     @enforce_types
     def ve_fee_distributor(self) -> VeFeeDistributor:
-        return VeFeeDistributor(self.config, self._addr("veFeeDistributor"))
+        return self._shared(VeFeeDistributor, "veFeeDistributor")
 
     @property
     @enforce_types
     def ve_fee_estimate(self) -> VeFeeEstimate:
-        return VeFeeEstimate(self.config, self._addr("veFeeEstimate"))
+        return self._shared(VeFeeEstimate, "veFeeEstimate")
 
     @property
     @enforce_types
     def ve_ocean(self) -> VeOcean:
-        return VeOcean(self.config, self._addr("veOCEAN"))
+        return self._shared(VeOcean, "veOCEAN")
 
     @property
     @enforce_types
@@ -266,5 +283,13 @@ class Ocean:
     def _addr(self, type_str: str) -> str:
         return get_address_of_type(self.config, type_str)
 
+    def _shared(self, contract_class: Type[ContractBase], type_str: str):
+        return contract_class.get_shared(self.config, self._addr(type_str))
+
+    @enforce_types
+    def clear_contracts(self) -> None:
+        """Drops the shared contract objects, e.g. after a redeployment."""
+        ContractBase.clear_shared(self.config)
+
     def wallet_balance(self, w):
         return self.config["web3_instance"].eth.get_balance(w.address)
@@ -9,17 +9,24 @@ import logging
 import lzma
 import os
 from datetime import datetime
-from typing import List, Optional, Tuple, Type, Union
+from typing import Callable, Iterator, List, Optional, Tuple, Type, Union
 
 from enforce_typing import enforce_types
 
 from ocean_lib.agreements.consumable import AssetNotConsumable, ConsumableCodes
 from ocean_lib.agreements.service_types import ServiceTypes
 from ocean_lib.aquarius import Aquarius
+from ocean_lib.aquarius.aquarius import QUERY_PAGE_SIZE
 from ocean_lib.assets.asset_downloader import download_asset_files, is_consumable
 from ocean_lib.assets.ddo import DDO
 from ocean_lib.data_provider.data_encryptor import DataEncryptor
 from ocean_lib.data_provider.data_service_provider import DataServiceProvider
+from ocean_lib.data_provider.provider_fee_cache import (
+    access_quote_key,
+    compute_quote_fees,
+    compute_quote_key,
+    get_provider_fee_cache,
+)
 from ocean_lib.exceptions import AquariusError, InsufficientBalance
 from ocean_lib.models.compute_input import ComputeInput
 from ocean_lib.models.data_nft import DataNFT, DataNFTArguments
@@ -599,6 +606,8 @@ class OceanAssets:
             tx_dict,
         )
 
+        # the cached version is outdated, also if Aquarius is slow to index
+        self._aquarius.invalidate_ddo(ddo.did)
         ddo = self._aquarius.wait_for_ddo_update(ddo, tx_result.transactionHash.hex())
 
         return ddo
@@ -607,6 +616,14 @@ class OceanAssets:
     def resolve(self, did: str) -> "DDO":
         return self._aquarius.get_ddo(did)
 
+    @enforce_types
+    def resolve_many(self, dids: List[str]) -> List[Optional[DDO]]:
+        """Resolves many dids with a few batched queries, see `Aquarius.get_ddos`.
+
+        :return - the DDOs in the order of `dids`, None for unknown dids
+        """
+        return self._aquarius.get_ddos(dids)
+
     @enforce_types
     def search(self, text: str) -> list:
         """
@@ -639,6 +656,37 @@ class OceanAssets:
             if "_source" in ddo_dict
         ]
 
+    @enforce_types
+    def iter_search(
+        self, text: str, page_size: int = QUERY_PAGE_SIZE, prefetch: bool = False
+    ) -> Iterator[DDO]:
+        """
+        Like `search`, but yields the DDOs of all result pages lazily.
+        See `Aquarius.iter_query_search` for `page_size` and `prefetch`.
+        """
+        logger.info(f"Search for DDOs containing text: {text}")
+        text = text.replace(":", "\\:").replace("\\\\:", "\\:")
+        return self.iter_query(
+            {"query": {"query_string": {"query": text}}}, page_size, prefetch
+        )
+
+    @enforce_types
+    def iter_query(
+        self, query: dict, page_size: int = QUERY_PAGE_SIZE, prefetch: bool = False
+    ) -> Iterator[DDO]:
+        """
+        Like `query`, but yields the DDOs of all result pages lazily.
+        See `Aquarius.iter_query_search` for `page_size` and `prefetch`.
+
+        E.g. to export the whole catalog, with a stable order:
+          `iter_query({"query": {"match_all": {}}, "sort": [{"_id": "asc"}]})`
+        """
+        return (
+            DDO.from_dict(ddo_dict["_source"])
+            for ddo_dict in self._aquarius.iter_query_search(query, page_size, prefetch)
+            if "_source" in ddo_dict
+        )
+
     @enforce_types
     def download_asset(
         self,
@@ -649,6 +697,9 @@ class OceanAssets:
         service: Optional[Service] = None,
         index: Optional[int] = None,
         userdata: Optional[dict] = None,
+        max_workers: int = 1,
+        progress_callback: Optional[Callable] = None,
+        verify_checksum: bool = False,
     ) -> str:
         service = service or ddo.services[0]  # fill in good default
 
@@ -661,7 +712,16 @@ class OceanAssets:
         ), f"Service with type {ServiceTypes.ASSET_ACCESS} is not found."
 
         path: str = download_asset_files(
-            ddo, service, consumer_wallet, destination, order_tx_id, index, userdata
+            ddo,
+            service,
+            consumer_wallet,
+            destination,
+            order_tx_id,
+            index,
+            userdata,
+            max_workers=max_workers,
+            progress_callback=progress_callback,
+            verify_checksum=verify_checksum,
         )
         return path
 
@@ -700,8 +760,13 @@ class OceanAssets:
             "consumer_address": consumer_address,
         }
 
-        initialize_response = data_provider.initialize(**initialize_args)
-        provider_fees = initialize_response.json()["providerFee"]
+        # signed fees are reused while valid, e.g. for repeat purchases
+        fee_cache = get_provider_fee_cache(self._config_dict)
+        quote_key = access_quote_key(ddo.did, service, consumer_address)
+        provider_fees = fee_cache.get(
+            quote_key,
+            lambda: data_provider.initialize(**initialize_args).json()["providerFee"],
+        )
 
         params = {
             "consumer": consumer_address,
@@ -716,6 +781,7 @@ class OceanAssets:
         balance = dt.balanceOf(wallet_address)
 
         if balance < to_wei(1):
+            error = None
             try:
                 params[
                     "consume_market_swap_fee_amount"
@@ -724,8 +790,10 @@ class OceanAssets:
                     "consume_market_swap_fee_address"
                 ] = consume_market_swap_fee_address
                 receipt = dt.get_from_pricing_schema_and_order(**params)
-            except Exception:
+            except Exception as e:
+                fee_cache.invalidate(quote_key)
                 receipt = None
+                error = e
 
             if receipt:
                 return receipt
@@ -734,9 +802,14 @@ class OceanAssets:
                 f"Your token balance {balance} {dt.symbol()} is not sufficient "
                 f"to execute the requested service. This service "
                 f"requires 1 wei."
-            )
+            ) from error
 
-        receipt = dt.start_order(**params)
+        try:
+            receipt = dt.start_order(**params)
+        except Exception:
+            # e.g. the provider changed its fees: ask it again next time
+            fee_cache.invalidate(quote_key)
+            raise
 
         return receipt.transactionHash
 
@@ -757,7 +830,7 @@ class OceanAssets:
         if not consumer_address:
             consumer_address = wallet_address
 
-        initialize_response = data_provider.initialize_compute(
+        initialize_args = (
             [x.as_dictionary() for x in datasets],
             algorithm_data.as_dictionary(),
             datasets[0].service.service_endpoint,
@@ -766,7 +839,17 @@ class OceanAssets:
             valid_until,
         )
 
-        result = initialize_response.json()
+        # e.g. a quote from Ocean.retrieve_provider_fees_for_compute
+        fee_cache = get_provider_fee_cache(self._config_dict)
+        quote_key = compute_quote_key(*initialize_args)
+        result = fee_cache.get(
+            quote_key,
+            lambda: data_provider.initialize_compute(*initialize_args).json(),
+            compute_quote_fees,
+        )
+        # the quote tells which orders are valid, which ordering changes
+        fee_cache.invalidate(quote_key)
+
         for i, item in enumerate(result["datasets"]):
             self._start_or_reuse_order_based_on_initialize_response(
                 datasets[i],
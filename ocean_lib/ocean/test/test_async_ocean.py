@@ -0,0 +1,154 @@
+#
+# Copyright 2023 Ocean Protocol Foundation
+# SPDX-License-Identifier: Apache-2.0
+#
+import asyncio
+from unittest.mock import Mock
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from eth_account import Account
+from hexbytes import HexBytes
+
+from ocean_lib.data_provider.base import DataServiceProviderBase
+from ocean_lib.data_provider.provider_fee_cache import ProviderFeeCache
+from ocean_lib.exceptions import InsufficientBalance
+from ocean_lib.models.datatoken_base import DatatokenBase
+from ocean_lib.ocean import async_ocean_assets
+from ocean_lib.ocean.async_ocean import AsyncOcean
+from ocean_lib.web3_internal.async_contract import AsyncPendingTransaction
+from tests.resources.ddo_helpers import get_sample_ddo
+from tests.resources.mocks.http_client_mock import TEST_SERVICE_ENDPOINTS
+
+PROVIDER_FEES = {
+    "providerFeeAddress": "0x" + "ab" * 20,
+    "providerFeeToken": "0x" + "cd" * 20,
+    "providerFeeAmount": "0",
+    "v": 27,
+    "r": "0x" + "00" * 32,
+    "s": "0x" + "00" * 32,
+    "validUntil": 0,
+    "providerData": "0x",
+}
+
+
+def _ocean_app(ddo_dict: dict, requests: list) -> web.Application:
+    async def root(request):
+        return web.json_response(
+            {
+                "providerAddresses": {"8996": "0x" + "12" * 20},
+                "serviceEndpoints": TEST_SERVICE_ENDPOINTS,
+            }
+        )
+
+    async def get_ddo(request):
+        requests.append(("ddo", request.match_info["did"]))
+        if request.match_info["did"] != ddo_dict["id"]:
+            return web.json_response({"error": "not found"}, status=404)
+
+        return web.json_response(ddo_dict)
+
+    async def query(request):
+        query = await request.json()
+        requests.append(("query", query))
+
+        dids = query["query"].get("terms", {}).get("_id", [ddo_dict["id"]])
+        hits = [{"_source": ddo_dict}] if ddo_dict["id"] in dids else []
+        return web.json_response({"hits": {"hits": hits}})
+
+    async def fileinfo(request):
+        requests.append(("fileinfo", await request.json()))
+        return web.json_response([{"valid": True}])
+
+    async def initialize(request):
+        requests.append(("initialize", dict(request.query)))
+        return web.json_response({"providerFee": PROVIDER_FEES})
+
+    app = web.Application()
+    app.router.add_get("/", root)
+    app.router.add_get("/api/aquarius/assets/ddo/{did}", get_ddo)
+    app.router.add_post("/api/aquarius/assets/query", query)
+    app.router.add_post("/api/services/fileinfo", fileinfo)
+    app.router.add_get("/api/services/initialize", initialize)
+    return app
+
+
+class FakeDatatoken:
+    def __init__(self, balance: int) -> None:
+        self.balance = balance
+        self.transactions = []
+
+    async def call(self, func_name, *args):
+        return {"balanceOf": self.balance, "symbol": "DT1"}[func_name]
+
+    async def transact(self, func_name, *args, tx_dict):
+        self.transactions.append((func_name, args, tx_dict))
+        tx_hash = HexBytes("0x" + "ee" * 32)
+        # like AsyncContractBase.transact
+        if not tx_dict.get("wait_for_receipt", True):
+            return AsyncPendingTransaction(Mock(), tx_hash)
+
+        return Mock(transactionHash=tx_hash)
+
+
+@pytest.mark.unit
+def test_async_ocean_flows(monkeypatch):
+    requests = []
+    wallet = Account.create()
+    ddo_dict = get_sample_ddo()
+    ddo_dict.pop("credentials", None)
+    datatoken = FakeDatatoken(balance=10**18)
+    fee_cache = ProviderFeeCache()
+    monkeypatch.setattr(
+        async_ocean_assets, "get_async_contract", lambda *args: datatoken
+    )
+
+    async def run():
+        async with TestServer(_ocean_app(ddo_dict, requests)) as server:
+            url = str(server.make_url(""))
+            ddo_dict["services"][0]["serviceEndpoint"] = url
+            ddo_dict["services"][0]["datatokenAddress"] = "0x" + "34" * 20
+
+            config_dict = {"METADATA_CACHE_URI": url, "PROVIDER_FEE_CACHE": fee_cache}
+            async with AsyncOcean(config_dict, async_web3=Mock()) as ocean:
+                ddo = await ocean.assets.resolve(ddo_dict["id"])
+                missing = await ocean.assets.resolve("did:op:missing")
+                found = await ocean.assets.search("did:op:1")
+                many = await ocean.assets.resolve_many(["did:op:missing", ddo.did])
+                tx_id = await ocean.assets.pay_for_access_service(ddo, {"from": wallet})
+                pending_tx_id = await ocean.assets.pay_for_access_service(
+                    ddo, {"from": wallet, "wait_for_receipt": False}
+                )
+
+                datatoken.balance = 0
+                with pytest.raises(InsufficientBalance):
+                    await ocean.assets.pay_for_access_service(ddo, {"from": wallet})
+
+                ocean.aquarius.invalidate_ddo()
+
+            DataServiceProviderBase.invalidate_provider_cache()
+            return ddo, missing, found, many, tx_id, pending_tx_id
+
+    ddo, missing, found, many, tx_id, pending_tx_id = asyncio.run(run())
+
+    assert ddo.did == ddo_dict["id"]
+    assert missing is None
+    assert [d.did for d in found] == [ddo.did]
+    assert many[0] is None and many[1].did == ddo.did
+    assert requests[2] == (
+        "query",
+        {"query": {"query_string": {"query": "did\\:op\\:1"}}},
+    )
+
+    assert tx_id == pending_tx_id == HexBytes("0x" + "ee" * 32)
+    assert len(datatoken.transactions) == 2
+    func_name, args, tx_dict = datatoken.transactions[0]
+    assert func_name == "startOrder"
+    assert args[0] == wallet.address
+    assert args[2] == DatatokenBase.provider_fee_tuple(PROVIDER_FEES)
+    assert tx_dict == {"from": wallet}
+
+    # later purchases reused the signed fees of the first
+    assert [name for name, _ in requests].count("initialize") == 1
+    assert fee_cache.hits == 2
@@ -58,3 +58,18 @@ def test_contract_objects(publisher_ocean):
     assert isinstance(ocean.veOCEAN, VeOcean)
 
     assert ocean.config == ocean.config_dict  # test alias
+
+
+@pytest.mark.unit
+def test_contract_objects_are_shared(publisher_ocean):
+    ocean = publisher_ocean
+
+    assert ocean.OCEAN is ocean.OCEAN_token
+    assert ocean.dispenser is ocean.dispenser
+    assert ocean.ve_ocean is ocean.veOCEAN
+    assert ocean.data_nft_factory is not ocean.factory_router
+
+    dispenser = ocean.dispenser
+    ocean.clear_contracts()
+    assert ocean.dispenser is not dispenser
+    assert ocean.dispenser.address == dispenser.address
@@ -9,6 +9,9 @@ from enforce_typing import enforce_types
 from web3.main import Web3
 
 from ocean_lib.web3_internal.contract_utils import get_contracts_addresses
+from ocean_lib.web3_internal.fee_oracle import get_fee_oracle
+from ocean_lib.web3_internal.nonce_manager import get_nonce_manager
+from ocean_lib.web3_internal.utils import get_gas_fees, get_signer
 
 GANACHE_URL = "http://127.0.0.1:8545"
 
@@ -17,6 +20,7 @@ GANACHE_URL = "http://127.0.0.1:8545"
 def get_address_of_type(
     config_dict: dict, address_type: str, key: Optional[str] = None
 ) -> str:
+    # addresses from the address book are already checksummed
     addresses = get_contracts_addresses(config_dict)
     if address_type not in addresses.keys():
         raise KeyError(f"{address_type} address is not set in the config file")
@@ -25,7 +29,7 @@ def get_address_of_type(
         if not isinstance(addresses[address_type], dict)
         else addresses[address_type].get(key, addresses[address_type]["1"])
     )
-    return Web3.to_checksum_address(address.lower())
+    return address
 
 
 @enforce_types
@@ -35,9 +39,7 @@ def get_ocean_token_address(config_dict: dict) -> str:
     """
     addresses = get_contracts_addresses(config_dict)
 
-    return (
-        Web3.to_checksum_address(addresses.get("Ocean").lower()) if addresses else None
-    )
+    return addresses.get("Ocean") if addresses else None
 
 
 @enforce_types
@@ -101,19 +103,30 @@ def send_ether(
         "to": to_address,
         "value": amount,
         "chainId": chain_id,
-        "nonce": web3.eth.get_transaction_count(from_wallet.address),
         "type": 2,
     }
     tx["gas"] = web3.eth.estimate_gas(tx)
 
-    if not priority_fee:
-        priority_fee = web3.eth.max_priority_fee
+    fees = get_fee_oracle(config).get_fees()
+    if fees:
+        default_priority_fee, max_fee = fees.max_priority_fee, fees.max_fee
+    else:
+        # the node has no EIP-1559 fee estimate: ask the gas station
+        default_priority_fee, max_fee = get_gas_fees()
 
-    base_fee = web3.eth.get_block("latest")["baseFeePerGas"]
+    if not priority_fee:
+        priority_fee = default_priority_fee
 
     tx["maxPriorityFeePerGas"] = priority_fee
-    tx["maxFeePerGas"] = base_fee * 2 + priority_fee
-
-    signed_tx = web3.eth.account.sign_transaction(tx, from_wallet._private_key)
-    tx_hash = web3.eth.send_raw_transaction(signed_tx.rawTransaction)
-    return web3.eth.wait_for_transaction_receipt(tx_hash)
+    tx["maxFeePerGas"] = max_fee - default_priority_fee + priority_fee
+
+    nonce_manager = get_nonce_manager(web3, from_wallet.address)
+    tx["nonce"] = nonce_manager.next_nonce()
+
+    try:
+        signed_tx = get_signer(from_wallet).sign_transaction(tx)
+        tx_hash = web3.eth.send_raw_transaction(signed_tx.rawTransaction)
+        return web3.eth.wait_for_transaction_receipt(tx_hash)
+    except Exception:
+        nonce_manager.resync()
+        raise
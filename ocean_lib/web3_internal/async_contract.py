@@ -0,0 +1,221 @@
+#
+# Copyright 2023 Ocean Protocol Foundation
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Contract calls and transactions over an `AsyncWeb3` instance."""
+import asyncio
+import functools
+import logging
+import threading
+from typing import Any, Optional, Union
+
+from hexbytes import HexBytes
+from web3._utils.abi import abi_to_signature
+from web3.main import AsyncWeb3, Web3
+from web3.types import TxReceipt
+
+from ocean_lib.web3_internal.clef import ClefAccount
+from ocean_lib.web3_internal.contract_utils import get_contract_definition
+from ocean_lib.web3_internal.fee_oracle import DEFAULT_FEE_STRATEGY, AsyncFeeOracle
+from ocean_lib.web3_internal.utils import get_signer
+from ocean_lib.web3_internal.web3_cache import get_web3_cache
+
+logger = logging.getLogger(__name__)
+
+_registry_lock = threading.Lock()
+
+
+class AsyncNonceManager:
+    """Like `NonceManager`, for an `AsyncWeb3` instance."""
+
+    def __init__(self, web3: AsyncWeb3, address: str) -> None:
+        self.web3 = web3
+        self.address = Web3.to_checksum_address(address.lower())
+        self._lock = None
+        self._next_nonce = None
+
+    async def next_nonce(self) -> int:
+        """Returns a nonce that no other caller of this manager will get."""
+        # created here, to belong to the running event loop
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            if self._next_nonce is None:
+                self._next_nonce = await self.web3.eth.get_transaction_count(
+                    self.address, "pending"
+                )
+
+            nonce = self._next_nonce
+            self._next_nonce += 1
+
+            return nonce
+
+    def resync(self) -> None:
+        """Forgets the local nonce, so that the next one comes from the node."""
+        logger.debug(f"Resyncing nonce for {self.address}.")
+        self._next_nonce = None
+
+
+def get_async_nonce_manager(web3: AsyncWeb3, address: str) -> AsyncNonceManager:
+    """Returns the shared AsyncNonceManager for this web3 instance and address."""
+    address = Web3.to_checksum_address(address.lower())
+
+    with _registry_lock:
+        managers = get_web3_cache(web3, "nonce_managers")
+        if address not in managers:
+            managers[address] = AsyncNonceManager(web3, address)
+
+        return managers[address]
+
+
+def get_async_fee_oracle(
+    web3: AsyncWeb3, strategy: str = DEFAULT_FEE_STRATEGY
+) -> AsyncFeeOracle:
+    """Returns the shared AsyncFeeOracle for this web3 instance."""
+    with _registry_lock:
+        oracles = get_web3_cache(web3, "fee_oracles")
+        if "default" not in oracles:
+            oracles["default"] = AsyncFeeOracle(web3, strategy=strategy)
+
+        return oracles["default"]
+
+
+class AsyncPendingTransaction:
+    """Like `PendingTransaction`, for an `AsyncWeb3` instance.
+
+    `await result()` waits for the receipt.
+    """
+
+    def __init__(
+        self,
+        web3: AsyncWeb3,
+        tx_hash: HexBytes,
+        nonce_manager: Optional[AsyncNonceManager] = None,
+    ) -> None:
+        self.web3 = web3
+        self.tx_hash = HexBytes(tx_hash)
+        self._nonce_manager = nonce_manager
+        self._receipt = None
+
+    @property
+    def transactionHash(self) -> HexBytes:
+        """Same name as on receipts, so callers can use either."""
+        return self.tx_hash
+
+    def done(self) -> bool:
+        return self._receipt is not None
+
+    async def result(self, timeout: float = 120) -> TxReceipt:
+        """Returns the receipt, waiting up to `timeout` seconds for it."""
+        if self._receipt is None:
+            try:
+                self._receipt = await self.web3.eth.wait_for_transaction_receipt(
+                    self.tx_hash, timeout=timeout
+                )
+            except Exception:
+                # dropped or replaced: the next nonce has to come from the node
+                if self._nonce_manager:
+                    self._nonce_manager.resync()
+                raise
+
+        return self._receipt
+
+    def __repr__(self) -> str:
+        state = "mined" if self.done() else "pending"
+        return f"AsyncPendingTransaction({self.tx_hash.hex()}, {state})"
+
+
+class AsyncContractBase:
+    """Calls and transactions of one deployed contract, over an `AsyncWeb3`.
+
+    The async counterpart of `ContractBase` for the flows of `AsyncOcean`:
+    functions are invoked by name with `call` and `transact`, instead of
+    being exposed as methods.
+    """
+
+    def __init__(
+        self,
+        web3: AsyncWeb3,
+        contract_name: str,
+        address: str,
+        fee_strategy: str = DEFAULT_FEE_STRATEGY,
+    ) -> None:
+        self.web3 = web3
+        self.contract_name = contract_name
+        self.address = Web3.to_checksum_address(address.lower())
+        self.fee_strategy = fee_strategy
+        self.contract = web3.eth.contract(
+            address=self.address, abi=get_contract_definition(contract_name)["abi"]
+        )
+
+    async def call(self, func_name: str, *args) -> Any:
+        """Returns the result of the view function `func_name`."""
+        return await getattr(self.contract.functions, func_name)(*args).call()
+
+    async def transact(
+        self, func_name: str, *args, tx_dict: dict
+    ) -> Union[TxReceipt, AsyncPendingTransaction]:
+        """Sends a transaction of `func_name`, signed by the wallet in `tx_dict`.
+
+        Returns the receipt, or an `AsyncPendingTransaction` if `tx_dict` holds
+        `"wait_for_receipt": False` (see `function_wrapper`).
+        """
+        wallet = tx_dict["from"]
+        tx_dict2 = tx_dict.copy()
+        tx_dict2["from"] = wallet.address
+        wait_for_receipt = tx_dict2.pop("wait_for_receipt", True)
+
+        func = getattr(self.contract.functions, func_name)(*args)
+        oracle = get_async_fee_oracle(self.web3)
+        await oracle.fill_transaction(tx_dict2, self.fee_strategy)
+        tx = await func.build_transaction(tx_dict2)
+
+        nonce_manager = get_async_nonce_manager(self.web3, wallet.address)
+        if "nonce" not in tx:
+            tx["nonce"] = await nonce_manager.next_nonce()
+
+        try:
+            if isinstance(wallet, ClefAccount):
+                for k, v in tx.items():
+                    tx[k] = Web3.to_hex(v) if not isinstance(v, str) else v
+
+                # clef signs over a blocking http request
+                response = await asyncio.get_running_loop().run_in_executor(
+                    None,
+                    functools.partial(
+                        wallet.provider.make_request,
+                        "account_signTransaction",
+                        [tx, abi_to_signature(func.abi)],
+                    ),
+                )
+                raw_signed_tx = response["result"]["raw"]
+            else:
+                signer = get_signer(wallet)
+                raw_signed_tx = signer.sign_transaction(tx).rawTransaction
+
+            tx_hash = await self.web3.eth.send_raw_transaction(raw_signed_tx)
+            if not wait_for_receipt:
+                return AsyncPendingTransaction(self.web3, tx_hash, nonce_manager)
+
+            return await self.web3.eth.wait_for_transaction_receipt(tx_hash)
+        except Exception:
+            # the tx was not signed, or rejected, dropped or replaced:
+            # ask the node again, so its nonce does not leave a gap
+            nonce_manager.resync()
+            raise
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.contract_name}, {self.address})"
+
+
+def get_async_contract(
+    web3: AsyncWeb3,
+    contract_name: str,
+    address: str,
+    config_dict: Optional[dict] = None,
+) -> AsyncContractBase:
+    """Returns an AsyncContractBase, using the fee strategy of `config_dict`."""
+    strategy = (config_dict or {}).get("GAS_FEE_STRATEGY", DEFAULT_FEE_STRATEGY)
+
+    return AsyncContractBase(web3, contract_name, address, fee_strategy=strategy)
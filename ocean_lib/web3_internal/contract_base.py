@@ -4,29 +4,52 @@
 #
 
 """All contracts inherit from `ContractBase` class."""
+
 import logging
-from typing import List, Optional
+import threading
+from types import MethodType
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
 
 from enforce_typing import enforce_types
 from eth_typing import ChecksumAddress
 from web3._utils.abi import abi_to_signature
-from web3.exceptions import MismatchedABI
-from web3.logs import DISCARD
+from web3._utils.validation import validate_address
+from web3.contract import Contract
+from web3.exceptions import InvalidEventABI, LogTopicError, MismatchedABI
 from web3.main import Web3
+from web3.types import EventData
 
 from ocean_lib.web3_internal.clef import ClefAccount
-from ocean_lib.web3_internal.contract_utils import load_contract
+from ocean_lib.web3_internal.contract_cache import get_chain_id, get_contract_cache
+from ocean_lib.web3_internal.contract_utils import (
+    get_contract_definition,
+    load_contract,
+)
+from ocean_lib.web3_internal.event_logs import iter_logs_in_chunks, resolve_block_number
+from ocean_lib.web3_internal.fee_oracle import get_fee_oracle
+from ocean_lib.web3_internal.multicall import CallBatch
+from ocean_lib.web3_internal.nonce_manager import get_nonce_manager
+from ocean_lib.web3_internal.pending_transaction import PendingTransaction
+from ocean_lib.web3_internal.utils import get_signer
+from ocean_lib.web3_internal.web3_cache import clear_web3_caches, get_web3_cache
 
 logger = logging.getLogger(__name__)
 
+_MISSING = object()
+
+
+def function_wrapper(func_name):
+    """Returns a method that calls or transacts the contract function `func_name`.
+
+    The returned function takes the `ContractBase` instance as first argument,
+    so that a single wrapper per contract class serves all instances.
 
-def function_wrapper(contract, web3, contract_functions, func_name):
-    # direct function calls
-    if hasattr(contract, func_name):
-        return getattr(contract, func_name)
+    Transactions wait for their receipt, unless `tx_dict` holds
+    `"wait_for_receipt": False`: then a `PendingTransaction` is returned as
+    soon as the transaction is sent.
+    """
 
-    # contract functions
-    def wrap(*args, **kwargs):
+    def wrap(self, *args, **kwargs):
         args2 = list(args)
 
         tx_dict = None
@@ -46,7 +69,8 @@ def function_wrapper(contract, web3, contract_functions, func_name):
                 args2 = list(args2)
                 args2[args2.index(arg)] = arg.address
 
-        func = getattr(contract_functions, func_name)
+        web3 = self.config_dict["web3_instance"]
+        func = getattr(self.contract.functions, func_name)
         result = func(*args2, **kwargs)
         func_signature = abi_to_signature(result.abi)
 
@@ -61,40 +85,105 @@ def function_wrapper(contract, web3, contract_functions, func_name):
             # if it's a transaction, build and send it
             wallet = tx_dict["from"]
             tx_dict2 = tx_dict.copy()
-            tx_dict2["nonce"] = web3.eth.get_transaction_count(wallet.address)
             tx_dict2["from"] = tx_dict["from"].address
+            wait_for_receipt = tx_dict2.pop("wait_for_receipt", True)
 
+            # cached fee estimate, instead of two node queries per transaction
+            get_fee_oracle(self.config_dict).fill_transaction(tx_dict2)
             result = result.build_transaction(tx_dict2)
 
-            # sign with wallet private key and send transaction
-            if isinstance(wallet, ClefAccount):
-                for k, v in result.items():
-                    result[k] = Web3.to_hex(v) if not isinstance(v, str) else v
+            # take the nonce only once the tx is built, so a failed gas
+            # estimation does not leave a gap in the local nonce sequence
+            nonce_manager = get_nonce_manager(web3, wallet.address)
+            if "nonce" not in result:
+                result["nonce"] = nonce_manager.next_nonce()
+
+            try:
+                # sign with wallet private key and send transaction
+                if isinstance(wallet, ClefAccount):
+                    for k, v in result.items():
+                        result[k] = Web3.to_hex(v) if not isinstance(v, str) else v
 
-                raw_signed_tx = wallet.provider.make_request(
-                    "account_signTransaction", [result, func_signature]
-                )
+                    raw_signed_tx = wallet.provider.make_request(
+                        "account_signTransaction", [result, func_signature]
+                    )
 
-                raw_signed_tx = raw_signed_tx["result"]["raw"]
-            else:
-                signed_tx = web3.eth.account.sign_transaction(
-                    result, wallet._private_key
-                )
-                raw_signed_tx = signed_tx.rawTransaction
+                    raw_signed_tx = raw_signed_tx["result"]["raw"]
+                else:
+                    signed_tx = get_signer(wallet).sign_transaction(result)
+                    raw_signed_tx = signed_tx.rawTransaction
 
-            receipt = web3.eth.send_raw_transaction(raw_signed_tx)
+                tx_hash = web3.eth.send_raw_transaction(raw_signed_tx)
+                if not wait_for_receipt:
+                    return PendingTransaction(web3, tx_hash, nonce_manager)
 
-            return web3.eth.wait_for_transaction_receipt(receipt)
+                return web3.eth.wait_for_transaction_receipt(tx_hash)
+            except Exception:
+                # the tx was not signed, or rejected, dropped or replaced:
+                # ask the node again, so its nonce does not leave a gap
+                nonce_manager.resync()
+                raise
+
+    wrap.__name__ = func_name
 
     return wrap
 
 
+def immutable_function_wrapper(func_name):
+    """Like `function_wrapper`, for view functions whose result never changes.
+
+    Results are kept in the contract cache (see `get_contract_cache`), per
+    chain, address and arguments, so the node is asked only once.
+    """
+    call = function_wrapper(func_name)
+
+    def wrap(self, *args, **kwargs):
+        if kwargs or not self.address or any(isinstance(a, dict) for a in args):
+            return call(self, *args, **kwargs)
+
+        # use addresses instead of wallets, as the call does
+        args = tuple(arg.address if hasattr(arg, "address") else arg for arg in args)
+        cache = get_contract_cache(self.config_dict)
+        chain_id = get_chain_id(self.config_dict)
+        name = f"{func_name}{list(args)}"
+
+        value = cache.get(chain_id, self.address, name, _MISSING)
+        if value is _MISSING:
+            value = call(self, *args)
+            cache.set(chain_id, self.address, name, value)
+
+        return value
+
+    wrap.__name__ = func_name
+
+    return wrap
+
+
+# contract class -> {function name: wrapper}, built once per class
+_dispatch_tables: Dict[type, Dict[str, Callable]] = {}
+_dispatch_lock = threading.Lock()
+
+# per web3: {(contract class, address, id of config dict): shared instance}
+_SHARED_CONTRACTS = "shared_contracts"
+_shared_lock = threading.Lock()
+
+# attributes of the web3 contract that were historically exposed on ContractBase
+_CONTRACT_PASSTHROUGH = ("abi", "w3")
+
+
 class ContractBase(object):
+    """Base class for all contract objects.
 
-    """Base class for all contract objects."""
+    Contract functions are not stored on the instance: they are resolved
+    lazily through a dispatch table that is built once per contract class.
+    The underlying web3 contract is only bound to the address when needed.
+    """
 
     CONTRACT_NAME = None
 
+    # view functions whose results are fixed once the contract is deployed
+    IMMUTABLE_FUNCTIONS: Tuple[str, ...] = ()
+
     @enforce_types
     def __init__(self, config_dict: dict, address: Optional[str]) -> None:
         """Initialises Contract Base object."""
@@ -104,28 +193,105 @@ class ContractBase(object):
 
         self.config_dict = config_dict
 
-        self.contract = load_contract(
-            config_dict["web3_instance"], self.contract_name, address
+        if address:
+            validate_address(address)
+            address = Web3.to_checksum_address(address)
+
+        self._address = address
+        self._contract = None
+
+    @classmethod
+    @enforce_types
+    def get_shared(cls, config_dict: dict, address: str) -> "ContractBase":
+        """Returns the instance of this class at `address` shared by all callers.
+
+        Contract objects hold no state besides their config and address, so
+        they can be reused instead of being built again for every access.
+        """
+        address = Web3.to_checksum_address(address.lower())
+        key = (cls, address, id(config_dict))
+
+        with _shared_lock:
+            shared = get_web3_cache(config_dict["web3_instance"], _SHARED_CONTRACTS)
+            if key not in shared:
+                shared[key] = cls(config_dict, address)
+
+            return shared[key]
+
+    @staticmethod
+    @enforce_types
+    def clear_shared(config_dict: Optional[dict] = None) -> None:
+        """Forgets the shared instances of this config, or all of them."""
+        with _shared_lock:
+            if config_dict is None:
+                clear_web3_caches(_SHARED_CONTRACTS)
+                return
+
+            shared = get_web3_cache(config_dict["web3_instance"], _SHARED_CONTRACTS)
+            for key in [key for key in shared if key[2] == id(config_dict)]:
+                del shared[key]
+
+    @classmethod
+    def _dispatch_table(cls) -> Dict[str, Callable]:
+        """Returns the {function name: wrapper} map for this contract class."""
+        table = _dispatch_tables.get(cls)
+        if table is not None:
+            return table
+
+        with _dispatch_lock:
+            if cls not in _dispatch_tables:
+                abi = get_contract_definition(cls.CONTRACT_NAME)["abi"]
+                _dispatch_tables[cls] = {
+                    item["name"]: cls._wrap_function(item)
+                    for item in abi
+                    if item.get("type") == "function"
+                }
+
+            return _dispatch_tables[cls]
+
+    @classmethod
+    def _wrap_function(cls, function_abi: dict) -> Callable:
+        name = function_abi["name"]
+        is_view = function_abi.get("stateMutability") in ["view", "pure"]
+
+        if is_view and name in cls.IMMUTABLE_FUNCTIONS:
+            return immutable_function_wrapper(name)
+
+        return function_wrapper(name)
+
+    def __getattr__(self, name: str):
+        # only called when normal lookup fails, so subclass methods win
+        if name.startswith("_") or not self.CONTRACT_NAME:
+            raise AttributeError(name)
+
+        func = self._dispatch_table().get(name)
+        if func is not None:
+            return MethodType(func, self)
+
+        if name in _CONTRACT_PASSTHROUGH:
+            return getattr(self.contract, name)
+
+        raise AttributeError(
+            f"'{type(self).__name__}' object has no attribute '{name}'"
         )
-        assert not address or (self.contract.address.lower() == address.lower())
-
-        transferable = [
-            x for x in dir(self.contract.functions) if not x.startswith("_")
-        ]
-
-        # transfer contract functions to ContractBase object
-        for function in transferable:
-            setattr(
-                self,
-                function,
-                function_wrapper(
-                    self.contract,
-                    config_dict["web3_instance"],
-                    self.contract.functions,
-                    function,
-                ),
+
+    def __dir__(self):
+        return sorted(set(super().__dir__()) | set(self._dispatch_table()))
+
+    @property
+    def contract(self) -> Contract:
+        """Returns the web3 contract, bound to this address on first use."""
+        if self._contract is None:
+            self._contract = load_contract(
+                self.config_dict["web3_instance"], self.contract_name, self._address
             )
 
+        return self._contract
+
+    @property
+    def address(self) -> Optional[ChecksumAddress]:
+        return self._address
+
     @enforce_types
     def __str__(self) -> str:
         """Returns contract `name @ address.`"""
@@ -137,6 +303,20 @@ class ContractBase(object):
         """Returns the contract name"""
         return self.CONTRACT_NAME
 
+    @staticmethod
+    @enforce_types
+    def batch_calls(config_dict: dict) -> CallBatch:
+        """Returns a `CallBatch`, to run many view/pure calls in one round-trip.
+
+        Usage:
+
+            with ContractBase.batch_calls(config_dict) as batch:
+                supply = batch.add(datatoken, "totalSupply")
+
+            supply.result
+        """
+        return CallBatch(config_dict)
+
     @staticmethod
     @enforce_types
     def to_checksum_address(address: str) -> ChecksumAddress:
@@ -170,24 +350,54 @@ class ContractBase(object):
         from_block: Optional[int] = 0,
         to_block: Optional[int] = "latest",
     ) -> List:
-        topic = self.get_event_signature(event_name)
-        web3 = self.config_dict["web3_instance"]
+        """Returns the decoded `event_name` events emitted in the block range."""
+        return list(self.iter_logs(event_name, from_block, to_block))
 
-        event_filter = web3.eth.filter(
-            {
-                "topics": [topic],
-                "toBlock": to_block,
-                "fromBlock": from_block,
-            }
-        )
-
-        events = []
+    @enforce_types
+    def iter_logs(
+        self,
+        event_name: str,
+        from_block: Optional[int] = 0,
+        to_block: Optional[Union[int, str]] = "latest",
+        topics: Optional[list] = None,
+    ) -> Iterator[EventData]:
+        """Yields decoded `event_name` events, fetching them chunk by chunk.
 
-        for log in event_filter.get_all_entries():
-            receipt = web3.eth.wait_for_transaction_receipt(log.transactionHash)
-            fn = getattr(self.contract.events, event_name)
-            processed_events = fn().process_receipt(receipt, errors=DISCARD)
-            for processed_event in processed_events:
-                events.append(processed_event)
+        If the config dict holds an "EVENT_INDEXER" that indexes this event,
+        blocks it has already indexed are read from it, and only the newer
+        ones from the node.
 
-        return events
+        :param topics: optional filters on the indexed arguments, i.e. the
+          topics that follow the event signature
+        """
+        topic = self.get_event_signature(event_name)
+        web3 = self.config_dict["web3_instance"]
+        event = getattr(self.contract.events, event_name)()
+
+        for log in self._iter_raw_logs(web3, topic, from_block, to_block, topics):
+            try:
+                yield event.process_log(log)
+            except (MismatchedABI, LogTopicError, InvalidEventABI):
+                # same as process_receipt(errors=DISCARD): not our event
+                continue
+
+    def _iter_raw_logs(self, web3, topic, from_block, to_block, topics):
+        from_block = resolve_block_number(web3, from_block)
+        to_block = resolve_block_number(web3, to_block)
+
+        indexer = self.config_dict.get("EVENT_INDEXER")
+        last_indexed = indexer.last_indexed_block if indexer else None
+        if last_indexed is not None and indexer.indexes(topic):
+            if indexer.covers_deployment:
+                # no events before the deployment of the Ocean contracts
+                from_block = max(from_block, indexer.start_block)
+
+            indexed_to = min(to_block, last_indexed)
+            if indexer.start_block <= from_block <= indexed_to:
+                yield from indexer.iter_raw_logs(topic, from_block, indexed_to, topics)
+                from_block = indexed_to + 1
+
+        if from_block <= to_block:
+            yield from iter_logs_in_chunks(
+                web3, {"topics": [topic] + (topics or [])}, from_block, to_block
+            )
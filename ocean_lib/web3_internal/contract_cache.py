@@ -0,0 +1,155 @@
+#
+# Copyright 2023 Ocean Protocol Foundation
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Values that never change for a deployed contract, kept per chain and address."""
+import atexit
+import json
+import logging
+import os
+import threading
+import weakref
+from typing import Any, Dict, Optional
+
+from enforce_typing import enforce_types
+from web3.main import Web3
+
+logger = logging.getLogger(__name__)
+
+# only these are written to disk, to round-trip exactly through JSON
+_PERSISTED_TYPES = (bool, int, str)
+
+# seconds new values wait before the file is written, to save them together
+SAVE_DELAY = 1.0
+
+_caches_lock = threading.Lock()
+_caches: Dict[Optional[str], "ContractCache"] = {}
+
+# caches with values not saved yet, saved at exit at the latest
+_unsaved: "weakref.WeakSet[ContractCache]" = weakref.WeakSet()
+
+_chain_ids_lock = threading.Lock()
+_chain_ids: "weakref.WeakKeyDictionary[Web3, int]" = weakref.WeakKeyDictionary()
+
+
+class ContractCache:
+    """Thread-safe store of immutable contract values.
+
+    Values are keyed by chain id, contract address and a name, e.g. the
+    function call that returned them. If `path` is given, they are also
+    saved to that JSON file, and loaded from it on the next run. New values
+    are written together, `SAVE_DELAY` seconds after the first of them, or
+    at exit; call `save` to write them right away.
+    """
+
+    @enforce_types
+    def __init__(self, path: Optional[str] = None) -> None:
+        self.path = os.path.expanduser(path) if path else None
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._values: Dict[str, Any] = {}
+        self._save_timer = None
+
+        if self.path and os.path.exists(self.path):
+            try:
+                with open(self.path) as f:
+                    self._values = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable contract cache {self.path}: {e}")
+
+    @staticmethod
+    def _key(chain_id: int, address: str, name: str) -> str:
+        return f"{chain_id}:{address.lower()}:{name}"
+
+    def get(self, chain_id: int, address: str, name: str, default: Any = None) -> Any:
+        with self._lock:
+            return self._values.get(self._key(chain_id, address, name), default)
+
+    def set(self, chain_id: int, address: str, name: str, value: Any) -> None:
+        with self._lock:
+            self._values[self._key(chain_id, address, name)] = value
+
+            if self.path and isinstance(value, _PERSISTED_TYPES):
+                self._schedule_save()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+        if self.path:
+            self.save()
+
+    def _schedule_save(self) -> None:
+        if self._save_timer is None:
+            _unsaved.add(self)
+            self._save_timer = threading.Timer(SAVE_DELAY, self.save)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+
+    def save(self) -> None:
+        """Writes the values to the cache file now."""
+        if not self.path:
+            return
+
+        # one write at a time, of the values at the time it starts
+        with self._save_lock:
+            with self._lock:
+                if self._save_timer is not None:
+                    self._save_timer.cancel()
+                    self._save_timer = None
+                _unsaved.discard(self)
+
+                persisted = {
+                    key: value
+                    for key, value in self._values.items()
+                    if isinstance(value, _PERSISTED_TYPES)
+                }
+
+            # write to a temporary file first, so readers never see half a file
+            tmp_path = f"{self.path}.tmp"
+            try:
+                with open(tmp_path, "w") as f:
+                    json.dump(persisted, f)
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                logger.warning(f"Could not save contract cache {self.path}: {e}")
+
+
+@atexit.register
+def _save_all() -> None:
+    for cache in list(_unsaved):
+        cache.save()
+
+
+@enforce_types
+def get_contract_cache(config_dict: dict) -> ContractCache:
+    """Returns the contract cache for this config.
+
+    A `ContractCache` put in the config dict as "CONTRACT_CACHE" is used as
+    is. Otherwise the cache is shared per "CONTRACT_CACHE_PATH" (in memory
+    only if that key is not set).
+    """
+    cache = config_dict.get("CONTRACT_CACHE")
+    if cache is not None:
+        return cache
+
+    path = config_dict.get("CONTRACT_CACHE_PATH")
+    with _caches_lock:
+        if path not in _caches:
+            _caches[path] = ContractCache(path)
+
+        return _caches[path]
+
+
+@enforce_types
+def get_chain_id(config_dict: dict) -> int:
+    """Returns "CHAIN_ID" from the config, or asks the node once per web3."""
+    if config_dict.get("CHAIN_ID") is not None:
+        return config_dict["CHAIN_ID"]
+
+    web3 = config_dict["web3_instance"]
+    with _chain_ids_lock:
+        if web3 not in _chain_ids:
+            _chain_ids[web3] = web3.eth.chain_id
+
+        return _chain_ids[web3]
@@ -2,57 +2,170 @@
 # Copyright 2023 Ocean Protocol Foundation
 # SPDX-License-Identifier: Apache-2.0
 #
+import copy
 import json
 import logging
 import os
+import threading
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Type
 
 from enforce_typing import enforce_types
 from web3.contract import Contract
 from web3.main import Web3
 
 import artifacts  # noqa
+from ocean_lib.web3_internal.web3_cache import clear_web3_caches, get_web3_cache
 
 logger = logging.getLogger(__name__)
 GANACHE_URL = "http://127.0.0.1:8545"
 
 
+# Process-wide registry: artifacts are parsed once per contract name and
+# contract factories are built once per (web3 instance, contract name).
+_registry_lock = threading.RLock()
+_contract_definitions: Dict[str, Dict[str, Any]] = {}
+_CONTRACT_FACTORIES = "contract_factories"
+
+
 @enforce_types
 def get_contract_definition(contract_name: str) -> Dict[str, Any]:
-    """Returns the abi JSON for a contract name."""
-    path = os.path.join(artifacts.__file__, "..", f"{contract_name}.json")
-    path = Path(path).expanduser().resolve()
+    """Returns the abi JSON for a contract name.
+
+    The artifact is read from disk only on the first call for a given name.
+    The returned dict is shared, so callers must not mutate it.
+    """
+    definition = _contract_definitions.get(contract_name)
+    if definition is not None:
+        return definition
+
+    with _registry_lock:
+        if contract_name not in _contract_definitions:
+            path = os.path.join(artifacts.__file__, "..", f"{contract_name}.json")
+            path = Path(path).expanduser().resolve()
+
+            if not path.exists():
+                raise TypeError("Contract name does not exist in artifacts.")
+
+            with open(path) as f:
+                _contract_definitions[contract_name] = json.load(f)
+
+        return _contract_definitions[contract_name]
+
+
+@enforce_types
+def get_contract_factory(web3: Web3, contract_name: str) -> Type[Contract]:
+    """Returns the cached web3 contract factory for a contract name."""
+    factories = get_web3_cache(web3, _CONTRACT_FACTORIES)
+    if contract_name in factories:
+        return factories[contract_name]
+
+    with _registry_lock:
+        if contract_name not in factories:
+            contract_definition = get_contract_definition(contract_name)
+            factories[contract_name] = web3.eth.contract(
+                abi=contract_definition["abi"],
+                bytecode=contract_definition["bytecode"],
+            )
+
+        return factories[contract_name]
 
-    if not path.exists():
-        raise TypeError("Contract name does not exist in artifacts.")
 
-    with open(path) as f:
-        return json.load(f)
+def clear_contract_registry() -> None:
+    """Drops all cached artifacts and contract factories."""
+    with _registry_lock:
+        _contract_definitions.clear()
+        clear_web3_caches(_CONTRACT_FACTORIES)
 
 
 @enforce_types
 def load_contract(web3: Web3, contract_name: str, address: Optional[str]) -> Contract:
     """Loads a contract using its name and address."""
-    contract_definition = get_contract_definition(contract_name)
-    abi = contract_definition["abi"]
-    bytecode = contract_definition["bytecode"]
+    factory = get_contract_factory(web3, contract_name)
+
+    return factory(address=address) if address else factory
+
+
+class AddressBook:
+    """Contract addresses of all networks, as listed in an address file.
+
+    The file is parsed, and its addresses checksummed, only when it changed
+    since the last lookup (by modification time and size). The returned
+    dicts are shared, so callers must not mutate them.
+    """
+
+    @enforce_types
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._stamp = None
+        self._all_networks: Dict[str, Any] = {}
+        self._networks: Dict[str, Dict[str, Any]] = {}
+
+    def _refresh(self) -> None:
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            raise Exception(f"Could not find address_file={self.path}.")
 
-    return web3.eth.contract(address=address, abi=abi, bytecode=bytecode)
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        if stamp == self._stamp:
+            return
+
+        with self._lock:
+            if stamp == self._stamp:
+                return
+
+            with open(self.path) as f:
+                all_networks = json.load(f)
+
+            self._networks = {
+                name: _checksum_contract_addresses(copy.deepcopy(addresses))
+                for name, addresses in all_networks.items()
+                if isinstance(addresses, dict)
+            }
+            self._all_networks = all_networks
+            self._stamp = stamp
+
+    def all_networks(self) -> Dict[str, Any]:
+        """Returns the address file content, as is."""
+        self._refresh()
+        return self._all_networks
+
+    def network(self, network_name: str) -> Optional[Dict[str, Any]]:
+        """Returns the checksummed addresses of a network, or None."""
+        self._refresh()
+        return self._networks.get(network_name)
+
+
+_address_books_lock = threading.Lock()
+_address_books: Dict[str, AddressBook] = {}
 
 
 @enforce_types
-def get_contracts_addresses_all_networks(config: dict):
-    """Get addresses, across *all* networks, from info in ADDRESS_FILE"""
+def get_address_book(config: dict) -> AddressBook:
+    """Returns the shared AddressBook for the ADDRESS_FILE of this config."""
     address_file = config.get("ADDRESS_FILE")
     address_file = os.path.expanduser(address_file) if address_file else None
 
-    if not address_file or not os.path.exists(address_file):
+    if not address_file:
         raise Exception(f"Could not find address_file={address_file}.")
-    with open(address_file) as f:
-        addresses = json.load(f)
 
-    return addresses
+    address_book = _address_books.get(address_file)
+    if address_book is not None:
+        return address_book
+
+    with _address_books_lock:
+        if address_file not in _address_books:
+            _address_books[address_file] = AddressBook(address_file)
+
+        return _address_books[address_file]
+
+
+@enforce_types
+def get_contracts_addresses_all_networks(config: dict):
+    """Get addresses, across *all* networks, from info in ADDRESS_FILE"""
+    return get_address_book(config).all_networks()
 
 
 @enforce_types
@@ -60,18 +173,16 @@ def get_contracts_addresses(config: dict) -> Optional[Dict[str, str]]:
     """Get addresses for given NETWORK_NAME, from info in ADDRESS_FILE"""
     network_name = config["NETWORK_NAME"]
 
-    addresses = get_contracts_addresses_all_networks(config)
+    network_addresses = get_address_book(config).network(network_name)
 
-    network_addresses = [val for key, val in addresses.items() if key == network_name]
-
-    if not network_addresses:
+    if network_addresses is None:
         address_file = config.get("ADDRESS_FILE")
         raise Exception(
             f"Address not found for network_name={network_name}."
             f" Please check your address_file={address_file}."
         )
 
-    return _checksum_contract_addresses(network_addresses=network_addresses[0])
+    return network_addresses
 
 
 @enforce_types
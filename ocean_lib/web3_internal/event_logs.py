@@ -0,0 +1,81 @@
+#
+# Copyright 2023 Ocean Protocol Foundation
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Fetching raw logs with eth_getLogs, over adaptively sized block ranges."""
+import logging
+from typing import Iterator, Optional, Union
+
+from web3.main import Web3
+from web3.types import LogReceipt
+
+logger = logging.getLogger(__name__)
+
+# largest block range asked for in one eth_getLogs; shrunk on demand
+MAX_LOGS_CHUNK_SIZE = 100_000
+
+# substrings of node errors that mean "ask for a smaller range"
+_TOO_MANY_RESULTS_MARKERS = (
+    "-32005",
+    "too many",
+    "more than",
+    "limit exceeded",
+    "block range",
+    "range is too large",
+    "response size",
+    "query timeout",
+)
+
+
+def is_too_many_results_error(error: Exception) -> bool:
+    message = str(error).lower()
+    return any(marker in message for marker in _TOO_MANY_RESULTS_MARKERS)
+
+
+def resolve_block_number(web3: Web3, block: Union[int, str, None]) -> int:
+    if block is None or block == "earliest":
+        return 0
+
+    if isinstance(block, int):
+        return block
+
+    return web3.eth.get_block(block).number
+
+
+def iter_logs_in_chunks(
+    web3: Web3,
+    filter_params: dict,
+    from_block: Union[int, str, None] = 0,
+    to_block: Union[int, str, None] = "latest",
+    chunk_size: Optional[int] = None,
+) -> Iterator[LogReceipt]:
+    """Yields raw logs matching `filter_params`, from oldest to newest.
+
+    The range is queried in chunks of at most `chunk_size` blocks. A chunk is
+    halved whenever the node rejects it as too large, and doubled again
+    after each successful request, so that a dense stretch of blocks does
+    not slow down the rest of the range.
+    """
+    start = resolve_block_number(web3, from_block)
+    end = resolve_block_number(web3, to_block)
+    max_size = chunk_size or MAX_LOGS_CHUNK_SIZE
+    size = max_size
+
+    while start <= end:
+        chunk_end = min(start + size - 1, end)
+        params = dict(filter_params, fromBlock=start, toBlock=chunk_end)
+
+        try:
+            logs = web3.eth.get_logs(params)
+        except Exception as e:
+            if chunk_end == start or not is_too_many_results_error(e):
+                raise
+
+            size = max(1, (chunk_end - start + 1) // 2)
+            logger.debug(f"eth_getLogs range too large, retrying with {size}: {e}")
+            continue
+
+        yield from logs
+
+        start = chunk_end + 1
+        size = min(size * 2, max_size)
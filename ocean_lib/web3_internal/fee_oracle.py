@@ -0,0 +1,350 @@
+#
+# Copyright 2023 Ocean Protocol Foundation
+# SPDX-License-Identifier: Apache-2.0
+#
+"""EIP-1559 fee estimation from eth_feeHistory, cached for a short time."""
+import asyncio
+import logging
+import threading
+import time
+from collections import namedtuple
+from typing import Optional, Tuple, Union
+
+import requests
+from enforce_typing import enforce_types
+from web3.exceptions import MethodUnavailable
+from web3.main import AsyncWeb3, Web3
+
+from ocean_lib.web3_internal.web3_cache import get_web3_cache
+
+logger = logging.getLogger(__name__)
+
+FeeEstimate = namedtuple("FeeEstimate", ("base_fee", "max_priority_fee", "max_fee"))
+
+# strategy -> percentile of the priority fees paid in recent blocks
+FEE_STRATEGIES = {
+    "economy": 10,
+    "standard": 50,
+    "fast": 90,
+}
+DEFAULT_FEE_STRATEGY = "standard"
+
+# strategy -> key in the response of a Polygon gas station (v2) style source
+_REMOTE_STRATEGY_KEYS = {
+    "economy": "safeLow",
+    "standard": "standard",
+    "fast": "fast",
+}
+
+# blocks of history used for the estimate
+FEE_HISTORY_BLOCKS = 10
+
+# seconds an estimate is reused; about one block on most chains
+DEFAULT_FEE_TTL = 10
+
+# same lower bound as web3's own priority fee estimate
+MIN_PRIORITY_FEE = Web3.to_wei(1, "gwei")
+
+_remote_lock = threading.Lock()
+_remote_fees: dict = {}  # url -> (fetched at, estimates)
+
+_oracles_lock = threading.Lock()
+
+
+def _average_nonzero(values: list) -> int:
+    values = [value for value in values if value]
+    return sum(values) // len(values) if values else 0
+
+
+def _estimates_from_history(history: dict) -> Optional[dict]:
+    """Returns the estimates of all strategies from an eth_feeHistory result."""
+    # the last entry is the base fee of the next block
+    base_fee = history["baseFeePerGas"][-1] if history["baseFeePerGas"] else 0
+    if not base_fee:
+        return None
+
+    rewards = history.get("reward") or []
+    estimates = {}
+
+    for i, strategy in enumerate(FEE_STRATEGIES):
+        priority_fee = max(
+            _average_nonzero([reward[i] for reward in rewards]), MIN_PRIORITY_FEE
+        )
+        estimates[strategy] = FeeEstimate(
+            base_fee, priority_fee, 2 * base_fee + priority_fee
+        )
+
+    return estimates
+
+
+def _is_method_not_found(error: Exception) -> bool:
+    """Tells whether a node rejected a JSON-RPC method as unknown."""
+    if isinstance(error, MethodUnavailable):
+        return True
+
+    details = error.args[0] if error.args else None
+    if isinstance(details, dict) and details.get("code") == -32601:
+        return True
+
+    message = str(error).lower()
+    return "method not found" in message or "does not exist" in message
+
+
+class FeeOracle:
+    """Estimates `maxPriorityFeePerGas` and `maxFeePerGas` for one chain.
+
+    Priority fees are the average of a percentile of the rewards paid in the
+    last `FEE_HISTORY_BLOCKS` blocks, the percentile depending on the
+    strategy (see `FEE_STRATEGIES`). The max fee leaves room for the base
+    fee to double, like web3 does by default.
+
+    One `eth_feeHistory` call serves all strategies, and its result is
+    reused for `ttl` seconds. If `remote_url` is set (a Polygon gas station
+    v2 compatible endpoint), it is asked first, and the local estimate is
+    only used when it fails.
+
+    Returns None for chains without EIP-1559, so that callers can fall back
+    to a legacy gas price.
+    """
+
+    @enforce_types
+    def __init__(
+        self,
+        web3: Web3,
+        strategy: str = DEFAULT_FEE_STRATEGY,
+        ttl: Union[int, float] = DEFAULT_FEE_TTL,
+        remote_url: Optional[str] = None,
+    ) -> None:
+        self._check_strategy(strategy)
+
+        self.web3 = web3
+        self.strategy = strategy
+        self.ttl = ttl
+        self.remote_url = remote_url
+        self._lock = threading.Lock()
+        self._fetch_lock = threading.Lock()
+        self._cached = None
+        self._cached_at = None
+        self._has_fee_history = True
+
+    @staticmethod
+    def _check_strategy(strategy: str) -> None:
+        if strategy not in FEE_STRATEGIES:
+            raise ValueError(
+                f"Unknown fee strategy {strategy}, use one of {list(FEE_STRATEGIES)}."
+            )
+
+    @enforce_types
+    def get_fees(self, strategy: Optional[str] = None) -> Optional[FeeEstimate]:
+        """Returns the fee estimate for `strategy`, or the oracle's default."""
+        strategy = strategy or self.strategy
+        self._check_strategy(strategy)
+
+        estimates = self._get_estimates()
+
+        return estimates.get(strategy) if estimates else None
+
+    @enforce_types
+    def fill_transaction(self, tx: dict, strategy: Optional[str] = None) -> dict:
+        """Sets the EIP-1559 fee fields of `tx`, unless it already has fees."""
+        fee_keys = ("gasPrice", "maxFeePerGas", "maxPriorityFeePerGas")
+        if any(key in tx for key in fee_keys):
+            return tx
+
+        fees = self.get_fees(strategy)
+        if fees:
+            tx["maxPriorityFeePerGas"] = fees.max_priority_fee
+            tx["maxFeePerGas"] = fees.max_fee
+
+        return tx
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._cached = None
+            self._cached_at = None
+
+    def _get_cached(self) -> Tuple[bool, Optional[dict]]:
+        with self._lock:
+            fresh = (
+                self._cached_at is not None
+                and time.monotonic() - self._cached_at < self.ttl
+            )
+            return fresh, self._cached
+
+    def _get_estimates(self) -> Optional[dict]:
+        fresh, estimates = self._get_cached()
+        if fresh:
+            return estimates
+
+        # one fetch at a time: callers arriving meanwhile wait for its result
+        with self._fetch_lock:
+            fresh, estimates = self._get_cached()
+            if fresh:
+                return estimates
+
+            estimates = None
+            if self.remote_url:
+                estimates = self._fetch_remote()
+            if estimates is None:
+                estimates = self._fetch_fee_history()
+
+            with self._lock:
+                self._cached = estimates
+                self._cached_at = time.monotonic()
+
+            return estimates
+
+    def _fetch_fee_history(self) -> Optional[dict]:
+        if not self._has_fee_history:
+            return self._fetch_latest_block()
+
+        percentiles = list(FEE_STRATEGIES.values())
+
+        try:
+            history = self.web3.eth.fee_history(
+                FEE_HISTORY_BLOCKS, "latest", percentiles
+            )
+        except Exception as e:
+            # not implemented by the node: don't ask again
+            if _is_method_not_found(e):
+                self._has_fee_history = False
+            logger.debug(f"eth_feeHistory failed, using latest block: {e}")
+            return self._fetch_latest_block()
+
+        return _estimates_from_history(history)
+
+    def _fetch_latest_block(self) -> Optional[dict]:
+        """Fallback for nodes without eth_feeHistory: same fees for all."""
+        base_fee = self.web3.eth.get_block("latest").get("baseFeePerGas")
+        if base_fee is None:
+            return None
+
+        priority_fee = self.web3.eth.max_priority_fee
+        estimate = FeeEstimate(base_fee, priority_fee, 2 * base_fee + priority_fee)
+
+        return {strategy: estimate for strategy in FEE_STRATEGIES}
+
+    def _fetch_remote(self) -> Optional[dict]:
+        try:
+            return get_remote_fees(self.remote_url)
+        except Exception as e:
+            logger.warning(f"Fee source {self.remote_url} failed: {e}")
+            return None
+
+
+class AsyncFeeOracle:
+    """Like `FeeOracle`, for an `AsyncWeb3` instance.
+
+    Uses `eth_feeHistory` only; when it fails, `fill_transaction` leaves the
+    fees to web3.
+    """
+
+    def __init__(
+        self,
+        web3: AsyncWeb3,
+        strategy: str = DEFAULT_FEE_STRATEGY,
+        ttl: Union[int, float] = DEFAULT_FEE_TTL,
+    ) -> None:
+        FeeOracle._check_strategy(strategy)
+
+        self.web3 = web3
+        self.strategy = strategy
+        self.ttl = ttl
+        self._lock = None
+        self._cached = None
+        self._cached_at = 0.0
+
+    async def get_fees(self, strategy: Optional[str] = None) -> Optional[FeeEstimate]:
+        strategy = strategy or self.strategy
+        FeeOracle._check_strategy(strategy)
+
+        # created here, to belong to the running event loop
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            if self._cached is None or time.monotonic() - self._cached_at >= self.ttl:
+                try:
+                    history = await self.web3.eth.fee_history(
+                        FEE_HISTORY_BLOCKS, "latest", list(FEE_STRATEGIES.values())
+                    )
+                    self._cached = _estimates_from_history(history) or {}
+                except Exception as e:
+                    logger.debug(f"eth_feeHistory failed: {e}")
+                    self._cached = {}
+
+                self._cached_at = time.monotonic()
+
+            return self._cached.get(strategy)
+
+    async def fill_transaction(self, tx: dict, strategy: Optional[str] = None) -> dict:
+        """Sets the EIP-1559 fee fields of `tx`, unless it already has fees."""
+        fee_keys = ("gasPrice", "maxFeePerGas", "maxPriorityFeePerGas")
+        if any(key in tx for key in fee_keys):
+            return tx
+
+        fees = await self.get_fees(strategy)
+        if fees:
+            tx["maxPriorityFeePerGas"] = fees.max_priority_fee
+            tx["maxFeePerGas"] = fees.max_fee
+
+        return tx
+
+
+@enforce_types
+def get_remote_fees(url: str) -> dict:
+    """Reads fee estimates from a Polygon gas station (v2) compatible source."""
+    response = requests.get(url, timeout=10)
+    response.raise_for_status()
+    data = response.json()
+
+    base_fee = data.get("estimatedBaseFee")
+    base_fee = Web3.to_wei(base_fee, "gwei") if base_fee is not None else None
+
+    return {
+        strategy: FeeEstimate(
+            base_fee,
+            Web3.to_wei(data[key]["maxPriorityFee"], "gwei"),
+            Web3.to_wei(data[key]["maxFee"], "gwei"),
+        )
+        for strategy, key in _REMOTE_STRATEGY_KEYS.items()
+    }
+
+
+@enforce_types
+def get_cached_remote_fees(url: str, ttl: Union[int, float] = DEFAULT_FEE_TTL) -> dict:
+    """Like `get_remote_fees`, but reuses a response for `ttl` seconds."""
+    with _remote_lock:
+        fetched_at, estimates = _remote_fees.get(url, (0.0, None))
+        if estimates is None or time.monotonic() - fetched_at >= ttl:
+            estimates = get_remote_fees(url)
+            _remote_fees[url] = (time.monotonic(), estimates)
+
+        return estimates
+
+
+@enforce_types
+def get_fee_oracle(config_dict: dict) -> FeeOracle:
+    """Returns the fee oracle for this config.
+
+    A `FeeOracle` put in the config dict as "FEE_ORACLE" is used as is.
+    Otherwise one oracle is shared per web3 instance, set up from the
+    optional "GAS_FEE_STRATEGY" and "GAS_STATION_URL" config keys when it
+    is first created.
+    """
+    oracle = config_dict.get("FEE_ORACLE")
+    if oracle is not None:
+        return oracle
+
+    web3 = config_dict["web3_instance"]
+
+    with _oracles_lock:
+        oracles = get_web3_cache(web3, "fee_oracles")
+        if "default" not in oracles:
+            oracles["default"] = FeeOracle(
+                web3,
+                strategy=config_dict.get("GAS_FEE_STRATEGY", DEFAULT_FEE_STRATEGY),
+                remote_url=config_dict.get("GAS_STATION_URL"),
+            )
+
+        return oracles["default"]
@@ -2,7 +2,11 @@
 # Copyright 2023 Ocean Protocol Foundation
 # SPDX-License-Identifier: Apache-2.0
 #
+from typing import Any, Callable, List, Optional, Tuple
+
+from eth_utils import to_bytes
 from web3 import HTTPProvider, WebsocketProvider
+from web3._utils.encoding import FriendlyJsonSerde, Web3JsonEncoder
 
 from ocean_lib.web3_internal.request import make_post_request
 
@@ -19,6 +23,105 @@ SUPPORTED_NETWORK_NAMES = {
 }
 
 
+# many nodes cap the number of calls in one JSON-RPC batch
+DEFAULT_MAX_BATCH_SIZE = 100
+
+_UNSET = object()
+
+
+def hex_to_int(value: str) -> int:
+    """Formatter for quantities, e.g. the result of eth_getBalance."""
+    return int(value, 16)
+
+
+class BatchedRequest:
+    """The future response of one request queued in a `RequestBatch`."""
+
+    def __init__(
+        self, method: str, params: Any, formatter: Optional[Callable] = None
+    ) -> None:
+        self.method = method
+        self.params = params
+        self.formatter = formatter
+        self.response = None
+        self._result = _UNSET
+
+    def _set_response(self, response: dict) -> None:
+        self.response = response
+        if "error" not in response:
+            result = response.get("result")
+            self._result = self.formatter(result) if self.formatter else result
+
+    def done(self) -> bool:
+        return self.response is not None
+
+    @property
+    def result(self) -> Any:
+        """The `result` field of the response, passed through `formatter`."""
+        if self.response is None:
+            raise ValueError("Batch has not been sent yet.")
+
+        if "error" in self.response:
+            raise ValueError(self.response["error"])
+
+        return self._result
+
+
+class RequestBatch:
+    """Queues JSON-RPC requests and sends them as batches, on `execute()`.
+
+    Responses are matched back to their requests by id. Requests are split
+    into HTTP calls of at most `max_batch_size` entries.
+
+    Usage:
+
+        with web3.provider.batch_requests() as batch:
+            balances = [
+                batch.add("eth_getBalance", [addr, "latest"], hex_to_int)
+                for addr in addresses
+            ]
+
+        [b.result for b in balances]
+    """
+
+    def __init__(
+        self,
+        provider: "CustomHTTPProvider",
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+    ) -> None:
+        self.provider = provider
+        self.max_batch_size = max_batch_size
+        self.requests: List[BatchedRequest] = []
+
+    def add(
+        self, method: str, params: Any, formatter: Optional[Callable] = None
+    ) -> BatchedRequest:
+        request = BatchedRequest(method, params, formatter)
+        self.requests.append(request)
+
+        return request
+
+    def execute(self) -> List[BatchedRequest]:
+        pending = [request for request in self.requests if not request.done()]
+
+        for i in range(0, len(pending), self.max_batch_size):
+            chunk = pending[i : i + self.max_batch_size]
+            responses = self.provider.make_batch_request(
+                [(request.method, request.params) for request in chunk]
+            )
+            for request, response in zip(chunk, responses):
+                request._set_response(response)
+
+        return self.requests
+
+    def __enter__(self) -> "RequestBatch":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.execute()
+
+
 class CustomHTTPProvider(HTTPProvider):
     """
     Override requests to control the connection pool to make it blocking.
@@ -41,6 +144,49 @@ class CustomHTTPProvider(HTTPProvider):
         )
         return response
 
+    def make_batch_request(self, requests: List[Tuple[str, Any]]) -> List[dict]:
+        """Sends `(method, params)` pairs as one JSON-RPC batch.
+
+        Returns the responses in the order of `requests`.
+        """
+        if not requests:
+            return []
+
+        ids = [next(self.request_counter) for _ in requests]
+        batch = [
+            {"jsonrpc": "2.0", "method": method, "params": params or [], "id": id_}
+            for id_, (method, params) in zip(ids, requests)
+        ]
+        self.logger.debug(
+            "Making batch request HTTP. URI: %s, Size: %s",
+            self.endpoint_uri,
+            len(batch),
+        )
+        request_data = to_bytes(
+            text=FriendlyJsonSerde().json_encode(batch, Web3JsonEncoder)
+        )
+        raw_response = make_post_request(
+            self.endpoint_uri, request_data, **self.get_request_kwargs()
+        )
+        responses = self.decode_rpc_response(raw_response)
+
+        # a batch of one may come back unwrapped
+        if isinstance(responses, dict):
+            responses = [responses]
+
+        by_id = {response.get("id"): response for response in responses}
+
+        return [
+            by_id.get(id_, {"error": {"message": "Missing batch response."}})
+            for id_ in ids
+        ]
+
+    def batch_requests(
+        self, max_batch_size: int = DEFAULT_MAX_BATCH_SIZE
+    ) -> RequestBatch:
+        """Returns a `RequestBatch` scope, sent as one JSON-RPC batch on exit."""
+        return RequestBatch(self, max_batch_size)
+
 
 def get_web3_connection_provider(network_url):
     if network_url.startswith("http"):
@@ -0,0 +1,239 @@
+#
+# Copyright 2023 Ocean Protocol Foundation
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Batching of view/pure contract calls into a single round-trip."""
+import itertools
+import logging
+import threading
+import weakref
+from typing import Any, List, Optional
+
+from eth_abi.exceptions import DecodingError
+from hexbytes import HexBytes
+from web3._utils.abi import get_abi_output_types, map_abi_data
+from web3._utils.normalizers import BASE_RETURN_NORMALIZERS
+from web3.exceptions import BadFunctionCallOutput, ContractLogicError
+from web3.main import Web3
+
+from ocean_lib.web3_internal.http_provider import CustomHTTPProvider
+
+logger = logging.getLogger(__name__)
+
+# Multicall3 is deployed at the same address on most EVM chains.
+# Override with "MULTICALL_ADDRESS" in the config dict.
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+MULTICALL3_ABI = [
+    {
+        "inputs": [
+            {
+                "components": [
+                    {"internalType": "address", "name": "target", "type": "address"},
+                    {"internalType": "bool", "name": "allowFailure", "type": "bool"},
+                    {"internalType": "bytes", "name": "callData", "type": "bytes"},
+                ],
+                "internalType": "struct Multicall3.Call3[]",
+                "name": "calls",
+                "type": "tuple[]",
+            }
+        ],
+        "name": "aggregate3",
+        "outputs": [
+            {
+                "components": [
+                    {"internalType": "bool", "name": "success", "type": "bool"},
+                    {"internalType": "bytes", "name": "returnData", "type": "bytes"},
+                ],
+                "internalType": "struct Multicall3.Result[]",
+                "name": "returnData",
+                "type": "tuple[]",
+            }
+        ],
+        "stateMutability": "payable",
+        "type": "function",
+    }
+]
+
+# max calls per aggregate3, to stay below node gas/size limits for eth_call
+MULTICALL_CHUNK_SIZE = 500
+
+_multicall_lock = threading.Lock()
+_multicall_addresses: "weakref.WeakKeyDictionary[Web3, dict]" = (
+    weakref.WeakKeyDictionary()
+)
+
+_UNSET = object()
+
+
+def get_multicall_address(config_dict: dict) -> Optional[str]:
+    """Returns the Multicall3 address if it is deployed on this chain, else None.
+
+    The on-chain check is done once per web3 instance and address.
+    """
+    web3 = config_dict["web3_instance"]
+    address = Web3.to_checksum_address(
+        config_dict.get("MULTICALL_ADDRESS", MULTICALL3_ADDRESS).lower()
+    )
+
+    with _multicall_lock:
+        known = _multicall_addresses.setdefault(web3, {})
+        if address not in known:
+            try:
+                known[address] = len(web3.eth.get_code(address)) > 0
+            except Exception as e:
+                logger.debug(f"Could not check multicall at {address}: {e}")
+                known[address] = False
+
+        return address if known[address] else None
+
+
+class BatchedCall:
+    """The future result of one view/pure function call in a `CallBatch`."""
+
+    def __init__(self, contract_function) -> None:
+        self.function = contract_function
+        self._result = _UNSET
+        self._error = None
+
+    @property
+    def call_dict(self) -> dict:
+        return {
+            "to": self.function.address,
+            "data": self.function._encode_transaction_data(),
+        }
+
+    def _set_return_data(self, return_data: bytes) -> None:
+        fn = self.function
+        output_types = get_abi_output_types(fn.abi)
+        try:
+            output_data = fn.w3.codec.decode(output_types, HexBytes(return_data))
+        except DecodingError as e:
+            # e.g. no code at the address: fails this call only, like a revert
+            self._set_error(
+                BadFunctionCallOutput(
+                    f"Could not decode {fn.fn_name} return data "
+                    f"{HexBytes(return_data).hex()}, output types {output_types}: {e}"
+                )
+            )
+            return
+
+        normalizers = itertools.chain(
+            BASE_RETURN_NORMALIZERS, fn._return_data_normalizers or ()
+        )
+        normalized_data = map_abi_data(normalizers, output_types, output_data)
+
+        # same shape as ContractFunction.call()
+        self._result = (
+            normalized_data[0] if len(normalized_data) == 1 else normalized_data
+        )
+
+    def _set_error(self, error: Exception) -> None:
+        self._error = error
+
+    def done(self) -> bool:
+        return self._result is not _UNSET or self._error is not None
+
+    @property
+    def result(self) -> Any:
+        """The decoded return value, like a direct call would return it."""
+        if self._error is not None:
+            raise self._error
+
+        if self._result is _UNSET:
+            raise ValueError("Batch has not been executed yet.")
+
+        return self._result
+
+
+class CallBatch:
+    """Collects view/pure contract calls and runs them in one round-trip.
+
+    Calls are aggregated into a Multicall3 `eth_call` when the contract is
+    deployed on the chain; otherwise they are sent as one JSON-RPC batch,
+    or one by one if the provider is not HTTP.
+
+    Usage:
+
+        with CallBatch(config_dict) as batch:
+            active = [batch.add(FRE, "isActive", id_) for id_ in exchange_ids]
+
+        [call.result for call in active]
+    """
+
+    def __init__(self, config_dict: dict) -> None:
+        self.config_dict = config_dict
+        self.web3 = config_dict["web3_instance"]
+        self.calls: List[BatchedCall] = []
+
+    def add(self, contract, func_name: str, *args) -> BatchedCall:
+        """Queues `contract.func_name(*args)`, where `contract` is a ContractBase."""
+        # use addresses instead of wallets when doing the call
+        args = [arg.address if hasattr(arg, "address") else arg for arg in args]
+        function = getattr(contract.contract.functions, func_name)(*args)
+
+        if function.abi["stateMutability"] not in ["view", "pure"]:
+            raise ValueError(f"{func_name} is not a view/pure function.")
+
+        call = BatchedCall(function)
+        self.calls.append(call)
+
+        return call
+
+    def execute(self) -> List[Any]:
+        """Runs all queued calls and returns their results, in order."""
+        pending = [call for call in self.calls if not call.done()]
+
+        if pending:
+            multicall_address = get_multicall_address(self.config_dict)
+            if multicall_address:
+                self._execute_multicall(multicall_address, pending)
+            elif isinstance(self.web3.provider, CustomHTTPProvider):
+                self._execute_json_rpc_batch(pending)
+            else:
+                self._execute_sequential(pending)
+
+        return [call.result for call in self.calls]
+
+    def _execute_multicall(self, address: str, calls: List[BatchedCall]) -> None:
+        multicall = self.web3.eth.contract(address=address, abi=MULTICALL3_ABI)
+
+        for i in range(0, len(calls), MULTICALL_CHUNK_SIZE):
+            chunk = calls[i : i + MULTICALL_CHUNK_SIZE]
+            results = multicall.functions.aggregate3(
+                [(c.call_dict["to"], True, c.call_dict["data"]) for c in chunk]
+            ).call()
+
+            for call, (success, return_data) in zip(chunk, results):
+                if success:
+                    call._set_return_data(return_data)
+                else:
+                    call._set_error(
+                        ContractLogicError(
+                            f"{call.function.fn_name} reverted", data=return_data
+                        )
+                    )
+
+    def _execute_json_rpc_batch(self, calls: List[BatchedCall]) -> None:
+        with self.web3.provider.batch_requests() as batch:
+            requests = [batch.add("eth_call", [c.call_dict, "latest"]) for c in calls]
+
+        for call, request in zip(calls, requests):
+            if "error" in request.response:
+                error = request.response["error"].get("message")
+                call._set_error(ContractLogicError(error))
+            else:
+                call._set_return_data(request.response["result"])
+
+    def _execute_sequential(self, calls: List[BatchedCall]) -> None:
+        for call in calls:
+            try:
+                call._set_return_data(self.web3.eth.call(call.call_dict))
+            except ContractLogicError as e:
+                call._set_error(e)
+
+    def __enter__(self) -> "CallBatch":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.execute()
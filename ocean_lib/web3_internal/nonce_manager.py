@@ -0,0 +1,68 @@
+#
+# Copyright 2023 Ocean Protocol Foundation
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Local, thread-safe nonce allocation for transaction senders."""
+import logging
+import threading
+
+from enforce_typing import enforce_types
+from web3.main import Web3
+
+from ocean_lib.web3_internal.web3_cache import get_web3_cache
+
+logger = logging.getLogger(__name__)
+
+_managers_lock = threading.Lock()
+
+
+class NonceManager:
+    """Hands out nonces for one address on one chain.
+
+    The pending transaction count is fetched from the node once; afterwards
+    nonces are allocated locally, so several transactions from the same
+    wallet can be in flight at once. Call `resync()` whenever a transaction
+    was not accepted or got replaced, and the next allocation will query
+    the node again.
+    """
+
+    @enforce_types
+    def __init__(self, web3: Web3, address: str) -> None:
+        self.web3 = web3
+        self.address = Web3.to_checksum_address(address.lower())
+        self._lock = threading.Lock()
+        self._next_nonce = None
+
+    @enforce_types
+    def next_nonce(self) -> int:
+        """Returns a nonce that no other caller of this manager will get."""
+        with self._lock:
+            if self._next_nonce is None:
+                self._next_nonce = self.web3.eth.get_transaction_count(
+                    self.address, "pending"
+                )
+
+            nonce = self._next_nonce
+            self._next_nonce += 1
+
+            return nonce
+
+    @enforce_types
+    def resync(self) -> None:
+        """Forgets the local nonce, so that the next one comes from the node."""
+        with self._lock:
+            logger.debug(f"Resyncing nonce for {self.address}.")
+            self._next_nonce = None
+
+
+@enforce_types
+def get_nonce_manager(web3: Web3, address: str) -> NonceManager:
+    """Returns the shared NonceManager for this web3 instance and address."""
+    address = Web3.to_checksum_address(address.lower())
+
+    with _managers_lock:
+        managers = get_web3_cache(web3, "nonce_managers")
+        if address not in managers:
+            managers[address] = NonceManager(web3, address)
+
+        return managers[address]
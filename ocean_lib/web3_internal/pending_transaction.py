@@ -0,0 +1,96 @@
+#
+# Copyright 2023 Ocean Protocol Foundation
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Handles for sent transactions whose receipt is awaited later."""
+import logging
+from concurrent.futures import FIRST_EXCEPTION, Future, ThreadPoolExecutor
+from concurrent.futures import wait as wait_futures
+from typing import Iterable, List, Optional
+
+from hexbytes import HexBytes
+from web3.main import Web3
+from web3.types import TxReceipt
+
+from ocean_lib.web3_internal.nonce_manager import NonceManager
+
+logger = logging.getLogger(__name__)
+
+# polling for receipts is I/O bound, so a small shared pool serves all handles
+_RECEIPT_WORKERS = 16
+_receipt_executor = ThreadPoolExecutor(
+    max_workers=_RECEIPT_WORKERS, thread_name_prefix="ocean-receipts"
+)
+
+
+class PendingTransaction:
+    """A transaction that was sent, but whose receipt may not be there yet.
+
+    Returned by contract writes when `tx_dict` holds `"wait_for_receipt":
+    False`. The receipt is awaited in the background; `result()` blocks until
+    it is available.
+    """
+
+    def __init__(
+        self,
+        web3: Web3,
+        tx_hash: HexBytes,
+        nonce_manager: Optional[NonceManager] = None,
+        timeout: float = 120,
+    ) -> None:
+        self.web3 = web3
+        self.tx_hash = HexBytes(tx_hash)
+        self._nonce_manager = nonce_manager
+        self.future: Future = _receipt_executor.submit(self._wait, timeout)
+
+    def _wait(self, timeout: float) -> TxReceipt:
+        try:
+            return self.web3.eth.wait_for_transaction_receipt(
+                self.tx_hash, timeout=timeout
+            )
+        except Exception:
+            # dropped or replaced: the next nonce has to come from the node
+            if self._nonce_manager:
+                self._nonce_manager.resync()
+            raise
+
+    @property
+    def transactionHash(self) -> HexBytes:
+        """Same name as on receipts, so callers can use either."""
+        return self.tx_hash
+
+    def done(self) -> bool:
+        return self.future.done()
+
+    def result(self, timeout: Optional[float] = None) -> TxReceipt:
+        """Returns the receipt, waiting up to `timeout` seconds for it."""
+        return self.future.result(timeout=timeout)
+
+    def __repr__(self) -> str:
+        state = "mined" if self.done() else "pending"
+        return f"PendingTransaction({self.tx_hash.hex()}, {state})"
+
+
+def wait_for_transactions(
+    pending_txs: Iterable[PendingTransaction], timeout: Optional[float] = None
+) -> List[TxReceipt]:
+    """Waits for all `pending_txs` together and returns their receipts in order.
+
+    Raises the first error encountered, or `TimeoutError` if not all receipts
+    arrived within `timeout` seconds.
+    """
+    pending_txs = list(pending_txs)
+    done, not_done = wait_futures(
+        [tx.future for tx in pending_txs], timeout=timeout, return_when=FIRST_EXCEPTION
+    )
+
+    for future in done:
+        if future.exception():
+            raise future.exception()
+
+    if not_done:
+        raise TimeoutError(
+            f"{len(not_done)} of {len(pending_txs)} transactions still pending."
+        )
+
+    return [tx.future.result() for tx in pending_txs]
@@ -0,0 +1,116 @@
+#
+# Copyright 2023 Ocean Protocol Foundation
+# SPDX-License-Identifier: Apache-2.0
+#
+import asyncio
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from eth_account import Account
+from hexbytes import HexBytes
+
+from ocean_lib.web3_internal import async_contract
+from ocean_lib.web3_internal.async_contract import (
+    AsyncContractBase,
+    AsyncPendingTransaction,
+)
+
+TX_HASH = HexBytes("0x" + "ee" * 32)
+
+
+def _async_web3(tx: dict) -> Mock:
+    web3 = Mock()
+    web3.eth.contract.return_value.functions.transfer.return_value = Mock(
+        build_transaction=AsyncMock(side_effect=lambda tx_dict: dict(tx))
+    )
+    web3.eth.get_transaction_count = AsyncMock(return_value=7)
+    web3.eth.send_raw_transaction = AsyncMock(return_value=TX_HASH)
+    web3.eth.wait_for_transaction_receipt = AsyncMock(
+        return_value={"transactionHash": TX_HASH, "status": 1}
+    )
+    return web3
+
+
+@pytest.mark.unit
+def test_async_transact_without_waiting(monkeypatch):
+    wallet = Account.create()
+    tx = {
+        "to": wallet.address,
+        "value": 0,
+        "gas": 21000,
+        "maxFeePerGas": 10,
+        "maxPriorityFeePerGas": 1,
+        "chainId": 8996,
+        "data": "0x",
+        "type": 2,
+    }
+    web3 = _async_web3(tx)
+    monkeypatch.setattr(
+        async_contract,
+        "get_async_fee_oracle",
+        lambda *args: Mock(fill_transaction=AsyncMock()),
+    )
+    token = AsyncContractBase(web3, "ERC20Template", "0x" + "12" * 20)
+
+    async def run():
+        pending = await token.transact(
+            "transfer",
+            wallet.address,
+            1,
+            tx_dict={"from": wallet, "wait_for_receipt": False},
+        )
+        assert isinstance(pending, AsyncPendingTransaction)
+        assert pending.transactionHash == TX_HASH
+        assert not pending.done()
+        web3.eth.wait_for_transaction_receipt.assert_not_called()
+
+        receipt = await pending.result()
+        assert pending.done()
+        assert await pending.result() is receipt
+
+        waited = await token.transact(
+            "transfer", wallet.address, 1, tx_dict={"from": wallet}
+        )
+        return receipt, waited
+
+    receipt, waited = asyncio.run(run())
+
+    assert receipt == waited == {"transactionHash": TX_HASH, "status": 1}
+    assert web3.eth.wait_for_transaction_receipt.await_count == 2
+    # signed by the wallet, with nonces from a single node query
+    senders = [
+        Account.recover_transaction(call.args[0])
+        for call in web3.eth.send_raw_transaction.await_args_list
+    ]
+    assert senders == [wallet.address, wallet.address]
+    web3.eth.get_transaction_count.assert_awaited_once()
+
+
+@pytest.mark.unit
+def test_async_transact_resyncs_nonce_on_signing_failure(monkeypatch):
+    wallet = Account.create()
+    web3 = _async_web3({"to": wallet.address, "gas": 21000, "chainId": 8996})
+    monkeypatch.setattr(
+        async_contract,
+        "get_async_fee_oracle",
+        lambda *args: Mock(fill_transaction=AsyncMock()),
+    )
+    monkeypatch.setattr(
+        async_contract,
+        "get_signer",
+        lambda wallet: Mock(sign_transaction=Mock(side_effect=ValueError("no key"))),
+    )
+    token = AsyncContractBase(web3, "ERC20Template", "0x" + "12" * 20)
+
+    async def run():
+        for _ in range(2):
+            with pytest.raises(ValueError):
+                await token.transact(
+                    "transfer", wallet.address, 1, tx_dict={"from": wallet}
+                )
+
+    asyncio.run(run())
+
+    # the unused nonce is not skipped: it comes from the node again
+    assert web3.eth.get_transaction_count.await_count == 2
+    web3.eth.send_raw_transaction.assert_not_called()
@@ -5,9 +5,11 @@
 
 import pytest
 
+from ocean_lib.models.datatoken1 import Datatoken1
 from ocean_lib.ocean.util import get_address_of_type
 from ocean_lib.web3_internal.constants import ZERO_ADDRESS
 from ocean_lib.web3_internal.contract_base import ContractBase
+from ocean_lib.web3_internal.contract_cache import get_contract_cache
 from tests.resources.helper_functions import get_wallet
 
 
@@ -53,3 +55,88 @@ def test_main(config):
     assert factory.createToken
     assert factory.getCurrentTokenCount
     assert factory.getTokenTemplate
+
+
+@pytest.mark.unit
+def test_lazy_function_dispatch(config):
+    nft_factory_address = get_address_of_type(config, "ERC721Factory")
+    factory = MyFactory(config, nft_factory_address)
+    factory2 = MyFactory(config, nft_factory_address)
+
+    # contract functions live in the per-class dispatch table, not the instance
+    assert "getCurrentTokenCount" not in vars(factory)
+    assert "getCurrentTokenCount" in dir(factory)
+    assert MyFactory._dispatch_table() is MyFactory._dispatch_table()
+    assert factory.getCurrentTokenCount.__func__ is (
+        factory2.getCurrentTokenCount.__func__
+    )
+    assert factory.getCurrentTokenCount() == factory2.getCurrentTokenCount()
+
+    with pytest.raises(AttributeError):
+        factory.notAContractFunction
+
+
+@pytest.mark.unit
+def test_get_logs(config):
+    alice_wallet = get_wallet(1)
+    nft_factory_address = get_address_of_type(config, "ERC721Factory")
+    factory = MyFactory(config, nft_factory_address)
+    receipt = factory.deployERC721Contract(
+        "NFT",
+        "NFTS",
+        1,
+        ZERO_ADDRESS,
+        ZERO_ADDRESS,
+        "http://someurl",
+        True,
+        alice_wallet.address,
+        {"from": alice_wallet},
+    )
+
+    bn = receipt.blockNumber
+    events = factory.get_logs("NFTCreated", bn, bn)
+    assert len(events) == 1
+    assert events[0].transactionHash == receipt.transactionHash
+    assert events[0].args.admin == alice_wallet.address
+
+    events_iter = factory.iter_logs("NFTCreated", bn, bn)
+    assert [e.transactionHash for e in events_iter] == [receipt.transactionHash]
+
+
+@pytest.mark.unit
+def test_immutable_functions_are_cached(config, DT, monkeypatch):
+    web3 = config["web3_instance"]
+    eth_call = web3.eth.call
+    calls = []
+
+    def counting_call(*args, **kwargs):
+        calls.append(args)
+        return eth_call(*args, **kwargs)
+
+    monkeypatch.setattr(web3.eth, "call", counting_call)
+    get_contract_cache(config).clear()
+
+    decimals = DT.decimals()
+    assert len(calls) == 1
+
+    # from the cache, also for other objects at the same address
+    assert DT.decimals() == decimals
+    assert Datatoken1(config, DT.address).decimals() == decimals
+    assert len(calls) == 1
+
+    # mutable values still come from the chain
+    DT.totalSupply()
+    DT.totalSupply()
+    assert len(calls) == 3
+
+
+@pytest.mark.unit
+def test_shared_instances(config):
+    address = get_address_of_type(config, "ERC721Factory")
+    factory = MyFactory.get_shared(config, address)
+
+    assert MyFactory.get_shared(config, address.lower()) is factory
+    assert MyFactory.get_shared(dict(config), address) is not factory
+
+    ContractBase.clear_shared(config)
+    assert MyFactory.get_shared(config, address) is not factory
@@ -0,0 +1,105 @@
+#
+# Copyright 2023 Ocean Protocol Foundation
+# SPDX-License-Identifier: Apache-2.0
+#
+import os
+import time
+
+import pytest
+from web3.main import Web3
+
+from ocean_lib.web3_internal import contract_cache
+from ocean_lib.web3_internal.contract_cache import (
+    ContractCache,
+    get_chain_id,
+    get_contract_cache,
+)
+
+ADDRESS = "0x" + "ab" * 20
+
+
+@pytest.mark.unit
+def test_contract_cache_persistence(tmp_path):
+    path = str(tmp_path / "contracts.json")
+    cache = ContractCache(path)
+
+    assert cache.get(8996, ADDRESS, "decimals[]") is None
+    cache.set(8996, ADDRESS, "decimals[]", 18)
+    cache.set(8996, ADDRESS, "raw[]", b"\x01")
+
+    # keys are per chain, and addresses are case insensitive
+    assert cache.get(8996, ADDRESS.upper(), "decimals[]") == 18
+    assert cache.get(1, ADDRESS, "decimals[]") is None
+
+    # values are saved together, later
+    assert not os.path.exists(path)
+    cache.save()
+
+    reloaded = ContractCache(path)
+    assert reloaded.get(8996, ADDRESS, "decimals[]") == 18
+    assert reloaded.get(8996, ADDRESS, "raw[]") is None
+
+    reloaded.clear()
+    assert ContractCache(path).get(8996, ADDRESS, "decimals[]") is None
+
+
+@pytest.mark.unit
+def test_unreadable_cache_file_is_ignored(tmp_path):
+    path = tmp_path / "contracts.json"
+    path.write_text("not json")
+
+    assert ContractCache(str(path)).get(8996, ADDRESS, "decimals[]") is None
+
+
+@pytest.mark.unit
+def test_get_contract_cache(tmp_path, monkeypatch):
+    web3 = Web3()
+    config = {"web3_instance": web3}
+
+    assert get_contract_cache(config) is get_contract_cache({"web3_instance": Web3()})
+
+    path = str(tmp_path / "contracts.json")
+    assert get_contract_cache(dict(config, CONTRACT_CACHE_PATH=path)).path == path
+
+    custom = ContractCache()
+    assert get_contract_cache(dict(config, CONTRACT_CACHE=custom)) is custom
+
+    calls = []
+    monkeypatch.setattr(
+        type(web3.eth), "chain_id", property(lambda _: calls.append(1) or 5)
+    )
+    assert get_chain_id(config) == 5
+    assert get_chain_id(config) == 5
+    assert len(calls) == 1
+    assert get_chain_id(dict(config, CHAIN_ID=8996)) == 8996
+
+
+@pytest.mark.unit
+def test_contract_cache_saves_in_batches(tmp_path, monkeypatch):
+    monkeypatch.setattr(contract_cache, "SAVE_DELAY", 0.1)
+    path = str(tmp_path / "contracts.json")
+    cache = ContractCache(path)
+
+    writes = []
+    real_replace = os.replace
+    monkeypatch.setattr(
+        contract_cache.os,
+        "replace",
+        lambda *args: writes.append(args) or real_replace(*args),
+    )
+
+    for i in range(100):
+        cache.set(8996, ADDRESS, f"value[{i}]", i)
+
+    deadline = time.monotonic() + 5
+    while not writes and time.monotonic() < deadline:
+        time.sleep(0.05)
+
+    assert len(writes) == 1
+    assert ContractCache(path).get(8996, ADDRESS, "value[99]") == 99
+
+    # and at exit at the latest
+    cache.set(8996, ADDRESS, "late[]", 1)
+    contract_cache._save_all()
+    assert len(writes) == 2
+    assert ContractCache(path).get(8996, ADDRESS, "late[]") == 1
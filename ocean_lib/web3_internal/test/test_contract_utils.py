@@ -2,9 +2,21 @@
 # Copyright 2023 Ocean Protocol Foundation
 # SPDX-License-Identifier: Apache-2.0
 #
+import json
+
+import pytest
 from web3.main import Web3
 
-from ocean_lib.web3_internal.contract_utils import _checksum_contract_addresses
+from ocean_lib.web3_internal.contract_utils import (
+    _checksum_contract_addresses,
+    clear_contract_registry,
+    get_address_book,
+    get_contract_definition,
+    get_contract_factory,
+    get_contracts_addresses,
+    get_contracts_addresses_all_networks,
+    load_contract,
+)
 
 
 def test_checksum_contract_addresses(monkeypatch):
@@ -18,3 +30,78 @@ def test_checksum_contract_addresses(monkeypatch):
     checksum_addresses = _checksum_contract_addresses(addresses)
     assert Web3.is_checksum_address(checksum_addresses["test"]) is True
     assert Web3.is_checksum_address(addresses["dict"]["address"]) is True
+
+
+def test_contract_registry_caches_definitions_and_factories():
+    clear_contract_registry()
+    web3 = Web3()
+
+    definition = get_contract_definition("ERC20Template")
+    assert get_contract_definition("ERC20Template") is definition
+
+    factory = get_contract_factory(web3, "ERC20Template")
+    assert get_contract_factory(web3, "ERC20Template") is factory
+    assert get_contract_factory(Web3(), "ERC20Template") is not factory
+
+    address = Web3.to_checksum_address("0x20802d1a9581b94e51db358c09e0818d6bd071b4")
+    contract = load_contract(web3, "ERC20Template", address)
+    assert isinstance(contract, factory)
+    assert contract.address == address
+    assert load_contract(web3, "ERC20Template", None) is factory
+
+
+def test_contract_registry_reads_artifacts_once(monkeypatch):
+    web3 = Web3()
+    address = Web3.to_checksum_address("0x20802d1a9581b94e51db358c09e0818d6bd071b4")
+
+    loads = []
+    real_load = json.load
+    monkeypatch.setattr(json, "load", lambda f: loads.append(1) or real_load(f))
+    factories = []
+    real_contract = web3.eth.contract
+    monkeypatch.setattr(
+        web3.eth,
+        "contract",
+        lambda **kwargs: factories.append(1) or real_contract(**kwargs),
+    )
+
+    clear_contract_registry()
+    contracts = [load_contract(web3, "ERC721Template", address) for _ in range(10)]
+
+    assert len(loads) == 1
+    assert len(factories) == 1
+    assert len({type(contract) for contract in contracts}) == 1
+
+
+def test_address_book(tmp_path, monkeypatch):
+    address_file = tmp_path / "address.json"
+    ocean = "0x20802d1a9581b94e51db358c09e0818d6bd071b4"
+    address_file.write_text(json.dumps({"development": {"Ocean": ocean}}))
+    config = {"ADDRESS_FILE": str(address_file), "NETWORK_NAME": "development"}
+
+    address_book = get_address_book(config)
+    assert get_address_book(dict(config)) is address_book
+
+    addresses = get_contracts_addresses(config)
+    assert addresses["Ocean"] == Web3.to_checksum_address(ocean)
+    assert get_contracts_addresses_all_networks(config)["development"]["Ocean"] == ocean
+
+    # unchanged file: no parsing
+    loads = []
+    real_load = json.load
+    monkeypatch.setattr(json, "load", lambda f: loads.append(1) or real_load(f))
+    assert get_contracts_addresses(config) is addresses
+    assert not loads
+
+    # changed file: reloaded
+    other = "0xe2dd09d719da89e5a3d0f2549c7e24566e947260"
+    address_file.write_text(json.dumps({"development": {"Ocean": other, "x": 1}}))
+    assert get_contracts_addresses(config)["Ocean"] == Web3.to_checksum_address(other)
+    assert len(loads) == 1
+
+    with pytest.raises(Exception, match="Address not found"):
+        get_contracts_addresses(dict(config, NETWORK_NAME="mainnet"))
+
+    address_file.unlink()
+    with pytest.raises(Exception, match="Could not find address_file"):
+        get_contracts_addresses(config)
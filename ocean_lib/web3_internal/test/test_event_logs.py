@@ -0,0 +1,80 @@
+#
+# Copyright 2023 Ocean Protocol Foundation
+# SPDX-License-Identifier: Apache-2.0
+#
+import pytest
+from web3.main import Web3
+
+from ocean_lib.web3_internal.event_logs import (
+    is_too_many_results_error,
+    iter_logs_in_chunks,
+)
+
+
+@pytest.mark.unit
+def test_iter_logs_in_chunks_shrinks_on_too_many_results(monkeypatch):
+    web3 = Web3()
+    ranges = []
+
+    def get_logs(params):
+        start, end = params["fromBlock"], params["toBlock"]
+        ranges.append((start, end))
+        if end - start >= 40:
+            raise ValueError(
+                {"code": -32005, "message": "query returned more than 10000 results"}
+            )
+
+        return [{"blockNumber": n} for n in range(start, end + 1) if n % 10 == 0]
+
+    monkeypatch.setattr(web3.eth, "get_logs", get_logs)
+
+    logs = iter_logs_in_chunks(web3, {"topics": []}, 0, 99)
+    assert [log["blockNumber"] for log in logs] == list(range(0, 100, 10))
+    assert ranges[:3] == [(0, 99), (0, 49), (0, 24)]
+    assert ranges[-1][1] == 99
+
+
+@pytest.mark.unit
+def test_iter_logs_in_chunks_grows_back(monkeypatch):
+    web3 = Web3()
+    ranges = []
+
+    def get_logs(params):
+        start, end = params["fromBlock"], params["toBlock"]
+        ranges.append((start, end))
+        # only the first 50 blocks are dense
+        if start < 50 and end - start >= 40:
+            raise ValueError({"code": -32005, "message": "too many results"})
+
+        return []
+
+    monkeypatch.setattr(web3.eth, "get_logs", get_logs)
+
+    assert list(iter_logs_in_chunks(web3, {"topics": []}, 0, 999, 400)) == []
+    assert ranges[3:] == [
+        (0, 49),
+        (0, 24),
+        (25, 74),
+        (25, 49),
+        (50, 99),
+        (100, 199),
+        (200, 399),
+        (400, 799),
+        (800, 999),
+    ]
+
+
+@pytest.mark.unit
+def test_iter_logs_in_chunks_raises_other_errors(monkeypatch):
+    web3 = Web3()
+
+    def get_logs(params):
+        raise ValueError({"code": -32000, "message": "header not found"})
+
+    monkeypatch.setattr(web3.eth, "get_logs", get_logs)
+
+    with pytest.raises(ValueError):
+        list(iter_logs_in_chunks(web3, {"topics": []}, 0, 10))
+
+    assert is_too_many_results_error(ValueError("block range is too large"))
+    assert not is_too_many_results_error(ValueError("header not found"))
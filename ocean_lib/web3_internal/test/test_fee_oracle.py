@@ -0,0 +1,205 @@
+#
+# Copyright 2023 Ocean Protocol Foundation
+# SPDX-License-Identifier: Apache-2.0
+#
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from web3.datastructures import AttributeDict
+from web3.main import AsyncWeb3, Web3
+
+from ocean_lib.web3_internal.fee_oracle import (
+    MIN_PRIORITY_FEE,
+    AsyncFeeOracle,
+    FeeOracle,
+    get_fee_oracle,
+)
+from tests.resources.helper_functions import get_wallet
+
+GWEI = 10**9
+
+
+def _mock_fee_history(monkeypatch, web3, calls):
+    def fee_history(block_count, newest_block, reward_percentiles):
+        calls.append(reward_percentiles)
+        return AttributeDict(
+            {
+                "baseFeePerGas": [8 * GWEI, 9 * GWEI, 10 * GWEI],
+                "reward": [
+                    [2 * GWEI, 3 * GWEI, 8 * GWEI],
+                    [0, 5 * GWEI, 12 * GWEI],
+                ],
+            }
+        )
+
+    monkeypatch.setattr(web3.eth, "fee_history", fee_history)
+
+
+@pytest.mark.unit
+def test_fee_oracle_strategies(monkeypatch):
+    web3 = Web3()
+    calls = []
+    _mock_fee_history(monkeypatch, web3, calls)
+    oracle = FeeOracle(web3, ttl=60)
+
+    economy = oracle.get_fees("economy")
+    standard = oracle.get_fees()
+    fast = oracle.get_fees("fast")
+
+    # one eth_feeHistory call for all strategies, zero rewards are ignored
+    assert len(calls) == 1
+    assert economy.max_priority_fee == 2 * GWEI
+    assert standard.max_priority_fee == 4 * GWEI
+    assert fast.max_priority_fee == 10 * GWEI
+    assert fast.base_fee == 10 * GWEI
+    assert fast.max_fee == 30 * GWEI
+
+    oracle.invalidate()
+    oracle.get_fees()
+    assert len(calls) == 2
+
+    with pytest.raises(ValueError):
+        oracle.get_fees("ludicrous")
+
+
+@pytest.mark.unit
+def test_fee_oracle_fallbacks(monkeypatch):
+    web3 = Web3()
+
+    def fee_history(*args):
+        raise ValueError("the method eth_feeHistory does not exist")
+
+    monkeypatch.setattr(web3.eth, "fee_history", fee_history)
+    monkeypatch.setattr(
+        web3.eth, "get_block", lambda block: AttributeDict({"baseFeePerGas": GWEI})
+    )
+    monkeypatch.setattr(type(web3.eth), "max_priority_fee", 0)
+
+    oracle = FeeOracle(web3, ttl=0)
+    assert oracle.get_fees("fast").max_fee == 2 * GWEI
+
+    # legacy chains get no EIP-1559 fees, and transactions are left as is
+    monkeypatch.setattr(web3.eth, "get_block", lambda block: AttributeDict({}))
+    assert oracle.get_fees() is None
+    assert oracle.fill_transaction({"from": "0x0"}) == {"from": "0x0"}
+
+
+@pytest.mark.unit
+def test_fee_oracle_retries_fee_history(monkeypatch):
+    web3 = Web3()
+    calls = []
+    errors = [ConnectionError("timed out")]
+
+    def fee_history(*args):
+        calls.append(args)
+        if errors:
+            raise errors.pop()
+        return AttributeDict({"baseFeePerGas": [GWEI], "reward": [[0, 0, 0]]})
+
+    monkeypatch.setattr(web3.eth, "fee_history", fee_history)
+    monkeypatch.setattr(
+        web3.eth, "get_block", lambda block: AttributeDict({"baseFeePerGas": GWEI})
+    )
+    monkeypatch.setattr(type(web3.eth), "max_priority_fee", 0)
+    oracle = FeeOracle(web3, ttl=0)
+
+    # a failed request falls back to the latest block only this time
+    assert oracle.get_fees().max_priority_fee == 0
+    assert oracle.get_fees().max_priority_fee == MIN_PRIORITY_FEE
+    assert len(calls) == 2
+
+    # a node without the method is not asked again
+    errors.append(ValueError({"code": -32601, "message": "Method not found"}))
+    oracle.get_fees()
+    oracle.get_fees()
+    assert len(calls) == 3
+
+
+@pytest.mark.unit
+def test_fee_oracle_fetches_once_for_concurrent_callers(monkeypatch):
+    web3 = Web3()
+    calls = []
+    _mock_fee_history(monkeypatch, web3, calls)
+    fee_history = web3.eth.fee_history
+    monkeypatch.setattr(
+        web3.eth, "fee_history", lambda *args: time.sleep(0.1) or fee_history(*args)
+    )
+    oracle = FeeOracle(web3, ttl=60)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        fees = list(executor.map(lambda _: oracle.get_fees(), range(8)))
+
+    assert len(calls) == 1
+    assert len(set(fees)) == 1
+
+
+@pytest.mark.unit
+def test_fill_transaction(monkeypatch):
+    web3 = Web3()
+    _mock_fee_history(monkeypatch, web3, [])
+    oracle = FeeOracle(web3)
+
+    tx = oracle.fill_transaction({}, "economy")
+    assert tx["maxPriorityFeePerGas"] == 2 * GWEI
+    assert tx["maxFeePerGas"] == 22 * GWEI
+
+    assert oracle.fill_transaction({"gasPrice": 1}) == {"gasPrice": 1}
+    assert MIN_PRIORITY_FEE == GWEI
+
+
+@pytest.mark.unit
+def test_async_fee_oracle(monkeypatch):
+    web3 = AsyncWeb3()
+    calls = []
+    history = AttributeDict(
+        {"baseFeePerGas": [8 * GWEI, 10 * GWEI], "reward": [[0, 3 * GWEI, 8 * GWEI]]}
+    )
+
+    async def fee_history(block_count, newest_block, reward_percentiles):
+        calls.append(reward_percentiles)
+        return history
+
+    monkeypatch.setattr(web3.eth, "fee_history", fee_history)
+    oracle = AsyncFeeOracle(web3, ttl=60)
+
+    async def run():
+        return await asyncio.gather(
+            oracle.fill_transaction({}, "fast"),
+            oracle.fill_transaction({}, "economy"),
+            oracle.fill_transaction({"gasPrice": 1}),
+        )
+
+    fast, economy, legacy = asyncio.run(run())
+
+    assert len(calls) == 1
+    assert fast == {"maxPriorityFeePerGas": 8 * GWEI, "maxFeePerGas": 28 * GWEI}
+    assert economy["maxPriorityFeePerGas"] == MIN_PRIORITY_FEE
+    assert legacy == {"gasPrice": 1}
+
+
+@pytest.mark.unit
+def test_get_fee_oracle_is_shared():
+    web3 = Web3()
+    oracle = get_fee_oracle({"web3_instance": web3})
+
+    assert get_fee_oracle({"web3_instance": web3}) is oracle
+    assert get_fee_oracle({"web3_instance": Web3()}) is not oracle
+
+    custom = FeeOracle(web3, strategy="fast")
+    assert get_fee_oracle({"web3_instance": web3, "FEE_ORACLE": custom}) is custom
+
+
+@pytest.mark.unit
+def test_transactions_use_fee_oracle(config, ocean_token):
+    wallet = get_wallet(1)
+    oracle = get_fee_oracle(config)
+    oracle.invalidate()
+
+    receipt = ocean_token.approve(get_wallet(2).address, 1, {"from": wallet})
+    tx = config["web3_instance"].eth.get_transaction(receipt.transactionHash)
+
+    fees = oracle.get_fees()
+    assert tx["maxPriorityFeePerGas"] == fees.max_priority_fee
+    assert tx["maxFeePerGas"] == fees.max_fee
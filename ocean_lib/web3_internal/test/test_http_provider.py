@@ -0,0 +1,76 @@
+#
+# Copyright 2023 Ocean Protocol Foundation
+# SPDX-License-Identifier: Apache-2.0
+#
+import json
+
+import pytest
+
+from ocean_lib.web3_internal import http_provider
+from ocean_lib.web3_internal.http_provider import CustomHTTPProvider, hex_to_int
+from tests.resources.helper_functions import get_wallet
+
+
+@pytest.mark.unit
+def test_batch_requests_single_post(monkeypatch):
+    posts = []
+
+    def make_post_request(endpoint_uri, data, *args, **kwargs):
+        batch = json.loads(data)
+        posts.append(batch)
+        # answer out of order, and fail one request
+        responses = [
+            {"jsonrpc": "2.0", "id": r["id"], "result": r["params"][0]}
+            if r["params"][0] != "0x2"
+            else {"jsonrpc": "2.0", "id": r["id"], "error": {"message": "nope"}}
+            for r in reversed(batch)
+        ]
+        return json.dumps(responses).encode()
+
+    monkeypatch.setattr(http_provider, "make_post_request", make_post_request)
+    provider = CustomHTTPProvider("http://localhost:8545")
+
+    with provider.batch_requests(max_batch_size=2) as batch:
+        requests = [
+            batch.add("eth_getBalance", [hex(i), "latest"], hex_to_int)
+            for i in range(3)
+        ]
+        assert not requests[0].done()
+
+    assert len(posts) == 2
+    assert requests[0].result == 0
+    assert requests[1].result == 1
+    with pytest.raises(ValueError):
+        requests[2].result
+
+
+@pytest.mark.unit
+def test_make_batch_request(monkeypatch):
+    def make_post_request(endpoint_uri, data, *args, **kwargs):
+        (request,) = json.loads(data)
+        # a batch of one may come back unwrapped
+        return json.dumps(
+            {"jsonrpc": "2.0", "id": request["id"], "result": "0x1"}
+        ).encode()
+
+    monkeypatch.setattr(http_provider, "make_post_request", make_post_request)
+    provider = CustomHTTPProvider("http://localhost:8545")
+
+    assert provider.make_batch_request([]) == []
+    assert provider.make_batch_request([("eth_chainId", None)])[0]["result"] == "0x1"
+
+
+@pytest.mark.unit
+def test_batch_requests_on_chain(config):
+    web3 = config["web3_instance"]
+    addresses = [get_wallet(i).address for i in range(1, 4)]
+
+    with web3.provider.batch_requests() as batch:
+        balances = [
+            batch.add("eth_getBalance", [address, "latest"], hex_to_int)
+            for address in addresses
+        ]
+
+    assert [b.result for b in balances] == [
+        web3.eth.get_balance(address) for address in addresses
+    ]
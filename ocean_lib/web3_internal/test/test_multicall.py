@@ -0,0 +1,84 @@
+#
+# Copyright 2023 Ocean Protocol Foundation
+# SPDX-License-Identifier: Apache-2.0
+#
+import pytest
+from web3.exceptions import BadFunctionCallOutput
+from web3.main import Web3
+
+from ocean_lib.models.datatoken1 import Datatoken1
+from ocean_lib.models.fixed_rate_exchange import OneExchange
+from ocean_lib.ocean.util import to_wei
+from ocean_lib.web3_internal import multicall
+from ocean_lib.web3_internal.contract_base import ContractBase
+from ocean_lib.web3_internal.multicall import CallBatch
+
+
+@pytest.mark.unit
+def test_batch_results_match_direct_calls(config, OCEAN, DT, alice, bob):
+    with ContractBase.batch_calls(config) as batch:
+        name = batch.add(DT, "name")
+        decimals = batch.add(DT, "decimals")
+        balances = [batch.add(OCEAN, "balanceOf", w) for w in (alice, bob)]
+        permissions = batch.add(DT, "getPermissions", alice.address)
+
+    assert name.result == DT.name()
+    assert decimals.result == DT.decimals()
+    assert [b.result for b in balances] == [OCEAN.balanceOf(w) for w in (alice, bob)]
+    assert permissions.result == DT.getPermissions(alice.address)
+
+
+@pytest.mark.unit
+def test_batch_rejects_transactions(config, DT, alice):
+    batch = CallBatch(config)
+    with pytest.raises(ValueError):
+        batch.add(DT, "mint", alice.address, to_wei(1))
+
+    pending = batch.add(DT, "symbol")
+    with pytest.raises(ValueError):
+        pending.result
+
+    assert batch.execute() == [DT.symbol()]
+
+
+@pytest.mark.unit
+def test_batched_exchange_getters(OCEAN, DT, alice):
+    exchanges = [
+        DT.create_exchange(
+            rate=to_wei(rate), base_token_addr=OCEAN.address, tx_dict={"from": alice}
+        )
+        for rate in (1, 2)
+    ]
+
+    details = OneExchange.batch_details(exchanges)
+    fees = OneExchange.batch_fees_info(exchanges)
+
+    for exchange, details_, fees_ in zip(exchanges, details, fees):
+        assert details_.fixed_rate == exchange.details.fixed_rate
+        assert fees_.opc_fee == exchange.exchange_fees_info.opc_fee
+
+    assert len(DT.get_exchanges(only_active=True)) == 2
+    assert OneExchange.batch_details([]) == []
+
+
+@pytest.mark.unit
+def test_undecodable_result_fails_only_its_call(monkeypatch):
+    web3 = Web3()
+    config = {"web3_instance": web3}
+    monkeypatch.setattr(multicall, "get_multicall_address", lambda config: None)
+    tokens = [Datatoken1(config, "0x" + c * 40) for c in "12"]
+
+    # e.g. no contract at the first address: empty return data, no revert
+    return_data = {tokens[0].address: b"", tokens[1].address: (18).to_bytes(32, "big")}
+    monkeypatch.setattr(
+        web3.eth, "call", lambda call_dict: return_data[call_dict["to"]]
+    )
+
+    batch = CallBatch(config)
+    missing, decimals = [batch.add(token, "decimals") for token in tokens]
+    with pytest.raises(BadFunctionCallOutput):
+        batch.execute()
+
+    assert decimals.result == 18
+    with pytest.raises(BadFunctionCallOutput):
+        missing.result
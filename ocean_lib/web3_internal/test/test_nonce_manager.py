@@ -0,0 +1,90 @@
+#
+# Copyright 2023 Ocean Protocol Foundation
+# SPDX-License-Identifier: Apache-2.0
+#
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from web3.main import AsyncWeb3, Web3
+
+from ocean_lib.web3_internal.async_contract import get_async_nonce_manager
+from ocean_lib.web3_internal.nonce_manager import NonceManager, get_nonce_manager
+from tests.resources.helper_functions import get_wallet
+
+
+@pytest.mark.unit
+def test_nonce_manager_allocates_locally(monkeypatch):
+    web3 = Web3()
+    calls = []
+
+    def get_transaction_count(address, block_identifier):
+        calls.append((address, block_identifier))
+        return 5
+
+    monkeypatch.setattr(web3.eth, "get_transaction_count", get_transaction_count)
+
+    address = get_wallet(1).address
+    manager = NonceManager(web3, address)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        nonces = list(executor.map(lambda _: manager.next_nonce(), range(50)))
+
+    assert sorted(nonces) == list(range(5, 55))
+    assert calls == [(address, "pending")]
+
+    manager.resync()
+    assert manager.next_nonce() == 5
+    assert len(calls) == 2
+
+
+@pytest.mark.unit
+def test_async_nonce_manager_allocates_locally(monkeypatch):
+    web3 = AsyncWeb3()
+    calls = []
+
+    async def get_transaction_count(address, block_identifier):
+        calls.append((address, block_identifier))
+        await asyncio.sleep(0)
+        return 5
+
+    monkeypatch.setattr(web3.eth, "get_transaction_count", get_transaction_count)
+
+    address = get_wallet(1).address
+    manager = get_async_nonce_manager(web3, address)
+    assert get_async_nonce_manager(web3, address.lower()) is manager
+
+    async def run():
+        return await asyncio.gather(*[manager.next_nonce() for _ in range(20)])
+
+    assert sorted(asyncio.run(run())) == list(range(5, 25))
+    assert calls == [(address, "pending")]
+
+    manager.resync()
+    assert asyncio.run(manager.next_nonce()) == 5
+    assert len(calls) == 2
+
+
+@pytest.mark.unit
+def test_get_nonce_manager_is_shared():
+    web3 = Web3()
+    address = get_wallet(1).address
+
+    manager = get_nonce_manager(web3, address)
+    assert get_nonce_manager(web3, address.lower()) is manager
+    assert get_nonce_manager(Web3(), address) is not manager
+
+
+@pytest.mark.unit
+def test_nonce_manager_with_transactions(config, ocean_token):
+    wallet = get_wallet(1)
+    web3 = config["web3_instance"]
+
+    ocean_token.approve(get_wallet(2).address, 1, {"from": wallet})
+    ocean_token.approve(get_wallet(2).address, 2, {"from": wallet})
+
+    manager = get_nonce_manager(web3, wallet.address)
+    assert manager.next_nonce() == web3.eth.get_transaction_count(
+        wallet.address, "pending"
+    )
+    manager.resync()
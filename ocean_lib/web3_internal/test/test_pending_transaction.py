@@ -0,0 +1,53 @@
+#
+# Copyright 2023 Ocean Protocol Foundation
+# SPDX-License-Identifier: Apache-2.0
+#
+import pytest
+from web3.exceptions import TimeExhausted
+from web3.main import Web3
+
+from ocean_lib.ocean.util import to_wei
+from ocean_lib.web3_internal.pending_transaction import (
+    PendingTransaction,
+    wait_for_transactions,
+)
+from tests.resources.helper_functions import get_wallet
+
+
+@pytest.mark.unit
+def test_non_blocking_writes(config, ocean_token):
+    wallet = get_wallet(1)
+    spender = get_wallet(2).address
+
+    pending_txs = [
+        ocean_token.approve(
+            spender, to_wei(i), {"from": wallet, "wait_for_receipt": False}
+        )
+        for i in range(1, 4)
+    ]
+    assert all(isinstance(tx, PendingTransaction) for tx in pending_txs)
+
+    receipts = wait_for_transactions(pending_txs, timeout=60)
+    assert [r.transactionHash for r in receipts] == [
+        tx.transactionHash for tx in pending_txs
+    ]
+    assert all(r.status == 1 for r in receipts)
+    assert ocean_token.allowance(wallet.address, spender) == to_wei(3)
+
+
+@pytest.mark.unit
+def test_wait_for_transactions_raises(monkeypatch):
+    web3 = Web3()
+
+    def wait_for_transaction_receipt(tx_hash, timeout):
+        raise TimeExhausted("not mined")
+
+    monkeypatch.setattr(
+        web3.eth, "wait_for_transaction_receipt", wait_for_transaction_receipt
+    )
+
+    pending_tx = PendingTransaction(web3, b"\x01" * 32)
+    with pytest.raises(TimeExhausted):
+        wait_for_transactions([pending_tx])
+
+    assert pending_tx.done()
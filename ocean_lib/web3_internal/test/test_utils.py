@@ -0,0 +1,76 @@
+#
+# Copyright 2023 Ocean Protocol Foundation
+# SPDX-License-Identifier: Apache-2.0
+#
+import gc
+import weakref
+
+import pytest
+from eth_account import Account
+from eth_account.messages import encode_defunct
+from web3.main import Web3
+
+from ocean_lib.web3_internal import utils
+from ocean_lib.web3_internal.utils import get_signer, sign_with_key
+
+PRIVATE_KEY = "0x" + "12" * 32
+
+
+@pytest.mark.unit
+def test_signer_is_kept_on_wallet():
+    wallet = Account.from_key(PRIVATE_KEY)
+    signer = get_signer(wallet)
+
+    assert get_signer(wallet) is signer
+    assert get_signer(Account.from_key(PRIVATE_KEY)) is not signer
+    assert signer.address == wallet.address
+
+    # the signer, and its key, go away with the wallet
+    signer_ref = weakref.ref(signer)
+    del wallet, signer
+    gc.collect()
+    assert signer_ref() is None
+
+
+@pytest.mark.unit
+def test_signer_matches_eth_sign():
+    account = Account.from_key(PRIVATE_KEY)
+    signer = get_signer(account)
+
+    text = "0x1234abcd1"
+    message_hash = Web3.solidity_keccak(["bytes"], [Web3.to_bytes(text=text)])
+    expected = account.sign_message(encode_defunct(primitive=message_hash))
+
+    for signature in [sign_with_key(text, PRIVATE_KEY), signer.sign(message_hash)]:
+        assert signature.r == expected.r
+        assert signature.s == expected.s
+        assert signature.v + 27 == expected.v
+
+    # signers of raw keys are reused
+    assert utils._get_key_signer(PRIVATE_KEY) is utils._get_key_signer(PRIVATE_KEY)
+
+    signatures = signer.sign_messages([text, message_hash, "other"])
+    assert signatures[0] == signatures[1]
+    assert signatures[2] != signatures[0]
+
+
+@pytest.mark.unit
+def test_signer_signs_transactions():
+    account = Account.from_key(PRIVATE_KEY)
+    tx = {
+        "to": account.address,
+        "value": 1,
+        "gas": 21000,
+        "maxFeePerGas": 10,
+        "maxPriorityFeePerGas": 1,
+        "nonce": 0,
+        "chainId": 8996,
+        "type": 2,
+    }
+
+    signer = get_signer(account)
+    signed = signer.sign_transaction(tx)
+
+    assert signed == Account.sign_transaction(tx, PRIVATE_KEY)
+    # "from" is checked against the key as by the account itself
+    assert signer.sign_transaction(dict(tx, **{"from": account.address})) == signed
@@ -0,0 +1,66 @@
+#
+# Copyright 2023 Ocean Protocol Foundation
+# SPDX-License-Identifier: Apache-2.0
+#
+import gc
+import weakref
+
+import pytest
+from web3.main import AsyncWeb3, Web3
+
+from ocean_lib.models.datatoken1 import Datatoken1
+from ocean_lib.web3_internal import web3_cache
+from ocean_lib.web3_internal.async_contract import (
+    get_async_fee_oracle,
+    get_async_nonce_manager,
+)
+from ocean_lib.web3_internal.contract_base import ContractBase
+from ocean_lib.web3_internal.contract_utils import (
+    clear_contract_registry,
+    get_contract_factory,
+)
+from ocean_lib.web3_internal.fee_oracle import get_fee_oracle
+from ocean_lib.web3_internal.nonce_manager import get_nonce_manager
+
+ADDRESS = "0x" + "12" * 20
+
+
+@pytest.mark.unit
+def test_web3_registries_do_not_keep_web3_alive():
+    web3 = Web3()
+    config = {"web3_instance": web3}
+    async_web3 = AsyncWeb3()
+
+    get_contract_factory(web3, "ERC20Template")
+    get_nonce_manager(web3, ADDRESS)
+    get_fee_oracle(config)
+    Datatoken1.get_shared(config, ADDRESS).contract
+    get_async_nonce_manager(async_web3, ADDRESS)
+    get_async_fee_oracle(async_web3)
+
+    refs = [weakref.ref(web3), weakref.ref(async_web3)]
+    assert set(web3_cache._owners) == {web3, async_web3}
+
+    del web3, config, async_web3
+    gc.collect()
+
+    assert [ref() for ref in refs] == [None, None]
+    assert len(web3_cache._owners) == 0
+
+
+@pytest.mark.unit
+def test_clear_web3_caches():
+    web3 = Web3()
+    config = {"web3_instance": web3}
+
+    factory = get_contract_factory(web3, "ERC20Template")
+    shared = Datatoken1.get_shared(config, ADDRESS)
+    manager = get_nonce_manager(web3, ADDRESS)
+
+    clear_contract_registry()
+    assert get_contract_factory(web3, "ERC20Template") is not factory
+    assert Datatoken1.get_shared(config, ADDRESS) is shared
+
+    ContractBase.clear_shared()
+    assert Datatoken1.get_shared(config, ADDRESS) is not shared
+    assert get_nonce_manager(web3, ADDRESS) is manager
@@ -4,19 +4,26 @@
 #
 import logging
 from collections import namedtuple
+from functools import lru_cache
 from typing import Any, Union
 
-import requests
 from enforce_typing import enforce_types
+from eth_account import Account
+from eth_account.datastructures import SignedTransaction
+from eth_account.signers.local import LocalAccount
 from eth_keys import KeyAPI
 from eth_keys.backends import NativeECCBackend
+from eth_utils import keccak
 from hexbytes.main import HexBytes
 from web3.main import Web3
 
 from ocean_lib.web3_internal.clef import ClefAccount
+from ocean_lib.web3_internal.fee_oracle import get_cached_remote_fees
 
 Signature = namedtuple("Signature", ("v", "r", "s"))
 
+POLYGON_GAS_STATION_URL = "https://gasstation.polygon.technology/v2"
+
 logger = logging.getLogger(__name__)
 keys = KeyAPI(NativeECCBackend)
 
@@ -45,22 +52,74 @@ def sign_with_clef(message_hash: str, wallet: ClefAccount) -> str:
     return orig_sig
 
 
-@enforce_types
-def sign_with_key(message_hash: Union[HexBytes, str], key: str) -> str:
-    if isinstance(message_hash, str):
-        message_hash = Web3.solidity_keccak(
-            ["bytes"],
-            [Web3.to_bytes(text=message_hash)],
+# prefix of eth_sign for 32-byte messages
+_SIGNED_MESSAGE_PREFIX = b"\x19Ethereum Signed Message:\n32"
+
+
+class Signer:
+    """Signs with the private key of one account, parsed once.
+
+    Deriving the public key from a private key is costly, so signers are
+    meant to be reused: get them with `get_signer`.
+    """
+
+    @enforce_types
+    def __init__(self, account: LocalAccount) -> None:
+        self._account = account
+        self._private_key = keys.PrivateKey(account.key)
+
+    @property
+    def address(self) -> str:
+        return self._account.address
+
+    @enforce_types
+    def sign(self, message_hash: Union[HexBytes, str]):
+        """Signs like eth_sign; text messages are hashed first.
+
+        :return: eth_keys Signature
+        """
+        if isinstance(message_hash, str):
+            message_hash = keccak(text=message_hash)
+
+        signable_hash = keccak(_SIGNED_MESSAGE_PREFIX + bytes(message_hash))
+
+        return keys.ecdsa_sign(
+            message_hash=signable_hash, private_key=self._private_key
         )
 
-    pk = keys.PrivateKey(Web3.to_bytes(hexstr=key))
+    @enforce_types
+    def sign_messages(self, message_hashes: list) -> list:
+        """Signs many messages, see `sign`."""
+        return [self.sign(message_hash) for message_hash in message_hashes]
 
-    prefix = "\x19Ethereum Signed Message:\n32"
-    signable_hash = Web3.solidity_keccak(
-        ["bytes", "bytes"], [Web3.to_bytes(text=prefix), Web3.to_bytes(message_hash)]
-    )
+    @enforce_types
+    def sign_transaction(self, tx: dict) -> SignedTransaction:
+        return Account.sign_transaction(tx, self._private_key)
+
+
+@enforce_types
+def get_signer(wallet: LocalAccount) -> Signer:
+    """Returns the Signer of this wallet.
+
+    It is kept on the wallet itself, so it lives only as long as the wallet
+    and no private key outlives the account holding it.
+    """
+    signer = getattr(wallet, "_ocean_signer", None)
+    if signer is None:
+        signer = Signer(wallet)
+        wallet._ocean_signer = signer
+
+    return signer
 
-    return keys.ecdsa_sign(message_hash=signable_hash, private_key=pk)
+
+@lru_cache(maxsize=16)
+def _get_key_signer(key: str) -> Signer:
+    return Signer(Account.from_key(key))
+
+
+@enforce_types
+def sign_with_key(message_hash: Union[HexBytes, str], key: str) -> str:
+    return _get_key_signer(key).sign(message_hash)
 
 
 @enforce_types
@@ -86,9 +145,6 @@ def split_signature(signature: Any) -> Signature:
 @enforce_types
 def get_gas_fees() -> tuple:
     # Polygon & Mumbai uses EIP-1559. So, dynamically determine priority fee
-    gas_resp = requests.get("https://gasstation.polygon.technology/v2")
+    fees = get_cached_remote_fees(POLYGON_GAS_STATION_URL)["fast"]
 
-    return (
-        Web3.to_wei(gas_resp.json()["fast"]["maxPriorityFee"], "gwei"),
-        Web3.to_wei(gas_resp.json()["fast"]["maxFee"], "gwei"),
-    )
+    return fees.max_priority_fee, fees.max_fee
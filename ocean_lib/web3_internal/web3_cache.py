@@ -0,0 +1,40 @@
+#
+# Copyright 2023 Ocean Protocol Foundation
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Caches that live as long as one web3 instance.
+
+Contract factories, nonce managers and fee oracles all reference the web3
+instance they were built for, so a registry keyed by that instance, even a
+weak one, would keep it alive forever. They are kept on the instance itself
+instead, and collected together with it.
+"""
+import threading
+import weakref
+from typing import Any
+
+_ATTRIBUTE = "_ocean_caches"
+
+_owners_lock = threading.Lock()
+# web3 instances holding caches, to clear them all
+_owners: "weakref.WeakSet[Any]" = weakref.WeakSet()
+
+
+def get_web3_cache(web3: Any, name: str) -> dict:
+    """Returns the cache dict called `name` of this web3 instance."""
+    caches = web3.__dict__.get(_ATTRIBUTE)
+    if caches is None:
+        with _owners_lock:
+            caches = web3.__dict__.setdefault(_ATTRIBUTE, {})
+            _owners.add(web3)
+
+    return caches.setdefault(name, {})
+
+
+def clear_web3_caches(name: str) -> None:
+    """Empties the caches called `name` of all web3 instances."""
+    with _owners_lock:
+        owners = list(_owners)
+
+    for web3 in owners:
+        web3.__dict__[_ATTRIBUTE].pop(name, None)
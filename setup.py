@@ -26,7 +26,7 @@ install_requirements = [
     "eciespy==0.4.1",
     "cryptography==41.0.7",
     "web3==6.14.0",
-    # web3.py requires eth-abi, requests, and more,
+    # web3.py requires eth-abi, requests, aiohttp, and more,
     # so those will be installed too.
     # See https://github.com/ethereum/web3.py/blob/master/setup.py
 ]
@@ -34,17 +34,18 @@ class HttpClientMockBase(Session):
 
     @classmethod
     def get(cls, *args, **kwargs):
-        """Handles the base case of service endpoints."""
+        """Handles the base cases of root checks and service endpoints."""
         is_get_endpoints_request = False
         for _, _, _, fn, _, _ in inspect.getouterframes(inspect.currentframe()):
-            if fn == "get_service_endpoints":
+            if fn in ["get_root_uri", "get_service_endpoints"]:
                 is_get_endpoints_request = True
 
         if is_get_endpoints_request:
             the_response = Mock(spec=Response)
             the_response.status_code = 200
             the_response.json.return_value = {
-                "serviceEndpoints": TEST_SERVICE_ENDPOINTS
+                "providerAddresses": {},
+                "serviceEndpoints": TEST_SERVICE_ENDPOINTS,
             }
             return the_response
 